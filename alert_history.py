@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historique des Alertes
+======================
+Tampon borné (taille et ancienneté), trié par date, avec index par cible,
+niveau et métrique
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Champs indexés d'une alerte
+INDEXED_FIELDS = ('target', 'level', 'metric')
+
+class AlertHistory:
+    """Historique des alertes borné, interrogeable par intervalle de temps, cible, niveau et métrique"""
+    
+    def __init__(self, max_entries: int = 10000, max_age_hours: Optional[float] = 168):
+        self.max_entries = max(1, max_entries)
+        self.max_age = timedelta(hours=max_age_hours) if max_age_hours else None
+        self.lock = threading.RLock()
+        # Entrées et horodatages (epoch) en parallèle, par ordre chronologique
+        self.entries = []
+        self.timestamps = []
+        # Numéro de séquence de entries[0] ; chaque entrée reçoit un numéro croissant
+        self.base_seq = 0
+        # Index secondaires : valeur -> numéros de séquence des alertes (cible, niveau, métrique)
+        self.by_target = {}
+        self.by_level = {}
+        self.by_metric = {}
+        self.indexes = {'target': self.by_target, 'level': self.by_level, 'metric': self.by_metric}
+        self.compacted_seq = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        with self.lock:
+            return iter(list(self.entries))
+    
+    def __getitem__(self, index):
+        return self.entries[index]
+    
+    @staticmethod
+    def indexed_values(entry: Dict) -> Dict[str, Optional[str]]:
+        """Valeurs des champs indexés d'une alerte"""
+        alert = entry.get('alert', {})
+        return {'target': entry['target'], 'level': alert.get('level'), 'metric': alert.get('metric')}
+    
+    @property
+    def next_seq(self) -> int:
+        """Numéro de séquence de la prochaine alerte"""
+        return self.base_seq + len(self.entries)
+    
+    def append(self, entry: Dict) -> int:
+        """Ajoute une alerte ({'timestamp': datetime, 'target': ..., 'alert': ...})"""
+        with self.lock:
+            timestamp = entry['timestamp'].timestamp()
+            # L'ordre chronologique est garanti même si l'horloge recule
+            if self.timestamps and timestamp < self.timestamps[-1]:
+                timestamp = self.timestamps[-1]
+            
+            seq = self.next_seq
+            self.entries.append(entry)
+            self.timestamps.append(timestamp)
+            for field, value in self.indexed_values(entry).items():
+                self.indexes[field].setdefault(value, []).append(seq)
+            self.trim(timestamp)
+            return seq
+    
+    def trim(self, now: float):
+        """Supprime les alertes trop anciennes ou en surnombre (par lots, coût amorti constant)"""
+        drop = 0
+        # Marges de 25% (taille) et 10% (ancienneté) : la liste n'est compactée qu'occasionnellement
+        if len(self.entries) > self.max_entries + self.max_entries // 4:
+            drop = len(self.entries) - self.max_entries
+        if self.max_age is not None:
+            max_age = self.max_age.total_seconds()
+            if self.timestamps[0] < now - max_age * 1.1:
+                drop = max(drop, bisect_left(self.timestamps, now - max_age))
+        if drop == 0:
+            return
+        
+        del self.entries[:drop]
+        del self.timestamps[:drop]
+        self.base_seq += drop
+        
+        # Les index sont compactés par lots ; les lectures ignorent les numéros périmés
+        if self.base_seq - self.compacted_seq < max(1, self.max_entries // 4):
+            return
+        self.compacted_seq = self.base_seq
+        for index in self.indexes.values():
+            for value in list(index):
+                seqs = index[value]
+                cut = bisect_left(seqs, self.base_seq)
+                if cut == len(seqs):
+                    del index[value]
+                elif cut:
+                    del seqs[:cut]
+    
+    def bounds(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        """Positions [low, high) des alertes de l'intervalle ]start, end]"""
+        low = 0 if start is None else bisect_right(self.timestamps, start.timestamp())
+        high = len(self.timestamps) if end is None else bisect_right(self.timestamps, end.timestamp())
+        return low, high
+    
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              target: Optional[str] = None) -> List[Dict]:
+        """Alertes de l'intervalle ]start, end], éventuellement pour une seule cible"""
+        with self.lock:
+            low, high = self.bounds(start, end)
+            if target is None:
+                return self.entries[low:high]
+            
+            # Parcours de l'index de la cible restreint aux positions [low, high)
+            seqs = self.by_target.get(target, [])
+            first = bisect_left(seqs, self.base_seq + low)
+            last = bisect_left(seqs, self.base_seq + high)
+            return [self.entries[seq - self.base_seq] for seq in seqs[first:last]]
+    
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              target: Optional[str] = None, level: Optional[str] = None, metric: Optional[str] = None,
+              offset: int = 0, limit: Optional[int] = None, newest_first: bool = True) -> Tuple[int, List[Dict]]:
+        """Page d'alertes filtrées par les index : (nombre d'alertes correspondantes, alertes de la page)"""
+        with self.lock:
+            low, high = self.bounds(start, end)
+            filters = {field: value for field, value in zip(INDEXED_FIELDS, (target, level, metric))
+                       if value is not None}
+            if not filters:
+                seqs = range(self.base_seq + low, self.base_seq + high)
+            else:
+                # Index le plus sélectif sur l'intervalle, les autres critères vérifiés sur ses seules alertes
+                selections = []
+                for field, value in filters.items():
+                    index_seqs = self.indexes[field].get(value, [])
+                    first = bisect_left(index_seqs, self.base_seq + low)
+                    last = bisect_left(index_seqs, self.base_seq + high)
+                    selections.append((last - first, field, index_seqs, first, last))
+                _, field, index_seqs, first, last = min(selections, key=lambda selection: selection[0])
+                seqs = index_seqs[first:last]
+                others = [(other, value) for other, value in filters.items() if other != field]
+                if others:
+                    seqs = [seq for seq in seqs
+                            if all(self.indexed_values(self.entries[seq - self.base_seq])[other] == value
+                                   for other, value in others)]
+            
+            total = len(seqs)
+            if newest_first:
+                seqs = seqs[::-1]
+            page = seqs[offset:] if limit is None else seqs[offset:offset + limit]
+            return total, [self.entries[seq - self.base_seq] for seq in page]
+    
+    def since_seq(self, seq: int) -> List[Dict]:
+        """Alertes ajoutées depuis un numéro de séquence (curseur de lecture incrémentale)"""
+        with self.lock:
+            return self.entries[max(0, seq - self.base_seq):]
+    
+    def read_since(self, seq: int) -> Tuple[List[Dict], int]:
+        """Alertes ajoutées depuis un numéro de séquence et curseur suivant, lus ensemble"""
+        with self.lock:
+            return self.entries[max(0, seq - self.base_seq):], self.next_seq
+    
+    def values(self, field: str) -> List[str]:
+        """Valeurs présentes dans l'historique pour un champ indexé"""
+        with self.lock:
+            return sorted(value for value, seqs in self.indexes[field].items()
+                          if value is not None and seqs[-1] >= self.base_seq)
+    
+    def targets(self) -> List[str]:
+        """Cibles ayant des alertes dans l'historique"""
+        return self.values('target')
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Envoi Asynchrone des Alertes
+============================
+File d'attente bornée et session SMTP persistante, hors de la boucle de polling
+"""
+
+import queue
+import smtplib
+import threading
+import time
+from typing import Dict, List
+
+class AlertNotifier:
+    """Thread d'envoi des emails d'alerte avec connexion SMTP réutilisée"""
+    
+    def __init__(self, alerts_config: Dict, logger, queue_size: int = 1000,
+                 batch_size: int = 50, idle_timeout: float = 60):
+        self.config = alerts_config
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.batch_size = max(1, batch_size)
+        # Durée d'inactivité au-delà de laquelle la connexion SMTP est fermée
+        self.idle_timeout = idle_timeout
+        self.server = None
+        self.last_used = 0.0
+        self.thread = None
+        self.running = False
+        # Demande de reconnexion après un rechargement de la configuration
+        self.reconnect = False
+        # Compteurs modifiés par les threads de polling (submit) et par le thread d'envoi
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'submitted': 0,
+            'sent': 0,
+            'failed': 0,
+            'dropped': 0,
+            'connections': 0,
+            'batches': 0,
+            'max_queue_depth': 0,
+            'last_error': None
+        }
+    
+    def start(self):
+        """Démarre le thread d'envoi"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="alert-notifier", daemon=True)
+        self.thread.start()
+    
+    def stop(self, timeout: float = 10):
+        """Arrête le thread après avoir vidé la file (dans la limite du timeout)"""
+        self.running = False
+        if self.thread is None:
+            self.disconnect()
+            return
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            # Lot encore en cours : le thread fermera lui-même sa session en quittant run
+            self.logger.warning("Envoi des alertes toujours en cours à l'arrêt")
+            return
+        self.thread = None
+    
+    def reconfigure(self, alerts_config: Dict):
+        """Applique une nouvelle configuration SMTP (reconnexion au prochain envoi)"""
+        self.config = alerts_config
+        self.reconnect = True
+    
+    def submit(self, message) -> bool:
+        """Met un email en file sans bloquer ; retourne False si la file est pleine"""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            with self.stats_lock:
+                self.stats['dropped'] += 1
+                dropped = self.stats['dropped']
+            # Avertir à la première perte puis toutes les 100
+            if dropped % 100 == 1:
+                self.logger.warning(f"File d'alertes pleine: {dropped} emails abandonnés")
+            return False
+        
+        with self.stats_lock:
+            self.stats['submitted'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize())
+        return True
+    
+    def get_stats(self) -> Dict:
+        """Compteurs d'envoi et de contre-pression"""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['queue_depth'] = self.queue.qsize()
+        stats['queue_capacity'] = self.queue.maxsize
+        stats['connected'] = self.server is not None
+        return stats
+    
+    def connect(self):
+        """Ouvre la session SMTP (STARTTLS et authentification selon la configuration)"""
+        server = smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"], timeout=30)
+        if self.config.get("smtp_starttls", True):
+            server.starttls()
+        if self.config.get("sender_password"):
+            server.login(self.config["sender_email"], self.config["sender_password"])
+        self.server = server
+        with self.stats_lock:
+            self.stats['connections'] += 1
+    
+    def disconnect(self):
+        """Ferme la session SMTP"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+    
+    def send(self, message):
+        """Envoie un message sur la session courante, en se reconnectant une fois si elle est tombée"""
+        for attempt in range(2):
+            if self.server is None:
+                self.connect()
+            try:
+                # Une seule transaction SMTP pour tous les destinataires
+                self.server.send_message(message, to_addrs=self.config["recipients"])
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused, OSError):
+                self.server = None
+                if attempt == 1:
+                    raise
+    
+    def next_batch(self) -> List:
+        """Attend un message puis récupère ceux déjà en file (jusqu'à batch_size)"""
+        batch = [self.queue.get(timeout=1)]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def run(self):
+        """Boucle du thread d'envoi (la session SMTP est fermée par ce thread en sortant)"""
+        try:
+            self.send_loop()
+        finally:
+            self.disconnect()
+    
+    def send_loop(self):
+        """Envoie les lots jusqu'à l'arrêt, puis vide la file"""
+        while self.running or not self.queue.empty():
+            try:
+                batch = self.next_batch()
+            except queue.Empty:
+                if self.server is not None and time.monotonic() - self.last_used > self.idle_timeout:
+                    self.disconnect()
+                continue
+            
+            if self.reconnect:
+                self.reconnect = False
+                self.disconnect()
+            
+            with self.stats_lock:
+                self.stats['batches'] += 1
+            for message in batch:
+                try:
+                    self.send(message)
+                    with self.stats_lock:
+                        self.stats['sent'] += 1
+                    self.logger.info(f"Email d'alerte envoyé: {message['Subject']}")
+                except Exception as e:
+                    with self.stats_lock:
+                        self.stats['failed'] += 1
+                        self.stats['last_error'] = str(e)
+                    self.logger.error(f"Erreur lors de l'envoi de l'email: {str(e)}")
+                    self.disconnect()
+            self.last_used = time.monotonic()
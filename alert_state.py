@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+États des Alertes
+=================
+Machine à états par (cible, métrique) : hystérésis, durée minimale,
+rappels espacés et résumé périodique des alertes en cours
+"""
+
+import operator
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+WARNING = 'WARNING'
+CRITICAL = 'CRITICAL'
+
+# Évènements notifiés
+RAISE = 'RAISE'
+CHANGE = 'CHANGE'
+REMINDER = 'REMINDER'
+RECOVERY = 'RECOVERY'
+
+LEVEL_RANK = {None: 0, WARNING: 1, CRITICAL: 2}
+
+# Comparateurs des règles de seuil ; "<" et "<=" alertent sur une valeur trop basse
+COMPARATORS = {
+    '>=': operator.ge,
+    '>': operator.gt,
+    '<=': operator.le,
+    '<': operator.lt
+}
+
+def breach_level(value: float, warning: Optional[float], critical: Optional[float],
+                 comparator: str = '>=') -> Optional[str]:
+    """Niveau atteint par une valeur, ou None"""
+    compare = COMPARATORS[comparator]
+    if critical is not None and compare(value, critical):
+        return CRITICAL
+    if warning is not None and compare(value, warning):
+        return WARNING
+    return None
+
+class AlertState:
+    """État d'une alerte : niveau notifié et changement de niveau en attente de confirmation"""
+    
+    def __init__(self, now: float):
+        self.level = None
+        self.pending = None
+        self.count = 0
+        self.since = now
+        self.last_notified = now
+        self.suppressed = 0
+        self.value = None
+        # Nom de la métrique dans l'échantillon (pour l'évaluation par lot)
+        self.key = None
+    
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable de l'état"""
+        return {
+            'level': self.level,
+            'since': self.since,
+            'value': self.value,
+            'suppressed': self.suppressed
+        }
+
+class AlertStateTracker:
+    """Transforme les dépassements échantillon par échantillon en évènements d'alerte"""
+    
+    def __init__(self, alerts_config: Dict):
+        self.configure(alerts_config)
+        self.lock = threading.Lock()
+        self.states = {}
+        self.last_digest = time.monotonic()
+        self.suppressed_total = 0
+        self.events_total = 0
+    
+    def configure(self, alerts_config: Dict):
+        """Applique les paramètres de la section "alerts" (les états en cours sont conservés)"""
+        # Marge de retour en % du seuil : CPU critique à 90 → rétabli sous 85.5 avec 5%
+        self.hysteresis = alerts_config.get("hysteresis", 5) / 100.0
+        self.raise_after = max(1, alerts_config.get("raise_after_samples", 1))
+        self.clear_after = max(1, alerts_config.get("clear_after_samples", 1))
+        self.renotify_interval = alerts_config.get("renotify_interval", 3600)
+        self.digest_interval = alerts_config.get("digest_interval", 3600)
+    
+    def effective_level(self, state: Optional[AlertState], check: Dict) -> Optional[str]:
+        """Niveau de l'échantillon, maintenu au niveau courant tant que la valeur reste dans la marge"""
+        comparator = check.get('comparator', '>=')
+        level = breach_level(check['value'], check['warning'], check['critical'], comparator)
+        if state is None or LEVEL_RANK[level] >= LEVEL_RANK[state.level]:
+            return level
+        
+        threshold = check['critical'] if state.level == CRITICAL else check['warning']
+        if threshold is None:
+            return level
+        margin = abs(threshold) * self.hysteresis
+        if comparator in ('>=', '>'):
+            held = check['value'] >= threshold - margin
+        else:
+            held = check['value'] <= threshold + margin
+        return state.level if held else level
+    
+    def update(self, target_name: str, checks: List[Dict],
+               now: Optional[float] = None) -> List[Tuple[str, Optional[str], Dict]]:
+        """Applique les contrôles d'un échantillon ; retourne les évènements (type, niveau, contrôle) à notifier"""
+        now = time.monotonic() if now is None else now
+        events = []
+        with self.lock:
+            for check in checks:
+                key = (target_name, check['metric'])
+                state = self.states.get(key)
+                level = self.effective_level(state, check)
+                # Cas le plus courant : métrique nominale sans alerte en cours
+                if state is None and level is None:
+                    continue
+                if state is None:
+                    state = AlertState(now)
+                    self.states[key] = state
+                state.value = check['value']
+                state.key = check.get('key')
+                
+                if level == state.level:
+                    state.pending = None
+                    state.count = 0
+                    if state.level is None:
+                        # Dépassement non confirmé puis résorbé
+                        del self.states[key]
+                    elif self.renotify_interval and now - state.last_notified >= self.renotify_interval:
+                        state.last_notified = now
+                        events.append((REMINDER, state.level, check))
+                    else:
+                        state.suppressed += 1
+                        self.suppressed_total += 1
+                    continue
+                
+                # Changement de niveau : confirmé après N échantillons consécutifs
+                if state.pending == level:
+                    state.count += 1
+                else:
+                    state.pending = level
+                    state.count = 1
+                required = self.raise_after if LEVEL_RANK[level] > LEVEL_RANK[state.level] else self.clear_after
+                if state.count < required:
+                    continue
+                
+                previous = state.level
+                state.level = level
+                state.pending = None
+                state.count = 0
+                state.last_notified = now
+                if level is None:
+                    del self.states[key]
+                    events.append((RECOVERY, previous, check))
+                elif previous is None:
+                    state.since = now
+                    events.append((RAISE, level, check))
+                else:
+                    events.append((CHANGE, level, check))
+        
+        self.events_total += len(events)
+        return events
+    
+    def watched_keys(self) -> Dict[str, set]:
+        """Métriques à réévaluer par cible même sans dépassement (alertes en cours ou en attente)"""
+        watched = {}
+        with self.lock:
+            for (target_name, _), state in self.states.items():
+                watched.setdefault(target_name, set()).add(state.key)
+        return watched
+    
+    def get_active(self) -> Dict[Tuple[str, str], Dict]:
+        """Alertes en cours, par (cible, métrique)"""
+        with self.lock:
+            return {key: state.to_dict() for key, state in self.states.items() if state.level is not None}
+    
+    def collect_digest(self, now: Optional[float] = None) -> Optional[Dict]:
+        """Résumé des alertes en cours si l'intervalle de résumé est écoulé (None sinon)"""
+        if not self.digest_interval:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - self.last_digest < self.digest_interval:
+            return None
+        
+        with self.lock:
+            active = []
+            for (target_name, metric), state in sorted(self.states.items()):
+                if state.level is None:
+                    continue
+                active.append({
+                    'target': target_name,
+                    'metric': metric,
+                    'level': state.level,
+                    'value': state.value,
+                    'duration': now - state.since,
+                    'suppressed': state.suppressed
+                })
+                state.suppressed = 0
+            suppressed = self.suppressed_total
+            self.suppressed_total = 0
+            period = now - self.last_digest
+            self.last_digest = now
+        
+        if not active:
+            return None
+        return {'period': period, 'active': active, 'suppressed': suppressed}
+    
+    def get_stats(self) -> Dict:
+        """Compteurs d'évènements notifiés et de répétitions supprimées"""
+        with self.lock:
+            active = sum(1 for state in self.states.values() if state.level is not None)
+        return {'active': active, 'events': self.events_total, 'suppressed': self.suppressed_total}
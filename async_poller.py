@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de Polling SNMP Asynchrone
+=================================
+Interroge des milliers de cibles en parallèle avec asyncio
+"""
+
+import asyncio
+import socket
+import time
+from typing import Dict, List, Optional
+from pyasn1.codec.ber import encoder, decoder
+from pysnmp.proto import api
+from pysnmp.proto.rfc1905 import NoSuchObject, NoSuchInstance, EndOfMibView
+from snmp_tables import MAX_TABLE_ROWS, column_index, next_repetitions, oid_key
+
+# Le hlapi asyncio de pysnmp 4.4 repose sur asyncio.coroutine (supprimé en
+# Python 3.11) : on utilise directement l'API protocole de pysnmp (BER/pyasn1)
+# sur un unique socket UDP asyncio.
+pMod = api.protoModules[api.protoVersion2c]
+
+class SnmpProtocol(asyncio.DatagramProtocol):
+    """Socket UDP partagé : associe chaque réponse à sa requête via le request-id"""
+    
+    def __init__(self):
+        self.transport = None
+        self.pending = {}
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            try:
+                # Absorber les rafales de réponses quand des centaines de requêtes sont en vol
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            except OSError:
+                pass
+    
+    def datagram_received(self, data, addr):
+        try:
+            message, _ = decoder.decode(data, asn1Spec=pMod.Message())
+            pdu = pMod.apiMessage.getPDU(message)
+            request_id = int(pMod.apiPDU.getRequestID(pdu))
+        except Exception:
+            # Datagramme invalide ou étranger : ignoré
+            return
+        
+        future = self.pending.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_result(pdu)
+    
+    def error_received(self, exc):
+        pass
+
+class AsyncSnmpPoller:
+    """Poller SNMP asynchrone alimentant le flux d'alertes de SystemMonitor"""
+    
+    def __init__(self, monitor, concurrency: int = 256, sample_callback=None, skip_callback=None):
+        self.monitor = monitor
+        self.config = monitor.config
+        # Par défaut les échantillons alimentent directement le flux d'alertes, et les cibles
+        # non interrogées (disjoncteur ouvert) la disponibilité du rapport
+        self.sample_callback = sample_callback or monitor.process_metrics
+        self.skip_callback = skip_callback or (lambda target: monitor.report_stats.record_skip(target['name']))
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.protocol = None
+        self.transport = None
+        self.addresses = {}
+    
+    async def open(self):
+        """Ouvre le socket UDP partagé"""
+        if self.transport is None:
+            loop = asyncio.get_running_loop()
+            self.transport, self.protocol = await loop.create_datagram_endpoint(
+                SnmpProtocol, local_addr=('0.0.0.0', 0), family=socket.AF_INET)
+    
+    def close(self):
+        """Ferme le socket et annule les requêtes en attente"""
+        if self.transport is not None:
+            for future in self.protocol.pending.values():
+                future.cancel()
+            self.protocol.pending.clear()
+            self.transport.close()
+            self.transport = None
+            self.protocol = None
+    
+    async def resolve(self, target: Dict):
+        """Résout l'adresse d'une cible (mise en cache)"""
+        key = (target["ip"], target["port"])
+        address = self.addresses.get(key)
+        if address is None:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(target["ip"], target["port"],
+                                           family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            address = infos[0][4]
+            self.addresses[key] = address
+        return address
+    
+    async def request(self, target: Dict, oids: List[str], max_repetitions: Optional[int] = None):
+        """Envoie une requête GET (ou GETBULK) et attend la réponse (avec retransmissions)"""
+        await self.open()
+        address = await self.resolve(target)
+        
+        if max_repetitions is None:
+            pdu = pMod.GetRequestPDU()
+            pMod.apiPDU.setDefaults(pdu)
+        else:
+            pdu = pMod.GetBulkRequestPDU()
+            pMod.apiBulkPDU.setDefaults(pdu)
+            pMod.apiBulkPDU.setNonRepeaters(pdu, 0)
+            pMod.apiBulkPDU.setMaxRepetitions(pdu, max_repetitions)
+        pMod.apiPDU.setVarBinds(pdu, [(oid, pMod.Null('')) for oid in oids])
+        message = pMod.Message()
+        pMod.apiMessage.setDefaults(message)
+        pMod.apiMessage.setCommunity(message, target.get("community", self.config["snmp"]["community"]))
+        pMod.apiMessage.setPDU(message, pdu)
+        payload = encoder.encode(message)
+        request_id = int(pMod.apiPDU.getRequestID(pdu))
+        
+        loop = asyncio.get_running_loop()
+        timeout = self.config["snmp"]["timeout"]
+        # Une cible suspecte ou en cours de sonde est interrogée sans ré-essai
+        retries = self.config["snmp"]["retries"] if self.monitor.circuit_breaker.is_healthy(target) else 0
+        for _ in range(retries + 1):
+            future = loop.create_future()
+            self.protocol.pending[request_id] = future
+            self.transport.sendto(payload, address)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                if self.protocol is not None:
+                    self.protocol.pending.pop(request_id, None)
+        
+        raise TimeoutError('No SNMP response received before timeout')
+    
+    async def get_snmp_values(self, target: Dict, oids: Dict[str, str]) -> Dict[str, float]:
+        """Équivalent asynchrone de SystemMonitor.get_snmp_values"""
+        values = {}
+        names = list(oids.keys())
+        chunk_size = self.monitor.pdu_limits.get(target['ip'],
+                                                 self.config["snmp"].get("max_oids_per_request", len(names)))
+        chunk_size = max(1, chunk_size)
+        
+        pending = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+        while pending:
+            chunk = pending.pop(0)
+            start = time.perf_counter()
+            try:
+                pdu = await self.request(target, [oids[name] for name in chunk])
+            except Exception as e:
+                # Timeout : inutile d'interroger les OIDs restantes de cette cible
+                self.monitor.logger.error(f"Erreur SNMP pour {target['name']}: {str(e)}")
+                self.monitor.record_snmp_failure(target, str(e))
+                return values
+            
+            self.monitor.instrumentation.observe_request(target['name'], chunk, time.perf_counter() - start)
+            self.monitor.circuit_breaker.record_success(target)
+            errorStatus = pMod.apiPDU.getErrorStatus(pdu)
+            if errorStatus:
+                if str(errorStatus) == 'tooBig' and len(chunk) > 1:
+                    # PDU trop grande pour l'agent : on divise la requête
+                    half = len(chunk) // 2
+                    self.monitor.pdu_limits[target['ip']] = half
+                    pending[:0] = [chunk[:half], chunk[half:]]
+                    continue
+                self.monitor.logger.error(f"Erreur SNMP pour {target['name']}: {errorStatus.prettyPrint()}")
+                self.monitor.instrumentation.record_error(target['name'])
+                continue
+            
+            for name, (oid, value) in zip(chunk, pMod.apiPDU.getVarBinds(pdu)):
+                # noSuchObject / noSuchInstance : métrique absente de l'échantillon
+                if isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView)):
+                    continue
+                try:
+                    values[name] = float(value)
+                except (TypeError, ValueError):
+                    continue
+        
+        return values
+    
+    async def walk_table(self, target: Dict, columns: Dict[str, str]) -> Optional[Dict[str, Dict]]:
+        """Équivalent asynchrone de SystemMonitor.walk_table"""
+        monitor = self.monitor
+        max_repetitions = monitor.bulk_limits.get(target['ip'], self.config["snmp"].get("max_repetitions", 50))
+        repetitions = min(monitor.bulk_repetitions.get(target['ip'], 10), max_repetitions)
+        walked = {name: {} for name in columns}
+        # Dernière OID lue dans chaque colonne encore en cours de parcours
+        cursors = dict(columns)
+        rows = 0
+        
+        while cursors:
+            active = list(cursors.keys())
+            start = time.perf_counter()
+            try:
+                pdu = await self.request(target, [cursors[name] for name in active], repetitions)
+            except Exception as e:
+                monitor.logger.error(f"Erreur SNMP pour {target['name']}: {str(e)}")
+                monitor.record_snmp_failure(target, str(e))
+                return None
+            monitor.instrumentation.observe_request(target['name'], active, time.perf_counter() - start)
+            
+            errorStatus = pMod.apiPDU.getErrorStatus(pdu)
+            if errorStatus:
+                if str(errorStatus) == 'tooBig' and repetitions > 1:
+                    # Réponse trop grande pour l'agent : moins de lignes par requête
+                    repetitions = repetitions // 2
+                    monitor.bulk_limits[target['ip']] = repetitions
+                    max_repetitions = repetitions
+                    continue
+                monitor.logger.error(f"Erreur SNMP pour {target['name']}: {errorStatus.prettyPrint()}")
+                monitor.instrumentation.record_error(target['name'])
+                return None
+            
+            # Les varbinds d'une réponse GETBULK sont rangées ligne par ligne
+            var_binds = pMod.apiPDU.getVarBinds(pdu)
+            finished = set()
+            for start in range(0, len(var_binds), len(active)):
+                in_scope = False
+                for name, (oid, value) in zip(active, var_binds[start:start + len(active)]):
+                    if name in finished:
+                        continue
+                    index = None
+                    if not isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView)):
+                        index = column_index(str(oid), columns[name])
+                    if index is None:
+                        # Fin de la colonne
+                        finished.add(name)
+                        continue
+                    if oid_key(str(oid)) <= oid_key(cursors[name]):
+                        # Agent défaillant : la même requête reviendrait indéfiniment (OIDNotIncreasing)
+                        monitor.logger.error(f"Erreur SNMP pour {target['name']}: OID non croissante "
+                                             f"{oid} après {cursors[name]}")
+                        monitor.instrumentation.record_error(target['name'])
+                        return None
+                    walked[name][index] = value
+                    cursors[name] = str(oid)
+                    in_scope = True
+                if in_scope:
+                    rows += 1
+            
+            for name in finished:
+                cursors.pop(name, None)
+            if not var_binds:
+                break
+            if rows > MAX_TABLE_ROWS:
+                monitor.logger.error(f"Erreur SNMP pour {target['name']}: parcours interrompu "
+                                     f"après {MAX_TABLE_ROWS} lignes")
+                monitor.instrumentation.record_error(target['name'])
+                return None
+        
+        # Ajuster max-repetitions pour lire la table en un seul aller-retour au prochain cycle
+        monitor.bulk_repetitions[target['ip']] = next_repetitions(rows, max_repetitions)
+        return walked
+    
+    async def poll_target(self, target: Dict) -> Optional[Dict]:
+        """Interroge une cible et transmet l'échantillon au flux d'alertes"""
+        if not self.monitor.circuit_breaker.allow_request(target):
+            # Cible injoignable : attendre la prochaine sonde (créneau compté dans le cycle)
+            self.monitor.instrumentation.record_skip(time.perf_counter())
+            self.skip_callback(target)
+            return None
+        
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                values = await self.get_snmp_values(target, self.monitor.snmp_oids)
+                
+                # Interfaces et disques : parcours des tables si activé
+                tables = None
+                if values and self.config["snmp"].get("walk_tables", False):
+                    uptime = values.get('sys_uptime')
+                    walked = await self.walk_table(target, self.monitor.table_cache.columns(target['name'], uptime))
+                    if walked is not None:
+                        tables = self.monitor.table_cache.build_tables(target['name'], uptime, walked)
+                
+                metrics = self.monitor.build_metrics(target, values, tables)
+                self.sample_callback(target, metrics)
+                return metrics
+            except Exception as e:
+                self.monitor.logger.error(f"Erreur lors du monitoring de {target['name']}: {str(e)}")
+                return None
+            finally:
+                self.monitor.instrumentation.record_poll(start, time.perf_counter())
+    
+    async def poll_targets(self, targets: List[Dict]) -> List[Optional[Dict]]:
+        """Interroge toutes les cibles en parallèle (dans la limite de concurrence)"""
+        await self.open()
+        start = time.monotonic()
+        results = await asyncio.gather(*[self.poll_target(target) for target in targets])
+        self.monitor.logger.info(f"Cycle asynchrone: {len(targets)} cibles en "
+                                 f"{time.monotonic() - start:.2f}s")
+        return results
+    
+    async def run_scheduled(self, scheduler, is_active):
+        """Interroge chaque cible au rythme de l'ordonnanceur tant que is_active() est vrai"""
+        await self.open()
+        in_flight = {}
+        
+        try:
+            while is_active():
+                delay = scheduler.next_due() - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(min(delay, 1))
+                    continue
+                
+                for index, target in scheduler.pop_due(time.monotonic()):
+                    if index in in_flight:
+                        # Le poll précédent n'est pas terminé : créneau dépassé
+                        scheduler.record_overrun(index)
+                        continue
+                    task = asyncio.ensure_future(self.poll_target(target))
+                    in_flight[index] = task
+                    task.add_done_callback(lambda _, index=index: in_flight.pop(index, None))
+        finally:
+            tasks = list(in_flight.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du Polling SNMP
+=========================
+Mesure le débit, la latence, le CPU et la mémoire de SystemMonitor face à
+des équipements virtuels servis en local (snmp_responder), de 10 à 10 000 cibles
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from instrumentation import LatencyHistogram, POLL, total_histogram
+from monitoring_system import SystemMonitor
+from snmp_responder import SnmpResponder
+
+def cpu_seconds(children: bool = False) -> float:
+    """Temps CPU (utilisateur + système) du processus, ou de ses processus fils terminés"""
+    if resource is None:
+        return 0.0 if children else time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def rss_mb() -> Optional[float]:
+    """Mémoire résidente actuelle (Mo), ou pic si /proc n'est pas disponible"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1048576
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ko sous Linux, octets sous macOS
+    return peak / 1048576 if sys.platform == 'darwin' else peak / 1024
+
+def histogram_delta(after: Dict, before: Optional[Dict]) -> LatencyHistogram:
+    """Observations enregistrées entre deux instantanés d'un histogramme"""
+    histogram = LatencyHistogram.from_dict(after)
+    if before:
+        histogram.counts = [a - b for a, b in zip(histogram.counts, before['buckets'])]
+        histogram.count -= before['count']
+        histogram.total -= before['sum']
+    return histogram
+
+def make_monitor(base_config: Dict, targets: List[Dict], args, mode: str, directory: str) -> SystemMonitor:
+    """SystemMonitor configuré pour les équipements virtuels (emails, stockage et export désactivés)"""
+    config = json.loads(json.dumps(base_config))
+    config["targets"] = targets
+    config["snmp"].update({"timeout": args.timeout, "retries": 0, "walk_tables": args.walk_tables})
+    config["alerts"]["email_enabled"] = False
+    config["monitoring"].update({"interval": args.interval, "mode": mode, "concurrency": args.concurrency,
+                                 "workers": args.workers,
+                                 "log_file": os.path.join(directory, "benchmark_monitoring.log")})
+    config["storage"] = {"enabled": False}
+    config["exporter"] = {"enabled": False}
+    # Logs conservés dans le fichier (coût mesuré) mais plus à l'écran
+    config["logging"] = {**config.get("logging", {}), "console": False}
+    config_file = os.path.join(directory, f"benchmark_{mode}_{len(targets)}.json")
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+    return SystemMonitor(config_file)
+
+def bench_get_system_metrics(monitor: SystemMonitor, targets: List[Dict]) -> Dict:
+    """Interrogation séquentielle directe de chaque cible (get_system_metrics)"""
+    # Premier passage : initialisation du moteur, noms des tables, compteurs de référence
+    for target in targets:
+        monitor.get_system_metrics(target)
+    
+    latencies = []
+    samples = 0
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    for target in targets:
+        poll_start = time.perf_counter()
+        metrics = monitor.get_system_metrics(target)
+        latencies.append(time.perf_counter() - poll_start)
+        if 'cpu_usage' in metrics:
+            samples += 1
+    duration = time.perf_counter() - start
+    
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'samples': samples,
+        'failures': len(targets) - samples,
+        'duration': duration,
+        'throughput': samples / duration,
+        'latency_p50_ms': quantiles[49] * 1000,
+        'latency_p99_ms': quantiles[98] * 1000,
+        'cpu_percent': (cpu_seconds() - cpu_start) / duration * 100
+    }
+
+def bench_start_monitoring(monitor: SystemMonitor, args) -> Dict:
+    """Boucle start_monitoring complète, mesurée après une période de chauffe"""
+    cpu_start = cpu_seconds()
+    children_start = cpu_seconds(children=True)
+    run_start = time.perf_counter()
+    thread = threading.Thread(target=monitor.start_monitoring, daemon=True)
+    thread.start()
+    
+    time.sleep(args.warmup)
+    before = monitor.get_poller_stats()
+    window_start = time.perf_counter()
+    time.sleep(args.duration)
+    after = monitor.get_poller_stats()
+    window = time.perf_counter() - window_start
+    
+    monitor.monitoring_active = False
+    thread.join(30)
+    monitor.stop_monitoring()
+    # CPU de tout le run, workers du mode "sharded" compris (comptés à leur terminaison)
+    cpu = cpu_seconds() - cpu_start + cpu_seconds(children=True) - children_start
+    run_duration = time.perf_counter() - run_start
+    
+    polls = LatencyHistogram()
+    if POLL in after['sections']:
+        polls = histogram_delta(after['sections'][POLL], before['sections'].get(POLL))
+    requests = histogram_delta(total_histogram(after['targets']), total_histogram(before['targets']))
+    failures = (sum(after['timeouts'].values()) - sum(before['timeouts'].values()) +
+                sum(after['errors'].values()) - sum(before['errors'].values()))
+    return {
+        'samples': polls.count,
+        'failures': failures,
+        'duration': window,
+        'throughput': polls.count / window,
+        'latency_p50_ms': (polls.quantile(0.5) or 0.0) * 1000,
+        'latency_p99_ms': (polls.quantile(0.99) or 0.0) * 1000,
+        'request_p50_ms': (requests.quantile(0.5) or 0.0) * 1000,
+        'request_p99_ms': (requests.quantile(0.99) or 0.0) * 1000,
+        'cycle_overruns': after['cycles']['overruns'] - before['cycles']['overruns'],
+        'cpu_percent': cpu / run_duration * 100
+    }
+
+def compare(results: List[Dict], previous_file: str):
+    """Affiche l'évolution par rapport à un précédent fichier de résultats"""
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = {(r['scenario'], r['mode'], r['targets']): r for r in json.load(f)['results']}
+    print(f"\nComparaison avec {previous_file}:")
+    for result in results:
+        old = previous.get((result['scenario'], result['mode'], result['targets']))
+        if old is None or not old['throughput']:
+            continue
+        print(f"  {result['scenario']:<18} {result['mode']:<10} {result['targets']:>6} cibles: "
+              f"débit x{result['throughput'] / old['throughput']:.2f}, "
+              f"p99 {old['latency_p99_ms']:.2f} → {result['latency_p99_ms']:.2f} ms")
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark du polling SNMP sur équipements virtuels")
+    parser.add_argument('--targets', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--scenarios', nargs='+', default=['get_system_metrics', 'start_monitoring'],
+                        choices=['get_system_metrics', 'start_monitoring'])
+    parser.add_argument('--mode', default='async', choices=['sequential', 'async', 'sharded'],
+                        help="mode de start_monitoring")
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help="intervalle de polling, court pour saturer le poller")
+    parser.add_argument('--duration', type=float, default=10, help="durée mesurée de start_monitoring (s)")
+    parser.add_argument('--warmup', type=float, default=3, help="chauffe avant mesure (s)")
+    parser.add_argument('--timeout', type=float, default=2)
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--workers', type=int, default=None, help="workers du mode sharded")
+    parser.add_argument('--walk-tables', action='store_true', help="parcours GETBULK des interfaces et disques")
+    parser.add_argument('--responders', type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                        help="processus du répondeur SNMP")
+    parser.add_argument('--base-port', type=int, default=20000)
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--output', default=None, help="fichier JSON des résultats")
+    parser.add_argument('--compare', default=None, help="résultats précédents à comparer")
+    args = parser.parse_args()
+    
+    print("⏱️  Benchmark du polling SNMP")
+    print("============================")
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        base_config = json.load(f)
+    responder = SnmpResponder(max(args.targets), args.base_port, workers=args.responders)
+    print(f"Démarrage de {max(args.targets)} équipements virtuels "
+          f"({args.responders} processus, ports {args.base_port}+)...")
+    responder.start()
+    all_targets = responder.targets()
+    results = []
+    
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for count in sorted(args.targets):
+                targets = all_targets[:count]
+                for scenario in args.scenarios:
+                    mode = 'sequential' if scenario == 'get_system_metrics' else args.mode
+                    monitor = make_monitor(base_config, targets, args, mode, directory)
+                    if scenario == 'get_system_metrics':
+                        result = bench_get_system_metrics(monitor, targets)
+                    else:
+                        result = bench_start_monitoring(monitor, args)
+                    result.update({'scenario': scenario, 'mode': mode, 'targets': count, 'rss_mb': rss_mb()})
+                    monitor.invalidate_snmp_cache()
+                    results.append(result)
+                    print(f"  {scenario:<18} {mode:<10} {count:>6} cibles: "
+                          f"{result['throughput']:9.1f} cibles/s, p50 {result['latency_p50_ms']:7.2f} ms, "
+                          f"p99 {result['latency_p99_ms']:7.2f} ms, CPU {result['cpu_percent']:5.1f}%, "
+                          f"RSS {result['rss_mb'] or 0:7.1f} Mo, {result['failures']} échecs")
+    finally:
+        children = cpu_seconds(children=True)
+        responder.stop()
+        # Le répondeur partage les cœurs du poller : son coût est à prendre en compte
+        responder_cpu = cpu_seconds(children=True) - children
+    
+    output = args.output or os.path.join("benchmark_results",
+                                         f"polling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parameters': vars(args),
+            'responder_cpu_seconds': responder_cpu,
+            'results': results
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Résultats enregistrés dans {output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
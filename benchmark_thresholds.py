@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'Évaluation des Seuils
+====================================
+Compare l'évaluation par cible (check_thresholds) et l'évaluation vectorisée
+d'un cycle complet (check_fleet_thresholds) sur une flotte simulée
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from monitoring_system import SystemMonitor
+
+def generate_samples(count: int, tables: bool, seed: int = 42):
+    """Échantillons simulés : environ 5% des cibles en dépassement"""
+    rng = random.Random(seed)
+    samples = []
+    for i in range(count):
+        target = {'name': f"Serveur {i}", 'ip': f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", 'port': 161}
+        hot = rng.random() < 0.05
+        metrics = {
+            'timestamp': datetime.now().isoformat(),
+            'target': target['name'],
+            'ip': target['ip'],
+            'cpu_usage': rng.uniform(75, 100) if hot else rng.uniform(0, 60),
+            'memory_total': 8388608.0,
+            'memory_used': 4194304.0,
+            'memory_percent': rng.uniform(0, 70),
+            'disk_usage': rng.uniform(10, 80),
+            'network_in': rng.uniform(0, 300000),
+            'network_out': rng.uniform(0, 300000),
+        }
+        metrics['network_total'] = metrics['network_in'] + metrics['network_out']
+        if tables:
+            metrics['interfaces'] = {f"eth{k}": {'in': 1000.0, 'out': 2000.0, 'total': 3000.0} for k in range(4)}
+            metrics['disks'] = {path: rng.uniform(10, 80) for path in ('/', '/var', '/home')}
+        samples.append((target, metrics))
+    return samples
+
+def measure(function, repeat: int) -> float:
+    """Meilleur temps d'exécution sur repeat essais (secondes)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmark de l'évaluation des seuils")
+    parser.add_argument('--targets', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--config', default='config.json')
+    args = parser.parse_args()
+    
+    print("⏱️  Benchmark de l'évaluation des seuils")
+    print("=======================================")
+    
+    monitor = SystemMonitor(args.config)
+    for tables in (False, True):
+        print(f"\nÉchantillons {'avec' if tables else 'sans'} tables (interfaces, disques):")
+        for count in args.targets:
+            samples = generate_samples(count, tables)
+            per_target = measure(lambda: [monitor.check_thresholds(metrics, target)
+                                          for target, metrics in samples], args.repeat)
+            fleet = measure(lambda: monitor.check_fleet_thresholds(samples), args.repeat)
+            
+            # Les deux chemins doivent produire exactement les mêmes alertes
+            identical = monitor.check_fleet_thresholds(samples) == [monitor.check_thresholds(metrics, target)
+                                                                     for target, metrics in samples]
+            print(f"  {count:>6} cibles: par cible {per_target * 1000:8.2f} ms, "
+                  f"vectorisé {fleet * 1000:8.2f} ms, gain x{per_target / fleet:.1f}"
+                  f"{'' if identical else ' ❌ résultats différents'}")
+
+if __name__ == "__main__":
+    main()
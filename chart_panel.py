@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Graphiques en Temps Réel
+========================
+Courbes CPU, mémoire, disque et réseau d'une cible, alimentées par l'historique
+de la base locale puis par les échantillons en direct ; chaque courbe est réduite
+à la largeur du graphique (LTTB ou min/max) avant d'être dessinée
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+from typing import Dict, List
+
+from downsampling import LTTB, MINMAX, SeriesBuffer
+
+# Métriques tracées : (clé de l'échantillon, titre, pourcentage)
+CHART_METRICS = (
+    ('cpu_usage', "CPU (%)", True),
+    ('memory_percent', "Mémoire (%)", True),
+    ('disk_usage', "Disque (%)", True),
+    ('network_total', "Réseau (o/s)", False)
+)
+
+# Périodes affichables (secondes) ; l'historique chargé couvre la plus longue
+PERIODS = {"1 h": 3600, "24 h": 86400, "7 j": 604800}
+METHODS = {"LTTB": LTTB, "Min/Max": MINMAX}
+
+# Intervalle minimal entre deux rendus déclenchés par les échantillons en direct
+REDRAW_MS = 1000
+MARGIN = 4
+
+class ChartPanel:
+    """Panneau de graphiques d'une cible, redessiné par simple mise à jour des coordonnées des courbes"""
+    
+    def __init__(self, parent):
+        self.monitor = None
+        # (cible, métrique) -> SeriesBuffer ; cibles dont l'historique a été chargé
+        self.series = {}
+        self.loaded = set()
+        self.redraw_job = None
+        
+        self.frame = ttk.Frame(parent)
+        controls = ttk.Frame(self.frame)
+        controls.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(controls, text="Cible:").grid(row=0, column=0, padx=(0, 5))
+        self.target_var = tk.StringVar()
+        self.target_combo = ttk.Combobox(controls, textvariable=self.target_var, width=25,
+                                         state='readonly', postcommand=self.fill_targets)
+        self.target_combo.grid(row=0, column=1, padx=(0, 10))
+        self.target_combo.bind('<<ComboboxSelected>>', lambda event: self.select_target())
+        
+        ttk.Label(controls, text="Période:").grid(row=0, column=2, padx=(0, 5))
+        self.period_var = tk.StringVar(value="1 h")
+        period_combo = ttk.Combobox(controls, textvariable=self.period_var, values=list(PERIODS),
+                                    width=6, state='readonly')
+        period_combo.grid(row=0, column=3, padx=(0, 10))
+        period_combo.bind('<<ComboboxSelected>>', lambda event: self.request_redraw(0))
+        
+        ttk.Label(controls, text="Réduction:").grid(row=0, column=4, padx=(0, 5))
+        self.method_var = tk.StringVar(value="LTTB")
+        method_combo = ttk.Combobox(controls, textvariable=self.method_var, values=list(METHODS),
+                                    width=8, state='readonly')
+        method_combo.grid(row=0, column=5, padx=(0, 10))
+        method_combo.bind('<<ComboboxSelected>>', lambda event: self.request_redraw(0))
+        
+        self.render_var = tk.StringVar(value="")
+        ttk.Label(controls, textvariable=self.render_var).grid(row=0, column=6, sticky=tk.E)
+        controls.columnconfigure(6, weight=1)
+        
+        # Un canevas par métrique : une courbe et ses libellés, créés une seule fois
+        self.canvases = {}
+        for position, (metric, title, _) in enumerate(CHART_METRICS):
+            canvas = tk.Canvas(self.frame, height=150, bg='white', highlightthickness=1,
+                               highlightbackground='#cccccc')
+            canvas.grid(row=1 + position // 2, column=position % 2, sticky=(tk.W, tk.E, tk.N, tk.S),
+                        padx=5, pady=5)
+            items = {
+                'line': canvas.create_line(0, 0, 0, 0, fill='#1f77b4', width=1),
+                'title': canvas.create_text(MARGIN, MARGIN, text=title, anchor=tk.NW,
+                                            font=('Arial', 9, 'bold')),
+                'scale': canvas.create_text(0, MARGIN, text="", anchor=tk.NE, font=('Arial', 8)),
+                'start': canvas.create_text(MARGIN, 0, text="", anchor=tk.SW, font=('Arial', 8)),
+                'end': canvas.create_text(0, 0, text="", anchor=tk.SE, font=('Arial', 8))
+            }
+            canvas.bind('<Configure>', lambda event: self.request_redraw(50))
+            self.canvases[metric] = (canvas, items)
+        
+        for column in range(2):
+            self.frame.columnconfigure(column, weight=1)
+        for row in range(1, 3):
+            self.frame.rowconfigure(row, weight=1)
+    
+    def attach(self, monitor):
+        """Associe le panneau à un monitoring (l'historique sera relu depuis sa base)"""
+        self.monitor = monitor
+        self.series = {}
+        self.loaded = set()
+        self.request_redraw(0)
+    
+    def detach(self):
+        """Cesse les rendus programmés (les courbes restent affichées)"""
+        if self.redraw_job is not None:
+            self.frame.after_cancel(self.redraw_job)
+            self.redraw_job = None
+        self.monitor = None
+    
+    def fill_targets(self):
+        """Cibles proposées : configurées et présentes dans la base"""
+        if self.monitor is None:
+            return
+        targets = {target['name'] for target in self.monitor.config.get("targets", [])}
+        if self.monitor.metric_store:
+            targets.update(self.monitor.metric_store.list_targets())
+        self.target_combo['values'] = sorted(targets)
+    
+    def select_target(self):
+        """Affiche une cible, en chargeant son historique à la première sélection"""
+        target = self.target_var.get()
+        if target and self.monitor is not None and target not in self.loaded:
+            self.load_history(target)
+        self.request_redraw(0)
+    
+    def load_history(self, target: str):
+        """Charge la période la plus longue depuis la base locale"""
+        self.loaded.add(target)
+        store = self.monitor.metric_store
+        end = time.time()
+        for metric, _, _ in CHART_METRICS:
+            buffer = SeriesBuffer()
+            if store:
+                buffer.extend(store.query(target, metric, end - max(PERIODS.values()), end))
+            # Échantillons reçus en direct avant le chargement : postérieurs à la base, conservés
+            live = self.series.get((target, metric))
+            if live is not None:
+                buffer.extend(zip(live.x, live.y))
+            self.series[(target, metric)] = buffer
+    
+    def add_samples(self, samples: Dict[str, Dict]):
+        """Ajoute les derniers échantillons reçus ({cible: métriques}) aux séries"""
+        selected = self.target_var.get()
+        for target, metrics in samples.items():
+            if target not in self.loaded and target != selected:
+                continue
+            timestamp = datetime.fromisoformat(metrics['timestamp']).timestamp()
+            for metric, _, _ in CHART_METRICS:
+                value = metrics.get(metric)
+                if value is None:
+                    continue
+                buffer = self.series.get((target, metric))
+                if buffer is None:
+                    buffer = self.series[(target, metric)] = SeriesBuffer()
+                buffer.append(timestamp, float(value))
+        if selected in samples:
+            self.request_redraw(REDRAW_MS)
+    
+    def request_redraw(self, delay: int):
+        """Programme un rendu (les demandes rapprochées sont regroupées)"""
+        if self.redraw_job is not None:
+            if delay > 0:
+                return
+            self.frame.after_cancel(self.redraw_job)
+        self.redraw_job = self.frame.after(delay, self.redraw)
+    
+    def redraw(self):
+        """Redessine les courbes de la cible sélectionnée sur la période choisie"""
+        self.redraw_job = None
+        target = self.target_var.get()
+        if not target:
+            return
+        
+        started = time.perf_counter()
+        end = time.time()
+        start = end - PERIODS.get(self.period_var.get(), 3600)
+        method = METHODS.get(self.method_var.get(), LTTB)
+        drawn = 0
+        for metric, _, is_percent in CHART_METRICS:
+            canvas, items = self.canvases[metric]
+            buffer = self.series.get((target, metric))
+            width = max(canvas.winfo_width(), 2 * MARGIN + 2)
+            height = max(canvas.winfo_height(), 2 * MARGIN + 2)
+            if buffer is None or len(buffer) == 0:
+                xs, ys = [], []
+            else:
+                xs, ys = buffer.points(start, end, width - 2 * MARGIN, method)
+            drawn += len(xs)
+            
+            top = 100.0 if is_percent else max(ys, default=0.0) * 1.1 or 1.0
+            canvas.coords(items['line'], *self.line_coords(xs, ys, start, end, top, width, height))
+            canvas.coords(items['scale'], width - MARGIN, MARGIN)
+            canvas.itemconfigure(items['scale'], text=f"{top:.0f}" if is_percent else f"{top:,.0f}")
+            canvas.coords(items['start'], MARGIN, height - MARGIN)
+            canvas.itemconfigure(items['start'], text=datetime.fromtimestamp(start).strftime('%d/%m %H:%M'))
+            canvas.coords(items['end'], width - MARGIN, height - MARGIN)
+            canvas.itemconfigure(items['end'], text=datetime.fromtimestamp(end).strftime('%d/%m %H:%M'))
+        
+        elapsed = (time.perf_counter() - started) * 1000
+        self.render_var.set(f"Rendu : {elapsed:.1f} ms ({drawn} points)")
+    
+    @staticmethod
+    def line_coords(xs: List[float], ys: List[float], start: float, end: float, top: float,
+                    width: int, height: int) -> List[float]:
+        """Coordonnées canevas d'une courbe (au moins deux points pour create_line)"""
+        if not xs:
+            return [0, 0, 0, 0]
+        plot_width = width - 2 * MARGIN
+        plot_height = height - 2 * MARGIN
+        x_scale = plot_width / max(end - start, 1e-9)
+        y_scale = plot_height / top
+        coords = []
+        for x, y in zip(xs, ys):
+            coords.append(MARGIN + (x - start) * x_scale)
+            coords.append(height - MARGIN - min(max(y, 0.0), top) * y_scale)
+        if len(coords) == 2:
+            coords.extend(coords)
+        return coords
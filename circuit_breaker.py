@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Disjoncteur par Cible
+=====================
+Évite de bloquer le polling sur les cibles injoignables
+"""
+
+import time
+from typing import Dict, Optional
+
+HEALTHY = 'HEALTHY'
+SUSPECT = 'SUSPECT'
+OPEN = 'OPEN'
+HALF_OPEN = 'HALF_OPEN'
+
+class TargetHealth:
+    """État de santé d'une cible : healthy → suspect → open → half-open"""
+    
+    def __init__(self, base_backoff: float):
+        self.state = HEALTHY
+        self.failures = 0
+        self.backoff = base_backoff
+        self.next_probe = 0.0
+        self.last_error = None
+    
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable de l'état"""
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'backoff': self.backoff,
+            'last_error': self.last_error
+        }
+
+class CircuitBreaker:
+    """Disjoncteur SNMP avec ré-essais à backoff exponentiel"""
+    
+    def __init__(self, config: Dict, logger=None):
+        breaker_config = config.get("circuit_breaker", {})
+        self.failure_threshold = breaker_config.get("failure_threshold", 2)
+        self.base_backoff = breaker_config.get("base_backoff", 60)
+        self.max_backoff = breaker_config.get("max_backoff", 3600)
+        self.logger = logger
+        self.targets = {}
+    
+    def get(self, target: Dict) -> TargetHealth:
+        """État de santé d'une cible (créé à la demande)"""
+        health = self.targets.get(target['name'])
+        if health is None:
+            health = TargetHealth(self.base_backoff)
+            self.targets[target['name']] = health
+        return health
+    
+    def is_healthy(self, target: Dict) -> bool:
+        """Indique si la cible est dans l'état nominal"""
+        return self.get(target).state == HEALTHY
+    
+    def allow_request(self, target: Dict, now: Optional[float] = None) -> bool:
+        """Indique si la cible doit être interrogée ; passe en half-open à l'échéance du backoff"""
+        health = self.get(target)
+        if health.state != OPEN:
+            return True
+        
+        now = time.monotonic() if now is None else now
+        if now >= health.next_probe:
+            health.state = HALF_OPEN
+            return True
+        return False
+    
+    def record_success(self, target: Dict):
+        """La cible a répondu : retour à l'état nominal"""
+        health = self.get(target)
+        if health.state != HEALTHY and self.logger:
+            self.logger.info(f"Cible {target['name']} de nouveau joignable")
+        health.state = HEALTHY
+        health.failures = 0
+        health.backoff = self.base_backoff
+        health.last_error = None
+    
+    def record_failure(self, target: Dict, error: str, now: Optional[float] = None):
+        """Timeout ou erreur de transport sur une cible"""
+        health = self.get(target)
+        now = time.monotonic() if now is None else now
+        health.failures += 1
+        health.last_error = error
+        
+        if health.state == HALF_OPEN:
+            # Sonde échouée : on double le délai avant la prochaine
+            health.backoff = min(health.backoff * 2, self.max_backoff)
+            health.state = OPEN
+            health.next_probe = now + health.backoff
+        elif health.failures >= self.failure_threshold:
+            if health.state != OPEN and self.logger:
+                self.logger.warning(f"Cible {target['name']} injoignable, "
+                                    f"nouvelle tentative dans {health.backoff:.0f}s")
+            health.state = OPEN
+            health.next_probe = now + health.backoff
+        else:
+            health.state = SUSPECT
+    
+    def get_states(self) -> Dict[str, Dict]:
+        """État de santé de toutes les cibles connues"""
+        return {name: health.to_dict() for name, health in self.targets.items()}
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calcul des Débits Réseau
+========================
+Transforme les compteurs SNMP (ifInOctets, ifHCInOctets...) en octets/s
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+COUNTER32_MAX = 2 ** 32
+
+class CounterRates:
+    """État des compteurs par cible : deltas, rebouclage et redémarrage d'agent"""
+    
+    def __init__(self):
+        self.state = {}
+    
+    def reset(self, target_name: Optional[str] = None):
+        """Oublie l'état d'une cible, ou de toutes les cibles"""
+        if target_name is None:
+            self.state.clear()
+        else:
+            self.state.pop(target_name, None)
+    
+    def update(self, target_name: str, counters: Dict[str, Tuple[float, int]],
+               uptime: Optional[float] = None, now: Optional[float] = None) -> Dict[str, float]:
+        """Enregistre un échantillon et retourne les débits (octets/s) depuis le précédent
+        
+        counters associe à chaque nom de compteur un couple (valeur, nombre de bits).
+        uptime est sysUpTime en centièmes de seconde, s'il est disponible.
+        """
+        now = time.monotonic() if now is None else now
+        previous = self.state.get(target_name)
+        self.state[target_name] = {'time': now, 'uptime': uptime, 'counters': counters}
+        
+        if previous is None:
+            return {}
+        
+        # Redémarrage de l'agent : les compteurs sont repartis de zéro
+        if uptime is not None and previous['uptime'] is not None and uptime < previous['uptime']:
+            return {}
+        
+        # Durée écoulée côté agent si possible (indépendante de la latence réseau)
+        if uptime is not None and previous['uptime'] is not None:
+            elapsed = (uptime - previous['uptime']) / 100.0
+        else:
+            elapsed = now - previous['time']
+        if elapsed <= 0:
+            return {}
+        
+        rates = {}
+        for name, (value, bits) in counters.items():
+            old = previous['counters'].get(name)
+            # Changement de type de compteur (HC ↔ 32 bits) : pas de delta possible
+            if old is None or old[1] != bits:
+                continue
+            
+            delta = value - old[0]
+            if delta < 0:
+                if bits == 32:
+                    # Un compteur 32 bits reboucle toutes les quelques secondes à 10 Gb/s
+                    delta += COUNTER32_MAX
+                else:
+                    # Un compteur 64 bits ne reboucle pas en pratique : remise à zéro
+                    continue
+            rates[name] = delta / elapsed
+        return rates
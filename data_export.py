@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export des Données
+==================
+Export en flux des échantillons de la base locale et des alertes, pour un
+intervalle de temps et un ensemble de cibles : CSV (module csv, gzip en option)
+ou Parquet (PyArrow), écrits par lots de taille bornée
+"""
+
+import csv
+import gzip
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+CSV = 'csv'
+CSV_GZIP = 'csv.gz'
+PARQUET = 'parquet'
+
+# Lignes par lot : mémoire bornée quel que soit le volume exporté
+CHUNK_ROWS = 50000
+
+METRIC_COLUMNS = ('timestamp', 'target', 'metric', 'value')
+ALERT_COLUMNS = ('timestamp', 'target', 'level', 'metric', 'value', 'message')
+
+# Appelé après chaque lot : (lignes écrites, avancement entre 0 et 1)
+ProgressCallback = Callable[[int, float], None]
+
+def detect_format(path: str) -> str:
+    """Format d'après l'extension du fichier (CSV par défaut)"""
+    lowered = path.lower()
+    if lowered.endswith('.parquet'):
+        return PARQUET
+    if lowered.endswith('.gz'):
+        return CSV_GZIP
+    return CSV
+
+def chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """Découpe un itérateur de lignes en lots d'au plus size lignes"""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class CsvWriter:
+    """Lignes CSV (séparateurs et guillemets gérés par le module csv), compressées si demandé"""
+    
+    def __init__(self, path: str, columns: Sequence[str], compress: bool = False):
+        if compress:
+            self.file = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        else:
+            self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+    
+    def write(self, chunk: List[Tuple]):
+        self.writer.writerows((datetime.fromtimestamp(row[0]).isoformat(),) + tuple(row[1:]) for row in chunk)
+    
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Fichier Parquet écrit par groupes de lignes (un par lot)"""
+    
+    def __init__(self, path: str, columns: Sequence[str]):
+        if pa is None:
+            raise ImportError("PyArrow est requis pour l'export Parquet")
+        fields = [pa.field('timestamp', pa.timestamp('us'))]
+        fields += [pa.field(column, pa.float64() if column == 'value' else pa.string()) for column in columns[1:]]
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+    
+    def write(self, chunk: List[Tuple]):
+        columns = list(zip(*chunk))
+        arrays = [pa.array([int(timestamp * 1000000) for timestamp in columns[0]], pa.timestamp('us'))]
+        arrays += [pa.array(values, self.schema.field(index + 1).type) for index, values in enumerate(columns[1:])]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+    
+    def close(self):
+        self.writer.close()
+
+def open_writer(path: str, columns: Sequence[str], fmt: Optional[str] = None):
+    """Writer adapté au format demandé (ou déduit de l'extension)"""
+    fmt = fmt or detect_format(path)
+    if fmt == PARQUET:
+        return ParquetWriter(path, columns)
+    return CsvWriter(path, columns, compress=(fmt == CSV_GZIP))
+
+def write_rows(path: str, columns: Sequence[str], rows: Iterable[Tuple], progress_of: Callable[[], float],
+               fmt: Optional[str] = None, chunk_rows: int = CHUNK_ROWS,
+               progress: Optional[ProgressCallback] = None) -> int:
+    """Écrit des lignes par lots et signale l'avancement ; renvoie le nombre de lignes écrites"""
+    writer = open_writer(path, columns, fmt)
+    written = 0
+    try:
+        for chunk in chunks(rows, max(1, chunk_rows)):
+            writer.write(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written, progress_of())
+    finally:
+        writer.close()
+    if progress:
+        progress(written, 1.0)
+    return written
+
+def export_metrics(store, path: str, start: float, end: float, targets: Optional[Sequence[str]] = None,
+                   metrics: Optional[Sequence[str]] = None, fmt: Optional[str] = None,
+                   chunk_rows: int = CHUNK_ROWS, progress: Optional[ProgressCallback] = None) -> int:
+    """Exporte les points (horodatage, cible, métrique, valeur) de [start, end], série par série"""
+    if targets is None:
+        targets = store.list_targets()
+    series = [(target, metric) for target in targets
+              for metric in (metrics if metrics is not None else store.list_metrics(target))]
+    done = [0]
+    
+    def rows() -> Iterator[Tuple]:
+        # Lecture par mmap série par série : seul le lot en cours est en mémoire
+        for target, metric in series:
+            for timestamp, value in store.query(target, metric, start, end):
+                yield timestamp, target, metric, value
+            done[0] += 1
+    
+    return write_rows(path, METRIC_COLUMNS, rows(), lambda: done[0] / max(1, len(series)),
+                      fmt, chunk_rows, progress)
+
+def export_alerts(history, path: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  targets: Optional[Sequence[str]] = None, fmt: Optional[str] = None,
+                  chunk_rows: int = CHUNK_ROWS, progress: Optional[ProgressCallback] = None) -> int:
+    """Exporte les alertes de l'historique sur ]start, end], pour toutes les cibles ou certaines"""
+    if targets is None:
+        alerts = history.range(start, end)
+    else:
+        alerts = sorted((alert for target in targets for alert in history.range(start, end, target)),
+                        key=lambda alert: alert['timestamp'])
+    done = [0]
+    
+    def rows() -> Iterator[Tuple]:
+        for alert in alerts:
+            done[0] += 1
+            details = alert['alert']
+            value = details.get('value')
+            yield (alert['timestamp'].timestamp(), alert['target'], details.get('level'),
+                   details.get('metric'), None if value is None else float(value), details.get('message'))
+    
+    return write_rows(path, ALERT_COLUMNS, rows(), lambda: done[0] / max(1, len(alerts)),
+                      fmt, chunk_rows, progress)
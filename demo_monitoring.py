@@ -5,12 +5,15 @@ Script de Démonstration - Monitoring Système
 Simule des métriques SNMP pour tester le système de monitoring
 """
 
+import argparse
 import time
 import random
 import threading
 from datetime import datetime
 import json
 import os
+from metric_generator import ANOMALY_TYPES, MetricGenerator, np
+from snmp_responder import SnmpResponder
 
 class SNMPSimulator:
     """Simulateur SNMP pour les tests"""
@@ -19,6 +22,11 @@ class SNMPSimulator:
         self.config = self.load_demo_config(config_file)
         self.running = False
         self.metrics = {}
+        self.responder = None
+        # Génération par lots : générateur de la flotte, dernier tick et ligne de chaque cible
+        self.generator = None
+        self.latest = None
+        self.rows = {}
         
     def load_demo_config(self, config_file):
         """Charge la configuration de démonstration"""
@@ -40,12 +48,29 @@ class SNMPSimulator:
                 "cpu_base": 30,  # % de base
                 "memory_base": 50,  # % de base
                 "disk_base": 60,  # % de base
-                "network_base": 100000  # octets de base
+                "network_base": 100000,  # octets de base
+                "diurnal_amplitude": 0.3,  # variation du CPU et du trafic sur la journée
+                "diurnal_peak_hour": 14,  # heure UTC du pic d'activité
+                "seed": 42  # même graine, mêmes données
             },
             "anomalies": {
                 "enabled": True,
                 "probability": 0.1,  # 10% de chance d'anomalie
                 "duration": 300  # durée en secondes
+            },
+            "agent": {
+                "devices": 100,  # équipements virtuels servis en SNMP
+                "host": "127.0.0.1",
+                "base_port": 16100,
+                "ports": None,  # défaut: un port par équipement, sinon communauté "public@<index>"
+                "community": "public",
+                "workers": 1,  # processus répondeurs
+                "latency_ms": 5,
+                "jitter_ms": 2,
+                "loss": 0.0,  # taux de pertes de paquets (0 à 1)
+                "interfaces": 2,
+                "disks": 2,
+                "seed": 42
             }
         }
         
@@ -112,8 +137,75 @@ class SNMPSimulator:
             'network_total': network_usage
         }
     
+    def generate_batch(self, now=None):
+        """Génère un tick de toutes les cibles d'un bloc (colonnes NumPy, reproductibles pour une graine)"""
+        targets = self.config["targets"]
+        if self.generator is None:
+            simulation = self.config["simulation"]
+            self.generator = MetricGenerator(len(targets), simulation, self.config["anomalies"],
+                                             simulation.get("seed", 0))
+            self.rows = {target['name']: row for row, target in enumerate(targets)}
+        
+        columns = self.generator.tick(time.time() if now is None else now)
+        columns['memory_total'] = 8192  # 8 GB
+        columns['memory_used'] = (8192 * columns['memory_percent'] / 100).astype(np.int64)
+        self.latest = columns
+        return columns
+    
+    def metrics_at(self, row):
+        """Métriques d'une cible du dernier lot, au format de generate_metrics"""
+        columns = self.latest
+        target = self.config["targets"][row]
+        metrics = {
+            'timestamp': datetime.fromtimestamp(columns['timestamp']).isoformat(),
+            'target': target['name'],
+            'ip': target['ip'],
+            'memory_total': columns['memory_total']
+        }
+        for key in ('cpu_usage', 'memory_used', 'memory_percent', 'disk_usage',
+                    'network_in', 'network_out', 'network_total'):
+            metrics[key] = columns[key][row].item()
+        return metrics
+    
     def start_simulation(self):
         """Démarre la simulation"""
+        if np is None:
+            # Sans NumPy : génération cible par cible
+            self.start_simulation_per_target()
+            return
+        
+        self.running = True
+        targets = self.config["targets"]
+        print("🎭 Démarrage de la simulation SNMP")
+        print("=" * 50)
+        
+        while self.running:
+            start = time.perf_counter()
+            columns = self.generate_batch()
+            elapsed = time.perf_counter() - start
+            now = datetime.now().strftime('%H:%M:%S')
+            
+            # Détail affiché pour une démonstration à taille humaine, résumé au-delà
+            if len(targets) <= 100:
+                for row in np.flatnonzero(columns['anomaly_started']):
+                    kind = ANOMALY_TYPES[columns['anomaly'][row]]
+                    print(f"🚨 ANOMALIE détectée sur {targets[row]['name']}: {kind}")
+            if len(targets) <= 20:
+                for row, target in enumerate(targets):
+                    print(f"[{now}] {target['name']}: "
+                          f"CPU={columns['cpu_usage'][row]:.1f}%, "
+                          f"Mémoire={columns['memory_percent'][row]:.1f}%, "
+                          f"Disque={columns['disk_usage'][row]:.1f}%")
+            else:
+                print(f"[{now}] {len(targets)} cibles générées en {elapsed * 1000:.1f} ms: "
+                      f"CPU moyen={columns['cpu_usage'].mean():.1f}%, "
+                      f"Mémoire moyenne={columns['memory_percent'].mean():.1f}%, "
+                      f"{np.count_nonzero(columns['anomaly'] >= 0)} anomalies en cours")
+            
+            time.sleep(self.config["simulation"]["interval"])
+    
+    def start_simulation_per_target(self):
+        """Simulation cible par cible avec generate_metrics"""
         self.running = True
         print("🎭 Démarrage de la simulation SNMP")
         print("=" * 50)
@@ -138,10 +230,44 @@ class SNMPSimulator:
     
     def get_metrics(self, target_name):
         """Récupère les métriques d'une cible"""
-        return self.metrics.get(target_name, {})
+        row = self.rows.get(target_name)
+        if self.latest is None or row is None:
+            return self.metrics.get(target_name, {})
+        return self.metrics_at(row)
+
+    def start_agent(self):
+        """Sert les équipements virtuels en SNMP (UDP) et retourne les cibles correspondantes"""
+        agent = self.config["agent"]
+        self.responder = SnmpResponder(
+            agent["devices"], agent["base_port"], agent["host"], agent["community"],
+            agent["workers"], agent["interfaces"], agent["disks"],
+            ports=agent["ports"],
+            latency=agent["latency_ms"] / 1000,
+            jitter=agent["jitter_ms"] / 1000,
+            loss=agent["loss"],
+            profile=self.config["simulation"],
+            anomalies=self.config["anomalies"],
+            seed=agent["seed"],
+            # Anomalies affichées pour une démonstration à taille humaine
+            verbose=agent["devices"] <= 100
+        )
+        self.responder.start()
+        self.running = True
+        ports = self.responder.options["ports"]
+        print(f"🎭 Agent SNMP: {agent['devices']} équipements sur {agent['host']}:"
+              f"{agent['base_port']}-{agent['base_port'] + ports - 1}")
+        return self.responder.targets("Serveur Demo")
+    
+    def stop_agent(self):
+        """Arrête l'agent SNMP"""
+        if self.responder is not None:
+            self.responder.stop()
+            self.responder = None
+        self.running = False
+        print("🛑 Agent SNMP arrêté")
 
-def create_demo_config():
-    """Crée une configuration de démonstration pour le monitoring"""
+def create_demo_config(targets=None):
+    """Crée une configuration de démonstration pour le monitoring (cibles de l'agent simulé si fournies)"""
     demo_config = {
         "snmp": {
             "community": "public",
@@ -183,6 +309,13 @@ def create_demo_config():
         }
     }
     
+    if targets:
+        demo_config["targets"] = targets
+        # Agent local : réponse rapide attendue, les pertes simulées ne sont pas ré-essayées indéfiniment
+        demo_config["snmp"].update({"timeout": 1, "retries": 1})
+        if len(targets) > 100:
+            demo_config["monitoring"]["mode"] = "async"
+    
     with open('config.json', 'w', encoding='utf-8') as f:
         json.dump(demo_config, f, indent=4, ensure_ascii=False)
     
@@ -190,14 +323,58 @@ def create_demo_config():
 
 def main():
     """Fonction principale de démonstration"""
+    parser = argparse.ArgumentParser(description="Démonstration du monitoring système")
+    parser.add_argument('--agent', action='store_true',
+                        help="servir les équipements simulés en SNMP (UDP) au lieu d'afficher des valeurs")
+    parser.add_argument('--devices', type=int, help="nombre d'équipements virtuels")
+    parser.add_argument('--base-port', type=int, help="premier port UDP")
+    parser.add_argument('--ports', type=int, help="ports UDP partagés (équipements distingués par communauté)")
+    parser.add_argument('--workers', type=int, help="processus répondeurs")
+    parser.add_argument('--latency', type=float, help="latence de réponse (ms)")
+    parser.add_argument('--loss', type=float, help="taux de pertes de paquets (0 à 1)")
+    parser.add_argument('--seed', type=int, help="graine des tirages (simulation et agent)")
+    args = parser.parse_args()
+    
     print("🎭 Script de Démonstration - Monitoring Système")
     print("=" * 60)
     
-    # Créer la configuration de démonstration
-    create_demo_config()
-    
     # Démarrer le simulateur
     simulator = SNMPSimulator()
+    if args.seed is not None:
+        simulator.config["simulation"]["seed"] = args.seed
+        simulator.config["agent"]["seed"] = args.seed
+    
+    if args.agent:
+        overrides = {'devices': args.devices, 'base_port': args.base_port, 'ports': args.ports,
+                     'workers': args.workers, 'latency_ms': args.latency, 'loss': args.loss}
+        simulator.config["agent"].update({key: value for key, value in overrides.items() if value is not None})
+        try:
+            # Configuration de monitoring pointant sur les équipements virtuels
+            create_demo_config(simulator.start_agent())
+            
+            print("\n📊 Agent SNMP en cours...")
+            print("💡 Vous pouvez maintenant:")
+            print("   - Lancer le monitoring: python monitoring_system.py")
+            print("   - Ouvrir l'interface: python monitoring_ui.py")
+            print("   - Appuyer sur Ctrl+C pour arrêter l'agent")
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n🛑 Arrêt de la démonstration...")
+            simulator.stop_agent()
+            print("✅ Démonstration terminée")
+        return
+    
+    if args.devices:
+        # Flotte simulée de la taille demandée (essais d'endurance)
+        simulator.config["targets"] = [
+            {"name": f"Serveur Demo {index + 1}",
+             "ip": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}", "port": 161}
+            for index in range(args.devices)
+        ]
+    
+    # Créer la configuration de démonstration
+    create_demo_config()
     
     try:
         # Démarrer la simulation dans un thread
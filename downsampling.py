@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Réduction des Séries pour l'Affichage
+=====================================
+Largest-Triangle-Three-Buckets (LTTB) et regroupement min/max ; résumés min/max
+par blocs tenus à jour à l'ajout, pour que le coût d'un tracé dépende de la
+largeur en pixels et non de la longueur de l'historique
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LTTB = 'lttb'
+MINMAX = 'minmax'
+
+# Points par bloc de résumé (niveau 0), puis blocs regroupés par FANOUT à chaque niveau
+FANOUT = 16
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> List[int]:
+    """Indices des points conservés par LTTB (premier et dernier points inclus)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    # NumPy n'est rentable que pour des seaux de plusieurs dizaines de points
+    if np is not None and n > 64 * threshold:
+        return lttb_numpy(np.asarray(x, dtype=float), np.asarray(y, dtype=float), threshold)
+    
+    # n - 2 points intérieurs répartis en threshold - 2 seaux
+    step = (n - 2) / (threshold - 2)
+    edges = [int(1 + bucket * step) for bucket in range(threshold - 2)] + [n - 1]
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        # Sommet suivant : moyenne du seau suivant (dernier point pour le dernier seau)
+        if bucket + 2 < len(edges):
+            next_low, next_high = high, edges[bucket + 2]
+            next_x = sum(x[next_low:next_high]) / (next_high - next_low)
+            next_y = sum(y[next_low:next_high]) / (next_high - next_low)
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        
+        ax, ay = x[previous], y[previous]
+        best, best_area = low, -1.0
+        for index in range(low, high):
+            area = abs((ax - next_x) * (y[index] - ay) - (ax - x[index]) * (next_y - ay))
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        previous = best
+    selected.append(n - 1)
+    return selected
+
+def lttb_numpy(x, y, threshold: int) -> List[int]:
+    """LTTB vectorisé par seau ; moyennes des seaux calculées d'un bloc par sommes cumulées"""
+    n = len(x)
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    sizes = np.diff(edges)
+    cumulative_x = np.concatenate(([0.0], np.cumsum(x)))
+    cumulative_y = np.concatenate(([0.0], np.cumsum(y)))
+    mean_x = (cumulative_x[edges[1:]] - cumulative_x[edges[:-1]]) / sizes
+    mean_y = (cumulative_y[edges[1:]] - cumulative_y[edges[:-1]]) / sizes
+    next_x = np.append(mean_x[1:], x[-1]).tolist()
+    next_y = np.append(mean_y[1:], y[-1]).tolist()
+    
+    bounds = edges.tolist()
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        low, high = bounds[bucket], bounds[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        areas = np.abs((ax - next_x[bucket]) * (y[low:high] - ay) - (ax - x[low:high]) * (next_y[bucket] - ay))
+        previous = low + int(areas.argmax())
+        selected.append(previous)
+    selected.append(n - 1)
+    return selected
+
+def minmax_indices(x: Sequence[float], y: Sequence[float], buckets: int) -> List[int]:
+    """Indices du minimum et du maximum de chaque seau, dans l'ordre chronologique"""
+    n = len(x)
+    if buckets <= 0 or 2 * buckets >= n:
+        return list(range(n))
+    if np is not None and n > 64 * buckets:
+        values = np.asarray(y, dtype=float)
+        bucket_ids = np.arange(n) * buckets // n
+        # Tri par seau puis par valeur : premier élément = minimum, dernier = maximum
+        order = np.lexsort((values, bucket_ids))
+        starts = np.searchsorted(bucket_ids[order], np.arange(buckets))
+        ends = np.append(starts[1:], n) - 1
+        return np.unique(np.stack((order[starts], order[ends]))).tolist()
+    
+    selected = []
+    for bucket in range(buckets):
+        # Mêmes seaux que la version NumPy : indices i tels que i * buckets // n == bucket
+        low, high = -(-bucket * n // buckets), -(-(bucket + 1) * n // buckets)
+        lowest = min(range(low, high), key=y.__getitem__)
+        highest = max(range(low, high), key=y.__getitem__)
+        selected.extend(sorted({lowest, highest}))
+    return selected
+
+def downsample(x: Sequence[float], y: Sequence[float], width: int, method: str = LTTB) -> List[int]:
+    """Indices des points à tracer sur width pixels"""
+    if method == MINMAX:
+        return minmax_indices(x, y, width)
+    return lttb_indices(x, y, width)
+
+class SeriesBuffer:
+    """Série chronologique en ajout seul, avec minimum et maximum de chaque bloc à plusieurs échelles"""
+    
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        # Niveau k : indices du minimum et du maximum de chaque bloc complet de FANOUT ** (k + 1) points
+        self.mins = []
+        self.maxs = []
+    
+    def __len__(self) -> int:
+        return len(self.x)
+    
+    def append(self, timestamp: float, value: float):
+        """Ajoute un point (ignoré s'il n'est pas postérieur au dernier) et complète les résumés"""
+        if self.x and timestamp <= self.x[-1]:
+            return
+        self.x.append(timestamp)
+        self.y.append(value)
+        
+        y = self.y
+        count = len(y)
+        level = 0
+        size = FANOUT
+        while count % size == 0:
+            if level == len(self.mins):
+                self.mins.append(array('q'))
+                self.maxs.append(array('q'))
+            if level == 0:
+                lows = highs = range(count - size, count)
+            else:
+                # Blocs enfants du niveau inférieur couverts par ce bloc
+                first = (count - size) // (size // FANOUT)
+                lows = self.mins[level - 1][first:first + FANOUT]
+                highs = self.maxs[level - 1][first:first + FANOUT]
+            self.mins[level].append(min(lows, key=y.__getitem__))
+            self.maxs[level].append(max(highs, key=y.__getitem__))
+            level += 1
+            size *= FANOUT
+    
+    def extend(self, points: Iterable[Tuple[float, float]]):
+        """Ajoute des points (horodatage, valeur)"""
+        for timestamp, value in points:
+            self.append(timestamp, value)
+    
+    def candidates(self, low: int, high: int, max_points: int) -> List[int]:
+        """Indices (triés) d'au plus ~max_points points de [low, high) conservant les extrêmes locaux"""
+        span = high - low
+        if span <= max_points:
+            return list(range(low, high))
+        # Niveau le plus fin dont les blocs (2 points chacun) tiennent dans max_points
+        top = 0
+        size = FANOUT
+        while top + 1 < len(self.mins) and 2 * span // size > max_points:
+            top += 1
+            size *= FANOUT
+        
+        indices = []
+        position = low
+        while position < high:
+            # Plus grand bloc complet aligné sur position et contenu dans [position, high)
+            level = min(top, len(self.mins) - 1)
+            size = FANOUT ** (level + 1)
+            while level >= 0 and (position % size or position + size > high or
+                                  position // size >= len(self.mins[level])):
+                level -= 1
+                size //= FANOUT
+            if level < 0:
+                indices.append(position)
+                position += 1
+                continue
+            block = position // size
+            indices.extend(sorted({self.mins[level][block], self.maxs[level][block]}))
+            position += size
+        # Premier et dernier points de l'intervalle toujours présents (bords du tracé)
+        if indices[0] != low:
+            indices.insert(0, low)
+        if indices[-1] != high - 1:
+            indices.append(high - 1)
+        return indices
+    
+    def points(self, start: float, end: float, width: int, method: str = LTTB) -> Tuple[List[float], List[float]]:
+        """Points de [start, end] réduits pour width pixels : (horodatages, valeurs)"""
+        low = bisect_left(self.x, start)
+        high = bisect_right(self.x, end)
+        # Pré-sélection par les résumés (quelques points par pixel), puis LTTB ou min/max
+        indices = self.candidates(low, high, 4 * width)
+        x = [self.x[index] for index in indices]
+        y = [self.y[index] for index in indices]
+        selected = downsample(x, y, width, method)
+        return [x[index] for index in selected], [y[index] for index in selected]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Évaluation Vectorisée des Seuils
+================================
+Les échantillons d'un cycle sont rangés en une matrice (cibles × métriques)
+comparée d'un bloc aux seuils ; seules les cellules en dépassement
+produisent un contrôle
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from alert_state import breach_level
+from threshold_rules import ThresholdRules, make_check
+from metric_names import table_metrics
+
+TABLE_KEYS = ('interfaces', 'disks')
+NUMERIC_TYPES = {int, float, type(None)}
+EMPTY = {}
+
+# Au-delà de ce nombre de noms distincts (interfaces, points de montage), une table
+# est évaluée ligne par ligne plutôt qu'en colonnes
+MAX_TABLE_COLUMNS = 256
+
+def is_breach(check: Dict) -> bool:
+    """Indique si un contrôle dépasse son seuil warning ou critical"""
+    return breach_level(check['value'], check['warning'], check['critical'], check['comparator']) is not None
+
+class FleetEvaluator:
+    """Évalue les règles de seuil sur tout un lot d'échantillons (NumPy si disponible)"""
+    
+    def __init__(self, rules: ThresholdRules):
+        self.rules = rules
+    
+    def evaluate(self, samples: List[Tuple[Dict, Dict]],
+                 watch: Optional[List[Optional[Set[str]]]] = None) -> List[List[Dict]]:
+        """Contrôles en dépassement de chaque échantillon, dans l'ordre de ThresholdRules.evaluate
+        
+        watch donne pour chaque échantillon les métriques à contrôler même sans dépassement.
+        """
+        watch = watch or [None] * len(samples)
+        if np is None:
+            return [[check for check in self.rules.evaluate(target, metrics)
+                     if (keys and check['key'] in keys) or is_breach(check)]
+                    for (target, metrics), keys in zip(samples, watch)]
+        
+        # Un bloc par jeu de règles compilé (les cibles sans surcharge partagent le même)
+        groups = {}
+        for row, (target, _) in enumerate(samples):
+            groups.setdefault(self.rules.compile_for(target), []).append(row)
+        
+        fired = [[] for _ in samples]
+        for compiled, rows in groups.items():
+            self.evaluate_group(compiled, rows, samples, watch, fired)
+        
+        results = []
+        for checks in fired:
+            if len(checks) > 1:
+                checks.sort(key=lambda item: item[0])
+            results.append([check for _, check in checks])
+        return results
+    
+    def evaluate_group(self, compiled, rows: List[int], samples: List[Tuple[Dict, Dict]],
+                       watch: List[Optional[Set[str]]], fired: List[List]):
+        """Évalue les échantillons partageant un même jeu de règles"""
+        metrics_list = [samples[row][1] for row in rows]
+        watched = [(position, watch[row]) for position, row in enumerate(rows) if watch[row]]
+        
+        # Colonnes : (métrique, règle, nom, rang de la règle, table) pour chaque métrique couverte
+        columns = []
+        values = []
+        
+        def add_columns(key, table, raw):
+            column = self.column(raw)
+            for order, (spec, name) in enumerate(compiled.matching(key)):
+                columns.append((key, spec, name, order, table))
+                values.append(column)
+        
+        for key in set().union(*metrics_list):
+            if key not in TABLE_KEYS and compiled.matching(key):
+                add_columns(key, None, [metrics.get(key) for metrics in metrics_list])
+        
+        # Tables : une colonne par interface/point de montage, mêmes noms que table_metrics
+        for table in TABLE_KEYS:
+            entries = [metrics.get(table) or EMPTY for metrics in metrics_list]
+            names = set().union(*entries)
+            if len(names) > MAX_TABLE_COLUMNS:
+                self.evaluate_rows(compiled, table, rows, metrics_list, watch, fired)
+                continue
+            if table == 'disks':
+                for path in names:
+                    if compiled.matching(f"disk.{path}"):
+                        add_columns(f"disk.{path}", table, [entry.get(path) for entry in entries])
+            else:
+                directions = set().union(*(rates for entry in entries for rates in entry.values()))
+                for name in names:
+                    for direction in directions:
+                        if compiled.matching(f"if.{name}.{direction}"):
+                            add_columns(f"if.{name}.{direction}", table,
+                                        [entry.get(name, EMPTY).get(direction) for entry in entries])
+        
+        if not columns:
+            return
+        
+        matrix = np.column_stack(values)
+        hits = self.compare(matrix, [column[1] for column in columns])
+        unless_masks = {}
+        for j, (key, spec, name, order, table) in enumerate(columns):
+            # Alertes en cours : la cellule est contrôlée même sans dépassement
+            for position, keys in watched:
+                if key in keys and not np.isnan(matrix[position, j]):
+                    hits[position, j] = True
+            if spec['unless']:
+                if spec['unless'] not in unless_masks:
+                    unless_masks[spec['unless']] = np.fromiter(
+                        (bool(metrics.get(spec['unless'])) for metrics in metrics_list),
+                        dtype=bool, count=len(metrics_list))
+                hits[:, j] &= ~unless_masks[spec['unless']]
+        
+        for position, j in zip(*np.nonzero(hits)):
+            key, spec, name, order, table = columns[j]
+            metrics = metrics_list[position]
+            if table is None:
+                rank = (self.key_position(metrics, key), 0, order)
+            else:
+                rank = (self.key_position(metrics, table), self.table_position(metrics, table, key), order)
+            fired[rows[position]].append((rank, make_check(spec, key, float(matrix[position, j]), name)))
+    
+    def evaluate_rows(self, compiled, table: str, rows: List[int], metrics_list: List[Dict],
+                      watch: List[Optional[Set[str]]], fired: List[List]):
+        """Évalue une table ligne par ligne (noms trop hétérogènes pour une matrice)"""
+        for position, metrics in enumerate(metrics_list):
+            if not metrics.get(table):
+                continue
+            keys = watch[rows[position]]
+            for index, (key, value) in enumerate(table_metrics(table, metrics[table])):
+                for order, (spec, name) in enumerate(compiled.matching(key)):
+                    if spec['unless'] and metrics.get(spec['unless']):
+                        continue
+                    check = make_check(spec, key, value, name)
+                    if (keys and key in keys) or is_breach(check):
+                        rank = (self.key_position(metrics, table), index, order)
+                        fired[rows[position]].append((rank, check))
+    
+    @staticmethod
+    def column(raw: List):
+        """Valeurs d'une métrique pour toutes les lignes (NaN si absente ou non numérique)"""
+        if set(map(type, raw)) <= NUMERIC_TYPES:
+            return np.array(raw, dtype=float)
+        return np.array([float(value) if isinstance(value, (int, float)) and not isinstance(value, bool)
+                         else np.nan for value in raw], dtype=float)
+    
+    @staticmethod
+    def compare(matrix, specs: List[Dict]):
+        """Cellules dépassant le seuil warning ou critical de la règle de leur colonne"""
+        # Comparateurs "<" ramenés à ">" par changement de signe ; seuil absent = NaN (jamais atteint)
+        sign = np.array([1.0 if spec['comparator'] in ('>=', '>') else -1.0 for spec in specs])
+        strict = np.array([spec['comparator'] in ('>', '<') for spec in specs])
+        signed = matrix * sign
+        hits = np.zeros(matrix.shape, dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for level in ('warning', 'critical'):
+                thresholds = np.array([np.nan if spec[level] is None else spec[level] for spec in specs],
+                                      dtype=float) * sign
+                hits |= np.where(strict, signed > thresholds, signed >= thresholds)
+        return hits
+    
+    @staticmethod
+    def key_position(metrics: Dict, key: str) -> int:
+        """Rang d'une clé dans l'échantillon (ordre de flatten_metrics)"""
+        for position, name in enumerate(metrics):
+            if name == key:
+                return position
+        return len(metrics)
+    
+    @staticmethod
+    def table_position(metrics: Dict, table: str, key: str) -> int:
+        """Rang d'une valeur dans sa table (ordre de table_metrics)"""
+        for index, (name, _) in enumerate(table_metrics(table, metrics[table])):
+            if name == key:
+                return index
+        return 0
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentation du Poller
+=========================
+Histogrammes de latence SNMP (par cible et par OID), compteurs de timeouts
+et d'erreurs, durée des cycles comparée à l'intervalle configuré
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+# Bornes supérieures des compartiments (secondes), au-delà : compartiment de débordement
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sections chronométrées en dehors des requêtes SNMP
+POLL = 'poll'
+EMAIL = 'email'
+LOG = 'log'
+
+class LatencyHistogram:
+    """Histogramme à compartiments fixes : enregistrement en temps constant, fusionnable"""
+    
+    __slots__ = ('counts', 'count', 'total', 'maximum')
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+    
+    def observe(self, seconds: float):
+        """Enregistre une durée"""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+    
+    def merge(self, other: 'LatencyHistogram'):
+        """Ajoute les observations d'un autre histogramme"""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimation d'un quantile par interpolation dans son compartiment"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.maximum
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(estimate, self.maximum)
+            cumulative += count
+        return self.maximum
+    
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable (compartiments inclus pour la fusion)"""
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'max': self.maximum,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': list(self.counts)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        """Reconstruit un histogramme depuis to_dict"""
+        histogram = cls()
+        histogram.counts = list(data['buckets'])
+        histogram.count = data['count']
+        histogram.total = data['sum']
+        histogram.maximum = data['max']
+        return histogram
+
+class PollerStats:
+    """Mesures du poller, partagées par les threads de monitoring et d'interface"""
+    
+    def __init__(self, interval: float, target_count: int):
+        self.lock = threading.Lock()
+        self.configure(interval, target_count)
+        self.targets = {}
+        self.oids = {}
+        self.sections = {}
+        self.timeouts = {}
+        self.errors = {}
+        
+        # Cycle en cours : toutes les cibles interrogées une fois
+        self.cycle_start = None
+        self.cycle_polls = 0
+        self.cycle_busy = 0.0
+        self.cycles = 0
+        self.cycle_overruns = 0
+        self.cycle_total = 0.0
+        self.cycle_max = 0.0
+        self.last_cycle = None
+        self.last_cycle_busy = None
+    
+    def configure(self, interval: float, target_count: int):
+        """Intervalle de référence et nombre de cibles d'un cycle"""
+        self.interval = interval
+        self.target_count = max(1, target_count)
+    
+    def observe_request(self, target_name: str, names: Iterable[str], seconds: float):
+        """Latence d'une requête SNMP, attribuée à la cible et à chaque OID demandée"""
+        with self.lock:
+            histogram = self.targets.get(target_name)
+            if histogram is None:
+                histogram = self.targets[target_name] = LatencyHistogram()
+            histogram.observe(seconds)
+            for name in names:
+                histogram = self.oids.get(name)
+                if histogram is None:
+                    histogram = self.oids[name] = LatencyHistogram()
+                histogram.observe(seconds)
+    
+    def record_timeout(self, target_name: str):
+        """Compte une requête sans réponse"""
+        with self.lock:
+            self.timeouts[target_name] = self.timeouts.get(target_name, 0) + 1
+    
+    def record_error(self, target_name: str):
+        """Compte une erreur SNMP (errorStatus, exception)"""
+        with self.lock:
+            self.errors[target_name] = self.errors.get(target_name, 0) + 1
+    
+    def observe(self, section: str, seconds: float):
+        """Durée d'une section (envoi d'email, écriture des logs, ...)"""
+        with self.lock:
+            histogram = self.sections.get(section)
+            if histogram is None:
+                histogram = self.sections[section] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def record_poll(self, started: float, finished: float):
+        """Durée complète d'un poll de cible ; clôt le cycle quand toutes les cibles ont été vues"""
+        duration = finished - started
+        with self.lock:
+            histogram = self.sections.get(POLL)
+            if histogram is None:
+                histogram = self.sections[POLL] = LatencyHistogram()
+            histogram.observe(duration)
+            self.count_cycle_poll(started, finished, duration)
+    
+    def record_skip(self, now: float):
+        """Cible non interrogée (disjoncteur ouvert) : comptée dans le cycle sans durée de poll"""
+        with self.lock:
+            self.count_cycle_poll(now, now, 0.0)
+    
+    def count_cycle_poll(self, started: float, finished: float, duration: float):
+        """Ajoute une cible au cycle en cours et le clôt quand toutes ont été vues (verrou tenu)"""
+        if self.cycle_start is None:
+            self.cycle_start = started
+        self.cycle_polls += 1
+        self.cycle_busy += duration
+        if self.cycle_polls < self.target_count:
+            return
+        
+        # Avec les phases réparties, un cycle dépasse l'intervalle dès qu'un poll déborde de son créneau
+        elapsed = finished - self.cycle_start
+        self.cycles += 1
+        self.cycle_total += elapsed
+        self.cycle_max = max(self.cycle_max, elapsed)
+        if elapsed > self.interval:
+            self.cycle_overruns += 1
+        self.last_cycle = elapsed
+        self.last_cycle_busy = self.cycle_busy
+        self.cycle_start = None
+        self.cycle_polls = 0
+        self.cycle_busy = 0.0
+    
+    def get_stats(self) -> Dict:
+        """Instantané sérialisable des mesures"""
+        with self.lock:
+            return {
+                'targets': {name: histogram.to_dict() for name, histogram in self.targets.items()},
+                'oids': {name: histogram.to_dict() for name, histogram in self.oids.items()},
+                'sections': {name: histogram.to_dict() for name, histogram in self.sections.items()},
+                'timeouts': dict(self.timeouts),
+                'errors': dict(self.errors),
+                'cycles': {
+                    'interval': self.interval,
+                    'count': self.cycles,
+                    'overruns': self.cycle_overruns,
+                    'mean': self.cycle_total / self.cycles if self.cycles else None,
+                    'max': self.cycle_max,
+                    'last': self.last_cycle,
+                    'last_busy': self.last_cycle_busy
+                }
+            }
+
+def merge_stats(snapshots: List[Dict]) -> Dict:
+    """Fusionne les instantanés de plusieurs processus (mode multi-processus)"""
+    merged = {'targets': {}, 'oids': {}, 'sections': {}, 'timeouts': {}, 'errors': {}}
+    cycles = {'interval': None, 'count': 0, 'overruns': 0, 'mean': None, 'max': 0.0,
+              'last': None, 'last_busy': None}
+    cycle_total = 0.0
+    
+    for snapshot in snapshots:
+        for group in ('targets', 'oids', 'sections'):
+            histograms = merged[group]
+            for name, data in snapshot[group].items():
+                if name in histograms:
+                    histograms[name].merge(LatencyHistogram.from_dict(data))
+                else:
+                    histograms[name] = LatencyHistogram.from_dict(data)
+        for group in ('timeouts', 'errors'):
+            for name, count in snapshot[group].items():
+                merged[group][name] = merged[group].get(name, 0) + count
+        
+        # Chaque processus a ses propres cycles (sa partition de cibles)
+        worker_cycles = snapshot['cycles']
+        cycles['interval'] = worker_cycles['interval']
+        cycles['count'] += worker_cycles['count']
+        cycles['overruns'] += worker_cycles['overruns']
+        cycles['max'] = max(cycles['max'], worker_cycles['max'])
+        cycle_total += (worker_cycles['mean'] or 0.0) * worker_cycles['count']
+        if worker_cycles['last'] is not None and (cycles['last'] is None or worker_cycles['last'] > cycles['last']):
+            cycles['last'] = worker_cycles['last']
+            cycles['last_busy'] = worker_cycles['last_busy']
+    
+    if cycles['count']:
+        cycles['mean'] = cycle_total / cycles['count']
+    for group in ('targets', 'oids', 'sections'):
+        merged[group] = {name: histogram.to_dict() for name, histogram in merged[group].items()}
+    merged['cycles'] = cycles
+    return merged
+
+def total_histogram(histograms: Dict[str, Dict]) -> Dict:
+    """Agrège des histogrammes sérialisés (latence toutes cibles confondues)"""
+    total = LatencyHistogram()
+    for data in histograms.values():
+        total.merge(LatencyHistogram.from_dict(data))
+    return total.to_dict()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Flux des Échantillons en Direct
+===============================
+Dernier échantillon de chaque cible et files d'abonnés alimentées à chaque
+échantillon complet, sans jamais bloquer le polling
+"""
+
+import queue
+import threading
+from typing import Dict
+
+class SampleFeed:
+    """Derniers échantillons par cible et diffusion aux abonnés (interface graphique, ...)"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = {}
+        # Tuple remplacé à chaque (dés)abonnement : parcouru sans verrou par les threads de polling
+        self.subscribers = ()
+        self.dropped = 0
+    
+    def publish(self, target_name: str, metrics: Dict):
+        """Enregistre un échantillon et le transmet aux abonnés (abandonné si une file est pleine)"""
+        self.latest[target_name] = metrics
+        for subscriber in self.subscribers:
+            try:
+                subscriber.put_nowait((target_name, metrics))
+            except queue.Full:
+                self.dropped += 1
+    
+    def subscribe(self, maxsize: int = 10000) -> queue.Queue:
+        """Nouvelle file recevant les (cible, métriques) publiés à partir de maintenant"""
+        subscriber = queue.Queue(maxsize=max(1, maxsize))
+        with self.lock:
+            self.subscribers = self.subscribers + (subscriber,)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Cesse d'alimenter une file"""
+        with self.lock:
+            self.subscribers = tuple(s for s in self.subscribers if s is not subscriber)
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copie du dernier échantillon de chaque cible"""
+        return dict(self.latest)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journalisation Non Bloquante
+============================
+Les threads de polling déposent les enregistrements dans une file bornée ; un
+thread d'écriture les formate et les écrit (console, fichier texte ou JSON lines
+avec rotation par taille ou par date)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Options par défaut (section "logging" de la configuration)
+DEFAULT_OPTIONS = {
+    "format": "text",  # "text" ou "json" (une ligne JSON par enregistrement)
+    "rotation": "size",  # "size", "time" ou null
+    "max_bytes": 10485760,
+    "when": "midnight",  # période de la rotation "time" (TimedRotatingFileHandler)
+    "backup_count": 5,
+    "queue_size": 10000,
+    "console": True,
+    "sample_every": 1  # une ligne de métriques INFO sur N par cible
+}
+
+class JsonLinesFormatter(logging.Formatter):
+    """Un objet JSON par ligne : horodatage, niveau, message et champs structurés (extra "fields")"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler sur file bornée : un enregistrement est abandonné (et compté) plutôt que d'attendre"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class ForwardingHandler(logging.handlers.QueueHandler):
+    """Worker du poller multi-processus : enregistrements renvoyés au processus principal, seul à écrire le fichier"""
+    
+    def __init__(self, messages, worker_id: int):
+        super().__init__(messages)
+        self.worker_id = worker_id
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        # Même file que les échantillons : message ('log', worker, None, enregistrement déjà formaté)
+        self.queue.put(('log', self.worker_id, None, record))
+
+class MetricLogSampler:
+    """Échantillonnage par cible des lignes de métriques de niveau INFO"""
+    
+    def __init__(self, every: int = 1):
+        self.every = max(1, every)
+        self.counts = {}
+    
+    def allow(self, target_name: str) -> bool:
+        """Vrai pour le premier échantillon d'une cible puis un sur every"""
+        if self.every == 1:
+            return True
+        count = self.counts.get(target_name, 0)
+        self.counts[target_name] = count + 1
+        return count % self.every == 0
+
+class LogPipeline:
+    """File de journalisation et thread d'écriture installés sur le logger racine"""
+    
+    def __init__(self, log_file: str, options: Optional[Dict] = None, forward: Optional[Tuple] = None):
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.pid = os.getpid()
+        self.listener = None
+        self.running = False
+        if forward is not None:
+            # Worker : ni fichier ni console, tout passe par le processus principal
+            self.handlers = []
+            self.handler = ForwardingHandler(*forward)
+            return
+        
+        self.handlers = [self.file_handler(log_file)]
+        if self.options["console"]:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter(TEXT_FORMAT))
+            self.handlers.append(console)
+        
+        self.queue = queue.Queue(maxsize=max(1, self.options["queue_size"]))
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+    
+    def file_handler(self, log_file: str) -> logging.Handler:
+        """Fichier de log, avec rotation par taille ou par date"""
+        options = self.options
+        if options["rotation"] == "size":
+            handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=options["max_bytes"],
+                                                           backupCount=options["backup_count"],
+                                                           encoding='utf-8')
+        elif options["rotation"] == "time":
+            handler = logging.handlers.TimedRotatingFileHandler(log_file, when=options["when"],
+                                                                backupCount=options["backup_count"],
+                                                                encoding='utf-8')
+        else:
+            handler = logging.FileHandler(log_file, encoding='utf-8')
+        
+        if options["format"] == "json":
+            handler.setFormatter(JsonLinesFormatter())
+        else:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        return handler
+    
+    @property
+    def dropped(self) -> int:
+        """Enregistrements abandonnés faute de place dans la file"""
+        return self.handler.dropped
+    
+    def start(self):
+        """Remplace les handlers du logger racine par la file et démarre l'écriture"""
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(self.handler)
+        root.setLevel(logging.INFO)
+        if self.listener is not None:
+            self.listener.start()
+        self.running = True
+    
+    def stop(self):
+        """Écrit les enregistrements encore en file puis ferme les fichiers"""
+        if not self.running:
+            return
+        self.running = False
+        logging.getLogger().removeHandler(self.handler)
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+_pipeline = None
+# Worker : (file vers le processus principal, numéro du worker)
+_forward = None
+
+def forward_to_parent(messages, worker_id: int):
+    """Dans un worker, renvoie les enregistrements au processus principal au lieu d'écrire le fichier"""
+    global _forward
+    _forward = (messages, worker_id)
+
+def dispatch_record(record: logging.LogRecord):
+    """Processus principal : écrit un enregistrement reçu d'un worker avec ses propres handlers"""
+    logging.getLogger(record.name).handle(record)
+
+def setup_pipeline(log_file: str, options: Optional[Dict] = None) -> LogPipeline:
+    """Installe (ou remplace) la journalisation du processus courant"""
+    global _pipeline
+    # Processus fils (fork) : le thread d'écriture hérité n'existe pas, la file du parent est abandonnée
+    if _pipeline is not None and _pipeline.pid == os.getpid():
+        _pipeline.stop()
+    _pipeline = LogPipeline(log_file, options, _forward)
+    _pipeline.start()
+    return _pipeline
+
+def shutdown_pipeline():
+    """Vide la file à la sortie du programme"""
+    if _pipeline is not None and _pipeline.pid == os.getpid():
+        _pipeline.stop()
+
+atexit.register(shutdown_pipeline)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Générateur de Métriques Simulées
+================================
+Un tick de toute la flotte simulée calculé d'un bloc avec NumPy : bases par
+équipement, cycle journalier, épisodes d'anomalie ; résultat en colonnes,
+identique pour une même graine et les mêmes instants
+"""
+
+import math
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Valeurs de base de la flotte (section "simulation" de demo_monitoring)
+DEFAULT_PROFILE = {
+    "interval": 30,  # période de référence de la probabilité d'anomalie
+    "cpu_base": 30,
+    "memory_base": 50,
+    "disk_base": 60,
+    "network_base": 100000,  # octets/s, toutes interfaces confondues
+    "diurnal_amplitude": 0.3,  # variation relative du CPU et du trafic sur la journée
+    "diurnal_peak_hour": 14  # heure UTC du pic d'activité
+}
+
+# Types d'anomalie (code = position) et ampleur, reprise du simulateur d'origine
+ANOMALY_TYPES = ("cpu_spike", "memory_spike", "disk_spike", "network_spike")
+ANOMALY_SPIKES = {
+    "cpu_spike": (40, 60),
+    "memory_spike": (30, 50),
+    "disk_spike": (25, 35),
+    "network_spike": (500000, 1000000)
+}
+
+class MetricGenerator:
+    """Métriques de tous les équipements simulés, générées un tick à la fois"""
+    
+    def __init__(self, count: int, simulation: Optional[Dict] = None, anomalies: Optional[Dict] = None,
+                 seed: int = 0, interfaces: int = 1, disks: int = 1):
+        if np is None:
+            raise ImportError("NumPy est requis pour la génération vectorisée des métriques")
+        profile = {**DEFAULT_PROFILE, **(simulation or {})}
+        anomalies = anomalies or {}
+        self.count = count
+        self.interval = max(1e-3, float(profile["interval"]))
+        self.rng = np.random.default_rng(seed)
+        rng = self.rng
+        
+        # Niveaux propres à chaque équipement autour des valeurs de base
+        self.cpu_base = np.clip(profile["cpu_base"] + rng.normal(0, 8, count), 1, 95)
+        self.memory_base = np.clip(profile["memory_base"] + rng.normal(0, 8, count), 1, 95)
+        self.disk_base = np.clip(profile["disk_base"] + rng.normal(0, 10, (count, disks)), 1, 95)
+        self.network_base = profile["network_base"] * rng.lognormal(0, 0.5, count)
+        # Répartition du trafic entre interfaces et part entrante
+        self.interface_share = rng.dirichlet(np.ones(interfaces), count)
+        self.in_share = rng.uniform(0.3, 0.7, count)
+        
+        # Cycle journalier : amplitude et décalage horaire propres à chaque équipement
+        self.diurnal_amplitude = profile["diurnal_amplitude"] * rng.uniform(0.5, 1.5, count)
+        self.peak_hour = profile["diurnal_peak_hour"] + rng.normal(0, 1, count)
+        
+        self.probability = anomalies.get("probability", 0.0) if anomalies.get("enabled", False) else 0.0
+        self.duration = anomalies.get("duration", 300)
+        self.spike_low = np.array([ANOMALY_SPIKES[kind][0] for kind in ANOMALY_TYPES], dtype=float)
+        self.spike_high = np.array([ANOMALY_SPIKES[kind][1] for kind in ANOMALY_TYPES], dtype=float)
+        # Épisode en cours par équipement (-1 : aucun)
+        self.anomaly = np.full(count, -1, dtype=np.int8)
+        self.anomaly_magnitude = np.zeros(count)
+        self.anomaly_end = np.zeros(count)
+        self.last_tick = None
+    
+    def spike(self, kind: str):
+        """Surcroît dû aux anomalies en cours d'un type donné (0 hors épisode)"""
+        return np.where(self.anomaly == ANOMALY_TYPES.index(kind), self.anomaly_magnitude, 0.0)
+    
+    def tick(self, now: float) -> Dict[str, object]:
+        """Métriques de tous les équipements à l'instant now (epoch), une colonne par métrique"""
+        rng = self.rng
+        count = self.count
+        elapsed = self.interval if self.last_tick is None else max(0.0, now - self.last_tick)
+        self.last_tick = now
+        
+        # Fin des épisodes échus, puis début de nouveaux épisodes (probabilité par intervalle)
+        self.anomaly[self.anomaly_end <= now] = -1
+        chance = 1 - (1 - self.probability) ** (elapsed / self.interval) if self.probability else 0.0
+        started = (self.anomaly < 0) & (rng.random(count) < chance)
+        starting = int(np.count_nonzero(started))
+        if starting:
+            kinds = rng.integers(0, len(ANOMALY_TYPES), starting)
+            self.anomaly[started] = kinds
+            self.anomaly_magnitude[started] = rng.uniform(self.spike_low[kinds], self.spike_high[kinds])
+            self.anomaly_end[started] = now + self.duration
+        
+        hours = (now % 86400) / 3600
+        diurnal = 1 + self.diurnal_amplitude * np.cos(2 * math.pi * (hours - self.peak_hour) / 24)
+        
+        cpu = np.clip(self.cpu_base * diurnal + rng.normal(0, 5, count) + self.spike("cpu_spike"), 0, 100)
+        memory = np.clip(self.memory_base + rng.normal(0, 2, count) + self.spike("memory_spike"), 0, 100)
+        disks = self.disk_base + rng.normal(0, 0.5, self.disk_base.shape)
+        # Une anomalie disque touche le premier point de montage
+        disks[:, 0] += self.spike("disk_spike")
+        disks = np.clip(disks, 0, 100)
+        network = np.maximum(0.0, self.network_base * diurnal * rng.lognormal(0, 0.2, count)
+                             + self.spike("network_spike"))
+        network_in = network * self.in_share
+        network_out = network - network_in
+        
+        return {
+            'timestamp': now,
+            'cpu_usage': cpu,
+            'memory_percent': memory,
+            'disk_usage': disks[:, 0],
+            'disks': disks,
+            'network_in': network_in,
+            'network_out': network_out,
+            'network_total': network,
+            # Débits par interface (équipements × interfaces)
+            'interfaces_in': network_in[:, None] * self.interface_share,
+            'interfaces_out': network_out[:, None] * self.interface_share,
+            'anomaly': self.anomaly.copy(),
+            'anomaly_started': started
+        }
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Noms des Métriques
+==================
+Mise à plat d'un échantillon de SystemMonitor en valeurs nommées, partagée par
+la base locale, les règles de seuil et l'évaluation vectorisée
+"""
+
+from typing import Dict, Iterator, Tuple
+
+def table_metrics(key: str, value) -> Iterator[Tuple[str, float]]:
+    """Valeurs par interface (if.{nom}.{sens}) ou par disque (disk.{chemin}) d'un échantillon"""
+    if key == 'interfaces' and isinstance(value, dict):
+        for name, rates in value.items():
+            for direction, rate in rates.items():
+                yield f"if.{name}.{direction}", float(rate)
+    elif key == 'disks' and isinstance(value, dict):
+        for path, usage in value.items():
+            yield f"disk.{path}", float(usage)
+
+def flatten_metrics(metrics: Dict) -> Dict[str, float]:
+    """Extrait les valeurs numériques d'un échantillon, y compris par interface/disque"""
+    values = {}
+    for key, value in metrics.items():
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            values[key] = float(value)
+        else:
+            values.update(table_metrics(key, value))
+    return values
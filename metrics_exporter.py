@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export Prometheus / OpenMetrics
+===============================
+Point d'accès HTTP /metrics servant un instantané pré-sérialisé,
+régénéré une fois par intervalle de polling
+"""
+
+import gzip
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PREFIX = 'snmp_monitor'
+
+# Métriques scalaires connues : clé de l'échantillon -> (famille, aide, libellés fixes)
+SCALAR_FAMILIES = {
+    'cpu_usage': ('cpu_usage_percent', "Utilisation CPU (%)", ''),
+    'memory_percent': ('memory_usage_percent', "Utilisation mémoire (%)", ''),
+    'memory_total': ('memory_total_kilobytes', "Mémoire totale (ko)", ''),
+    'memory_used': ('memory_used_kilobytes', "Mémoire utilisée (ko)", ''),
+    'disk_usage': ('disk_usage_percent', "Utilisation disque (%)", ''),
+    'network_in': ('network_bytes_per_second', "Débit réseau (octets/s)", ',direction="in"'),
+    'network_out': ('network_bytes_per_second', "Débit réseau (octets/s)", ',direction="out"'),
+    'network_total': ('network_bytes_per_second', "Débit réseau (octets/s)", ',direction="total"')
+}
+
+def escape_label(value) -> str:
+    """Échappe une valeur de libellé (antislash, guillemet, saut de ligne)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def metric_name(key: str) -> str:
+    """Nom de famille valide pour une métrique non répertoriée"""
+    return re.sub(r'[^a-zA-Z0-9_]', '_', key)
+
+def format_value(value: float) -> str:
+    """Valeur au format OpenMetrics"""
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+def render_openmetrics(latest: Dict[str, Dict], health: Dict[str, Dict],
+                       alert_counts: Dict, active_alerts: Dict[str, int]) -> bytes:
+    """Sérialise le dernier échantillon de chaque cible et les compteurs d'alertes"""
+    # Famille -> (type, aide, lignes) ; les lignes d'une famille doivent être contiguës
+    families = {}
+    
+    def add(family, kind, help_text, line):
+        entry = families.get(family)
+        if entry is None:
+            entry = families[family] = (kind, help_text, [])
+        entry[2].append(line)
+    
+    for target_name, metrics in latest.items():
+        labels = f'target="{escape_label(target_name)}",ip="{escape_label(metrics.get("ip", ""))}"'
+        state = health.get(target_name, {}).get('state', 'HEALTHY')
+        add('up', 'gauge', "Cible joignable (disjoncteur fermé)",
+            f'{PREFIX}_up{{{labels}}} {0 if state == "OPEN" else 1}')
+        try:
+            timestamp = datetime.fromisoformat(metrics['timestamp']).timestamp()
+            add('sample_timestamp_seconds', 'gauge', "Date du dernier échantillon",
+                f'{PREFIX}_sample_timestamp_seconds{{{labels}}} {format_value(timestamp)}')
+        except (KeyError, TypeError, ValueError):
+            pass
+        
+        for key, value in metrics.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            family, help_text, extra = SCALAR_FAMILIES.get(key, (metric_name(key), key, ''))
+            add(family, 'gauge', help_text, f'{PREFIX}_{family}{{{labels}{extra}}} {format_value(value)}')
+        
+        for name, rates in (metrics.get('interfaces') or {}).items():
+            for direction, rate in rates.items():
+                add('interface_bytes_per_second', 'gauge', "Débit par interface (octets/s)",
+                    f'{PREFIX}_interface_bytes_per_second{{{labels},interface="{escape_label(name)}",'
+                    f'direction="{escape_label(direction)}"}} {format_value(rate)}')
+        for path, usage in (metrics.get('disks') or {}).items():
+            add('filesystem_usage_percent', 'gauge', "Utilisation par point de montage (%)",
+                f'{PREFIX}_filesystem_usage_percent{{{labels},mount="{escape_label(path)}"}} {format_value(usage)}')
+    
+    for (target_name, level), count in sorted(alert_counts.items()):
+        add('alerts', 'counter', "Alertes notifiées (déclenchement, changement, rappel, rétablissement)",
+            f'{PREFIX}_alerts_total{{target="{escape_label(target_name)}",level="{level}"}} {count}')
+    for level, count in sorted(active_alerts.items()):
+        add('alerts_active', 'gauge', "Alertes en cours",
+            f'{PREFIX}_alerts_active{{level="{level}"}} {count}')
+    
+    lines = []
+    for family, (kind, help_text, samples) in families.items():
+        lines.append(f"# TYPE {PREFIX}_{family} {kind}")
+        lines.append(f"# HELP {PREFIX}_{family} {escape_label(help_text)}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Sert l'instantané courant, sans calcul à la requête"""
+    
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        
+        body, compressed = self.server.exporter.snapshot
+        headers = {'Content-Type': CONTENT_TYPE}
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = compressed
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Les scrapes ne sont pas journalisés
+        pass
+
+class MetricsExporter:
+    """Serveur HTTP d'export et thread de régénération de l'instantané"""
+    
+    def __init__(self, monitor, host: str = '127.0.0.1', port: int = 9877,
+                 refresh_interval: Optional[float] = None):
+        self.monitor = monitor
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval or monitor.config["monitoring"]["interval"]
+        self.snapshot = self.serialize(b"# EOF\n")
+        self.server = None
+        self.threads = []
+        self.stop_event = threading.Event()
+        self.last_render = 0.0
+    
+    @staticmethod
+    def serialize(body: bytes):
+        """Corps brut et compressé, calculés une seule fois"""
+        return body, gzip.compress(body, compresslevel=6)
+    
+    def refresh(self):
+        """Régénère l'instantané à partir des derniers échantillons"""
+        start = time.perf_counter()
+        active = {}
+        for state in self.monitor.alert_states.get_active().values():
+            active[state['level']] = active.get(state['level'], 0) + 1
+        body = render_openmetrics(dict(self.monitor.latest_metrics), self.monitor.get_target_health(),
+                                  dict(self.monitor.alert_counts), active)
+        # Remplacement atomique : les requêtes en cours gardent l'ancien instantané
+        self.snapshot = self.serialize(body)
+        self.last_render = time.perf_counter() - start
+    
+    def run_refresh(self):
+        """Boucle de régénération périodique"""
+        while not self.stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.monitor.logger.error(f"Erreur lors de la génération des métriques exportées: {str(e)}")
+            self.stop_event.wait(self.refresh_interval)
+    
+    def start(self):
+        """Démarre le serveur HTTP et la régénération"""
+        if self.server is not None:
+            return
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.server.exporter = self
+        self.stop_event.clear()
+        self.threads = [threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True),
+                        threading.Thread(target=self.run_refresh, name="metrics-refresh", daemon=True)]
+        for thread in self.threads:
+            thread.start()
+        self.monitor.logger.info(f"Export des métriques sur http://{self.host}:{self.port}/metrics")
+    
+    def stop(self):
+        """Arrête le serveur HTTP"""
+        if self.server is None:
+            return
+        self.stop_event.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        for thread in self.threads:
+            thread.join(5)
+        self.threads = []
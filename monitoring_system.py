@@ -9,34 +9,127 @@ Surveillance des ressources système avec SNMP et alertes en cas de dépassement
 import time
 import logging
 import json
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 import threading
-from typing import Dict, List, Optional
+import asyncio
+from typing import Dict, List, Optional, Tuple
 import pysnmp
 from pysnmp.hlapi import *
+from async_poller import AsyncSnmpPoller
+from sharded_poller import ShardedPoller
+from scheduler import PollScheduler
+from circuit_breaker import CircuitBreaker
+from counter_rates import CounterRates
+from snmp_tables import TableIndexCache, column_index, next_repetitions
+from timeseries_store import TimeSeriesStore
+from alert_history import AlertHistory
+from alert_notifier import AlertNotifier
+from threshold_rules import ThresholdRules
+from fleet_eval import FleetEvaluator
+from metrics_exporter import MetricsExporter
+from instrumentation import PollerStats, merge_stats, total_histogram, EMAIL, LOG
+from log_pipeline import MetricLogSampler, setup_pipeline
+from live_feed import SampleFeed
+from report_stats import ReportAggregates
+from alert_state import AlertStateTracker, breach_level, CRITICAL, RAISE, RECOVERY, REMINDER
+
+# OIDs SNMP pour les métriques système
+SNMP_OIDS = {
+    'cpu_usage': '1.3.6.1.4.1.2021.11.9.0',  # CPU usage
+    'memory_total': '1.3.6.1.4.1.2021.4.5.0',  # Total RAM
+    'memory_used': '1.3.6.1.4.1.2021.4.6.0',   # Used RAM
+    'network_in': '1.3.6.1.2.1.2.2.1.10.1',   # Octets in
+    'network_out': '1.3.6.1.2.1.2.2.1.16.1',  # Octets out
+    'network_in_hc': '1.3.6.1.2.1.31.1.1.1.6.1',   # Octets in (64 bits)
+    'network_out_hc': '1.3.6.1.2.1.31.1.1.1.10.1',  # Octets out (64 bits)
+    'sys_uptime': '1.3.6.1.2.1.1.3.0',  # Uptime de l'agent (centièmes de s)
+    'disk_usage': '1.3.6.1.4.1.2021.9.1.9.1'  # Disk usage
+}
 
 class SystemMonitor:
     """Classe principale pour le monitoring système via SNMP"""
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", worker: bool = False):
+        self.config_file = config_file
+        # Worker du poller multi-processus : polling seul, sans emails, export ni base locale
+        self.worker = worker
         self.config = self.load_config(config_file)
         self.setup_logging()
-        self.alert_history = []
+        alerts_config = self.config["alerts"]
+        self.alert_history = AlertHistory(alerts_config.get("history_max_entries", 10000),
+                                          alerts_config.get("history_max_age_hours", 168))
         self.monitoring_active = False
         
-        # OIDs SNMP pour les métriques système
-        self.snmp_oids = {
-            'cpu_usage': '1.3.6.1.4.1.2021.11.9.0',  # CPU usage
-            'memory_total': '1.3.6.1.4.1.2021.4.5.0',  # Total RAM
-            'memory_used': '1.3.6.1.4.1.2021.4.6.0',   # Used RAM
-            'network_in': '1.3.6.1.2.1.2.2.1.10.1',   # Octets in
-            'network_out': '1.3.6.1.2.1.2.2.1.16.1',  # Octets out
-            'disk_usage': '1.3.6.1.4.1.2021.9.1.9.1'  # Disk usage
-        }
+        # Règles de seuil compilées par cible
+        self.threshold_rules = ThresholdRules(self.config, self.logger)
+        self.fleet_evaluator = FleetEvaluator(self.threshold_rules)
+        
+        # Dernier échantillon de chaque cible (diffusé aux abonnés) et alertes notifiées par (cible, niveau)
+        self.sample_feed = SampleFeed()
+        self.latest_metrics = self.sample_feed.latest
+        self.alert_counts = {}
+        
+        # Agrégats glissants du rapport (alertes, statistiques des métriques, disponibilité)
+        reports = self.config.get("reports", {})
+        self.report_stats = ReportAggregates(reports.get("window_hours", 24), reports.get("slice_minutes", 5))
+        
+        # Mesures du poller : latences SNMP, cycles, envoi des emails et écriture des logs
+        self.instrumentation = PollerStats(self.config["monitoring"]["interval"], len(self.config["targets"]))
+        
+        # Export Prometheus/OpenMetrics (optionnel)
+        self.exporter = None
+        exporter_config = self.config.get("exporter", {})
+        if exporter_config.get("enabled", False) and not worker:
+            self.exporter = MetricsExporter(self, exporter_config.get("host", "127.0.0.1"),
+                                            exporter_config.get("port", 9877),
+                                            exporter_config.get("refresh_interval"))
+        
+        # Alertes en cours : seules les transitions sont historisées et notifiées
+        self.alert_states = AlertStateTracker(alerts_config)
+        
+        # Envoi des emails en arrière-plan (file bornée, connexion SMTP persistante)
+        self.notifier = None
+        if not worker:
+            self.notifier = AlertNotifier(alerts_config, self.logger,
+                                          queue_size=alerts_config.get("queue_size", 1000),
+                                          batch_size=alerts_config.get("batch_size", 50),
+                                          idle_timeout=alerts_config.get("smtp_idle_timeout", 60))
+        # Nombre maximal de varbinds par PDU appris pour chaque agent (tooBig)
+        self.pdu_limits = {}
         
+        # Moteur SNMP et sessions (auth/transport) réutilisés entre les cycles
+        self.snmp_engine = SnmpEngine()
+        self.snmp_sessions = {}
+        self.snmp_lock = threading.RLock()
+        
+        # Poller multi-processus (mode "sharded")
+        self.sharded_poller = None
+        self.scheduler = None
+        
+        # Derniers compteurs réseau de chaque cible (calcul des débits)
+        self.counter_rates = CounterRates()
+        
+        # Tables SNMP : noms des lignes et max-repetitions ajustés par agent
+        self.table_cache = TableIndexCache()
+        self.bulk_repetitions = {}
+        self.bulk_limits = {}
+        
+        # Historique des échantillons sur disque
+        self.metric_store = None
+        storage = self.config.get("storage", {})
+        if storage.get("enabled", False) and not worker:
+            self.metric_store = TimeSeriesStore(storage.get("path", "metrics_data"),
+                                                segment_hours=storage.get("segment_hours", 24),
+                                                retention_days=storage.get("retention_days", 30))
+        
+        # État de santé des cibles (disjoncteur)
+        self.circuit_breaker = CircuitBreaker(self.config, self.logger)
+        
+        # OIDs SNMP pour les métriques système
+        self.snmp_oids = dict(SNMP_OIDS)
+    
     def load_config(self, config_file: str) -> Dict:
         """Charge la configuration depuis un fichier JSON"""
         try:
@@ -48,7 +141,10 @@ class SystemMonitor:
                 "snmp": {
                     "community": "public",
                     "timeout": 3,
-                    "retries": 3
+                    "retries": 3,
+                    "max_oids_per_request": 32,
+                    "walk_tables": False,  # parcours GETBULK de ifTable/dskTable
+                    "max_repetitions": 50
                 },
                 "targets": [
                     {
@@ -72,11 +168,57 @@ class SystemMonitor:
                     "smtp_port": 587,
                     "sender_email": "monitoring@example.com",
                     "sender_password": "",
-                    "recipients": ["admin@example.com"]
+                    "recipients": ["admin@example.com"],
+                    "history_max_entries": 10000,  # taille maximale de l'historique
+                    "history_max_age_hours": 168,
+                    "smtp_starttls": True,
+                    "queue_size": 1000,  # emails en attente avant abandon
+                    "batch_size": 50,  # emails envoyés par réveil du thread d'envoi
+                    "smtp_idle_timeout": 60,  # fermeture de la connexion SMTP inactive
+                    "hysteresis": 5,  # marge de retour sous le seuil, en % du seuil
+                    "raise_after_samples": 1,  # échantillons consécutifs avant alerte
+                    "clear_after_samples": 1,  # échantillons consécutifs avant rétablissement
+                    "renotify_interval": 3600,  # rappel d'une alerte en cours (0: jamais)
+                    "digest_interval": 3600  # résumé des alertes en cours (0: désactivé)
                 },
                 "monitoring": {
                     "interval": 60,  # secondes
-                    "log_file": "monitoring.log"
+                    "log_file": "monitoring.log",
+                    "mode": "sequential",  # ou "async"
+                    "concurrency": 256,  # requêtes simultanées en mode async
+                    "workers": None,  # processus en mode "sharded" (défaut: nombre de CPU)
+                    "batch_size": 1000  # échantillons évalués ensemble en mode "sharded"
+                },
+                "logging": {
+                    "format": "text",  # ou "json" (une ligne JSON par enregistrement)
+                    "rotation": "size",  # "size", "time" ou None
+                    "max_bytes": 10485760,
+                    "when": "midnight",  # période de la rotation "time"
+                    "backup_count": 5,
+                    "queue_size": 10000,  # enregistrements en attente d'écriture
+                    "console": True,
+                    "sample_every": 1  # une ligne de métriques sur N par cible
+                },
+                "storage": {
+                    "enabled": True,
+                    "path": "metrics_data",
+                    "segment_hours": 24,  # durée couverte par un fichier de segment
+                    "retention_days": 30
+                },
+                "exporter": {
+                    "enabled": False,  # point d'accès Prometheus/OpenMetrics
+                    "host": "127.0.0.1",
+                    "port": 9877,
+                    "refresh_interval": None  # défaut: intervalle de monitoring
+                },
+                "circuit_breaker": {
+                    "failure_threshold": 2,  # échecs consécutifs avant ouverture
+                    "base_backoff": 60,  # secondes avant la première sonde
+                    "max_backoff": 3600
+                },
+                "reports": {
+                    "window_hours": 24,  # fenêtre glissante des agrégats du rapport
+                    "slice_minutes": 5  # granularité d'expiration de la fenêtre
                 }
             }
             # Sauvegarder la configuration par défaut
@@ -85,49 +227,218 @@ class SystemMonitor:
             return default_config
     
     def setup_logging(self):
-        """Configure le système de logging"""
-        log_file = self.config["monitoring"]["log_file"]
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        """Configure le système de logging (file d'attente et thread d'écriture)"""
+        options = self.config.get("logging", {})
+        # Les threads de polling ne font que mettre les enregistrements en file
+        self.log_pipeline = setup_pipeline(self.config["monitoring"]["log_file"], options)
+        self.log_sampler = MetricLogSampler(options.get("sample_every", 1))
         self.logger = logging.getLogger(__name__)
     
+    def get_snmp_session(self, target: Dict):
+        """Retourne les paramètres d'authentification et de transport en cache pour une cible"""
+        # Une cible suspecte ou en cours de sonde est interrogée sans ré-essai
+        healthy = self.circuit_breaker.is_healthy(target)
+        # Plusieurs agents peuvent partager un port et se distinguer par leur communauté
+        community = target.get("community", self.config["snmp"]["community"])
+        key = (target["ip"], target["port"], community, healthy)
+        session = self.snmp_sessions.get(key)
+        if session is None:
+            # La résolution DNS et la configuration du transport ne sont faites qu'une fois
+            auth = CommunityData(community)
+            transport = UdpTransportTarget((target["ip"], target["port"]), 
+                                         timeout=self.config["snmp"]["timeout"],
+                                         retries=self.config["snmp"]["retries"] if healthy else 0)
+            session = (auth, transport)
+            self.snmp_sessions[key] = session
+        return session
+    
+    def invalidate_snmp_cache(self, target: Optional[Dict] = None):
+        """Invalide le cache SNMP d'une cible, ou de toutes les cibles"""
+        with self.snmp_lock:
+            if target is not None:
+                community = target.get("community", self.config["snmp"]["community"])
+                for healthy in (True, False):
+                    self.snmp_sessions.pop((target["ip"], target["port"], community, healthy), None)
+                self.pdu_limits.pop(target["ip"], None)
+                self.bulk_repetitions.pop(target["ip"], None)
+                self.bulk_limits.pop(target["ip"], None)
+                return
+            
+            self.snmp_sessions.clear()
+            self.pdu_limits.clear()
+            self.bulk_repetitions.clear()
+            self.bulk_limits.clear()
+            # Fermer les sockets de l'ancien moteur avant d'en créer un nouveau
+            if self.snmp_engine.transportDispatcher is not None:
+                self.snmp_engine.transportDispatcher.closeDispatcher()
+            self.snmp_engine = SnmpEngine()
+    
+    def reload_config(self, config_file: str = "config.json"):
+        """Recharge la configuration et invalide le cache SNMP"""
+        self.config = self.load_config(config_file)
+        self.setup_logging()
+        self.invalidate_snmp_cache()
+        if self.notifier:
+            self.notifier.reconfigure(self.config["alerts"])
+        self.alert_states.configure(self.config["alerts"])
+        self.threshold_rules = ThresholdRules(self.config, self.logger)
+        self.fleet_evaluator = FleetEvaluator(self.threshold_rules)
+        self.instrumentation.configure(self.config["monitoring"]["interval"], len(self.config["targets"]))
+    
     def get_snmp_value(self, target: Dict, oid: str) -> Optional[float]:
         """Récupère une valeur via SNMP"""
-        try:
-            iterator = getCmd(
-                SnmpEngine(),
-                CommunityData(self.config["snmp"]["community"]),
-                UdpTransportTarget((target["ip"], target["port"]), 
-                                 timeout=self.config["snmp"]["timeout"],
-                                 retries=self.config["snmp"]["retries"]),
-                ContextData(),
-                ObjectType(ObjectIdentity(oid))
-            )
-            
-            errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
-            
-            if errorIndication:
-                self.logger.error(f"Erreur SNMP pour {target['name']}: {errorIndication}")
-                return None
-            elif errorStatus:
-                self.logger.error(f"Erreur SNMP pour {target['name']}: {errorStatus}")
-                return None
-            else:
-                for varBind in varBinds:
-                    return float(varBind[1])
+        return self.get_snmp_values(target, {oid: oid}).get(oid)
+    
+    def get_snmp_values(self, target: Dict, oids: Dict[str, str]) -> Dict[str, float]:
+        """Récupère plusieurs valeurs SNMP en un minimum de requêtes GET"""
+        values = {}
+        names = list(oids.keys())
+        # Nombre de varbinds par PDU, réduit si l'agent répond tooBig
+        chunk_size = self.pdu_limits.get(target['ip'],
+                                         self.config["snmp"].get("max_oids_per_request", len(names)))
+        chunk_size = max(1, chunk_size)
+        
+        pending = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+        while pending:
+            chunk = pending.pop(0)
+            try:
+                # Le moteur SNMP n'est pas thread-safe (monitoring + interface)
+                with self.snmp_lock:
+                    auth, transport = self.get_snmp_session(target)
+                    iterator = getCmd(
+                        self.snmp_engine,
+                        auth,
+                        transport,
+                        ContextData(),
+                        *[ObjectType(ObjectIdentity(oids[name])) for name in chunk]
+                    )
                     
-        except Exception as e:
-            self.logger.error(f"Exception SNMP pour {target['name']}: {str(e)}")
-            return None
+                    start = time.perf_counter()
+                    errorIndication, errorStatus, errorIndex, varBinds = next(iterator)
+                    latency = time.perf_counter() - start
+                
+                if errorIndication:
+                    # Timeout : inutile d'interroger les OIDs restantes de cette cible
+                    self.logger.error(f"Erreur SNMP pour {target['name']}: {errorIndication}")
+                    self.record_snmp_failure(target, str(errorIndication))
+                    return values
+                
+                self.instrumentation.observe_request(target['name'], chunk, latency)
+                self.circuit_breaker.record_success(target)
+                if errorStatus:
+                    if str(errorStatus) == 'tooBig' and len(chunk) > 1:
+                        # PDU trop grande pour l'agent : on divise la requête
+                        half = len(chunk) // 2
+                        self.pdu_limits[target['ip']] = half
+                        pending[:0] = [chunk[:half], chunk[half:]]
+                        continue
+                    self.logger.error(f"Erreur SNMP pour {target['name']}: {errorStatus}")
+                    self.instrumentation.record_error(target['name'])
+                    continue
+                
+                for name, varBind in zip(chunk, varBinds):
+                    value = varBind[1]
+                    # noSuchObject / noSuchInstance : métrique absente de l'échantillon
+                    if isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView)):
+                        continue
+                    try:
+                        values[name] = float(value)
+                    except (TypeError, ValueError):
+                        continue
+            
+            except Exception as e:
+                self.logger.error(f"Exception SNMP pour {target['name']}: {str(e)}")
+                self.record_snmp_failure(target, str(e))
+                return values
+        
+        return values
+    
+    def record_snmp_failure(self, target: Dict, error: str):
+        """Compte un échec de requête (timeout ou erreur) et le signale au disjoncteur"""
+        if 'timeout' in error.lower():
+            self.instrumentation.record_timeout(target['name'])
+        else:
+            self.instrumentation.record_error(target['name'])
+        self.circuit_breaker.record_failure(target, error)
     
     def get_system_metrics(self, target: Dict) -> Dict:
         """Récupère toutes les métriques système pour une cible"""
+        # Toutes les OIDs de la cible dans une seule requête GET
+        values = self.get_snmp_values(target, self.snmp_oids)
+        
+        # Interfaces et disques : parcours des tables si activé
+        tables = None
+        if values and self.config["snmp"].get("walk_tables", False):
+            uptime = values.get('sys_uptime')
+            walked = self.walk_table(target, self.table_cache.columns(target['name'], uptime))
+            if walked is not None:
+                tables = self.table_cache.build_tables(target['name'], uptime, walked)
+        
+        return self.build_metrics(target, values, tables)
+    
+    def walk_table(self, target: Dict, columns: Dict[str, str]) -> Optional[Dict[str, Dict]]:
+        """Parcourt des colonnes de tables SNMP par GETBULK"""
+        max_repetitions = self.bulk_limits.get(target['ip'], self.config["snmp"].get("max_repetitions", 50))
+        repetitions = min(self.bulk_repetitions.get(target['ip'], 10), max_repetitions)
+        names = list(columns.keys())
+        
+        while True:
+            walked = {name: {} for name in names}
+            rows = 0
+            too_big = False
+            try:
+                with self.snmp_lock:
+                    auth, transport = self.get_snmp_session(target)
+                    start = time.perf_counter()
+                    for errorIndication, errorStatus, errorIndex, varBinds in bulkCmd(
+                            self.snmp_engine, auth, transport, ContextData(),
+                            0, repetitions,
+                            *[ObjectType(ObjectIdentity(columns[name])) for name in names],
+                            lexicographicMode=False):
+                        
+                        if errorIndication:
+                            self.logger.error(f"Erreur SNMP pour {target['name']}: {errorIndication}")
+                            self.record_snmp_failure(target, str(errorIndication))
+                            return None
+                        # Une itération par ligne de table (plusieurs par réponse GETBULK) : latence mesurée
+                        # une seule fois pour tout le parcours, après la boucle
+                        if errorStatus:
+                            too_big = str(errorStatus) == 'tooBig'
+                            if not too_big:
+                                self.logger.error(f"Erreur SNMP pour {target['name']}: {errorStatus}")
+                                self.instrumentation.record_error(target['name'])
+                            break
+                        
+                        in_scope = False
+                        for name, (oid, value) in zip(names, varBinds):
+                            if isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView)):
+                                continue
+                            index = column_index(str(oid), columns[name])
+                            if index is not None:
+                                walked[name][index] = value
+                                in_scope = True
+                        if in_scope:
+                            rows += 1
+                    self.instrumentation.observe_request(target['name'], names, time.perf_counter() - start)
+            
+            except Exception as e:
+                self.logger.error(f"Exception SNMP pour {target['name']}: {str(e)}")
+                self.instrumentation.record_error(target['name'])
+                return None
+            
+            if too_big and repetitions > 1:
+                # Réponse trop grande pour l'agent : moins de lignes par requête
+                repetitions = repetitions // 2
+                self.bulk_limits[target['ip']] = repetitions
+                max_repetitions = repetitions
+                continue
+            
+            # Ajuster max-repetitions pour lire la table en un seul aller-retour au prochain cycle
+            self.bulk_repetitions[target['ip']] = next_repetitions(rows, max_repetitions)
+            return walked
+    
+    def build_metrics(self, target: Dict, values: Dict[str, float], tables: Optional[Dict] = None) -> Dict:
+        """Construit l'échantillon de métriques à partir des valeurs SNMP brutes"""
         metrics = {
             'timestamp': datetime.now().isoformat(),
             'target': target['name'],
@@ -135,13 +446,13 @@ class SystemMonitor:
         }
         
         # CPU Usage
-        cpu_usage = self.get_snmp_value(target, self.snmp_oids['cpu_usage'])
+        cpu_usage = values.get('cpu_usage')
         if cpu_usage is not None:
             metrics['cpu_usage'] = cpu_usage
         
         # Memory
-        memory_total = self.get_snmp_value(target, self.snmp_oids['memory_total'])
-        memory_used = self.get_snmp_value(target, self.snmp_oids['memory_used'])
+        memory_total = values.get('memory_total')
+        memory_used = values.get('memory_used')
         if memory_total and memory_used:
             memory_percent = (memory_used / memory_total) * 100
             metrics['memory_total'] = memory_total
@@ -149,197 +460,373 @@ class SystemMonitor:
             metrics['memory_percent'] = memory_percent
         
         # Disk Usage
-        disk_usage = self.get_snmp_value(target, self.snmp_oids['disk_usage'])
+        disk_usage = values.get('disk_usage')
         if disk_usage is not None:
             metrics['disk_usage'] = disk_usage
         
         # Network (calcul de la bande passante)
-        network_in = self.get_snmp_value(target, self.snmp_oids['network_in'])
-        network_out = self.get_snmp_value(target, self.snmp_oids['network_out'])
-        if network_in and network_out:
+        # Compteurs 64 bits (ifHC*) de préférence, sinon compteurs 32 bits
+        counters = {}
+        for direction in ('network_in', 'network_out'):
+            if values.get(f'{direction}_hc') is not None:
+                counters[direction] = (values[f'{direction}_hc'], 64)
+            elif values.get(direction) is not None:
+                counters[direction] = (values[direction], 32)
+        
+        if tables:
+            for name, interface_counters in tables['interfaces'].items():
+                for direction, counter in interface_counters.items():
+                    counters[f"if:{name}:{direction}"] = counter
+        
+        rates = self.counter_rates.update(target['name'], counters, values.get('sys_uptime'))
+        network_in = rates.get('network_in')
+        network_out = rates.get('network_out')
+        if network_in is not None and network_out is not None:
+            # Débits en octets/s
             metrics['network_in'] = network_in
             metrics['network_out'] = network_out
             metrics['network_total'] = network_in + network_out
         
+        # Métriques par interface (ifDescr) et par point de montage (dskPath)
+        if tables:
+            interfaces = {}
+            for name in tables['interfaces']:
+                rate_in = rates.get(f"if:{name}:in")
+                rate_out = rates.get(f"if:{name}:out")
+                if rate_in is not None and rate_out is not None:
+                    interfaces[name] = {'in': rate_in, 'out': rate_out, 'total': rate_in + rate_out}
+            metrics['interfaces'] = interfaces
+            metrics['disks'] = dict(tables['disks'])
+        
         return metrics
     
-    def check_thresholds(self, metrics: Dict) -> List[Dict]:
-        """Vérifie les seuils et génère des alertes"""
-        alerts = []
-        thresholds = self.config["thresholds"]
-        
-        # Vérification CPU
-        if 'cpu_usage' in metrics:
-            cpu_usage = metrics['cpu_usage']
-            if cpu_usage >= thresholds['cpu_critical']:
-                alerts.append({
-                    'level': 'CRITICAL',
-                    'metric': 'CPU',
-                    'value': cpu_usage,
-                    'threshold': thresholds['cpu_critical'],
-                    'message': f"CPU critique: {cpu_usage:.1f}% (seuil: {thresholds['cpu_critical']}%)"
-                })
-            elif cpu_usage >= thresholds['cpu_warning']:
-                alerts.append({
-                    'level': 'WARNING',
-                    'metric': 'CPU',
-                    'value': cpu_usage,
-                    'threshold': thresholds['cpu_warning'],
-                    'message': f"CPU élevé: {cpu_usage:.1f}% (seuil: {thresholds['cpu_warning']}%)"
-                })
-        
-        # Vérification Mémoire
-        if 'memory_percent' in metrics:
-            memory_percent = metrics['memory_percent']
-            if memory_percent >= thresholds['memory_critical']:
-                alerts.append({
-                    'level': 'CRITICAL',
-                    'metric': 'Mémoire',
-                    'value': memory_percent,
-                    'threshold': thresholds['memory_critical'],
-                    'message': f"Mémoire critique: {memory_percent:.1f}% (seuil: {thresholds['memory_critical']}%)"
-                })
-            elif memory_percent >= thresholds['memory_warning']:
-                alerts.append({
-                    'level': 'WARNING',
-                    'metric': 'Mémoire',
-                    'value': memory_percent,
-                    'threshold': thresholds['memory_warning'],
-                    'message': f"Mémoire élevée: {memory_percent:.1f}% (seuil: {thresholds['memory_warning']}%)"
-                })
-        
-        # Vérification Disque
-        if 'disk_usage' in metrics:
-            disk_usage = metrics['disk_usage']
-            if disk_usage >= thresholds['disk_critical']:
-                alerts.append({
-                    'level': 'CRITICAL',
-                    'metric': 'Disque',
-                    'value': disk_usage,
-                    'threshold': thresholds['disk_critical'],
-                    'message': f"Disque critique: {disk_usage:.1f}% (seuil: {thresholds['disk_critical']}%)"
-                })
-            elif disk_usage >= thresholds['disk_warning']:
-                alerts.append({
-                    'level': 'WARNING',
-                    'metric': 'Disque',
-                    'value': disk_usage,
-                    'threshold': thresholds['disk_warning'],
-                    'message': f"Disque élevé: {disk_usage:.1f}% (seuil: {thresholds['disk_warning']}%)"
-                })
+    def threshold_checks(self, metrics: Dict, target: Optional[Dict] = None) -> List[Dict]:
+        """Valeurs d'un échantillon à comparer aux seuils, selon les règles compilées de la cible"""
+        if target is None:
+            target = next((t for t in self.config["targets"] if t['name'] == metrics.get('target')),
+                          {'name': metrics.get('target')})
+        return self.threshold_rules.evaluate(target, metrics)
+    
+    def make_alert(self, check: Dict, level: str, event: str = RAISE) -> Dict:
+        """Construit une alerte à partir d'un contrôle de seuil"""
+        threshold = check['critical'] if level == CRITICAL else check['warning']
+        template = check['messages']['OK' if event == RECOVERY else level]
+        message = template.format(label=check['metric'],
+                                  value=f"{check['value']:.{check['precision']}f}{check['unit']}",
+                                  threshold=f"{threshold}{check['unit']}",
+                                  adjective=check['adjective'])
+        if event == REMINDER:
+            message += " - toujours en cours"
         
+        return {
+            'level': 'OK' if event == RECOVERY else level,
+            'metric': check['metric'],
+            'value': check['value'],
+            'threshold': threshold,
+            'message': message,
+            'event': event
+        }
+    
+    def check_thresholds(self, metrics: Dict, target: Optional[Dict] = None) -> List[Dict]:
+        """Vérifie les seuils et génère des alertes (sans état : un dépassement = une alerte)"""
+        alerts = []
+        for check in self.threshold_checks(metrics, target):
+            level = breach_level(check['value'], check['warning'], check['critical'], check['comparator'])
+            if level is not None:
+                alerts.append(self.make_alert(check, level))
         return alerts
     
+    def check_fleet_thresholds(self, samples: List[Tuple[Dict, Dict]]) -> List[List[Dict]]:
+        """Vérifie les seuils d'un lot d'échantillons (cible, métriques) en une passe vectorisée ;
+        résultat identique à check_thresholds appelé pour chaque échantillon"""
+        alerts = []
+        for checks in self.fleet_evaluator.evaluate(samples):
+            alerts.append([self.make_alert(check, breach_level(check['value'], check['warning'],
+                                                               check['critical'], check['comparator']))
+                           for check in checks])
+        return alerts
+    
+    def build_alert_message(self, alert: Dict, metrics: Dict) -> MIMEMultipart:
+        """Construit l'email HTML d'une alerte"""
+        msg = MIMEMultipart()
+        msg['From'] = self.config["alerts"]["sender_email"]
+        msg['To'] = ", ".join(self.config["alerts"]["recipients"])
+        if alert.get('event') == RECOVERY:
+            msg['Subject'] = f"RÉTABLI - {alert['metric']} - {metrics['target']}"
+        else:
+            msg['Subject'] = f"ALERTE {alert['level']} - {metrics['target']}"
+        
+        body = f"""
+        <html>
+        <body>
+            <h2>🚨 Alerte de Monitoring Système</h2>
+            <p><strong>Serveur:</strong> {metrics['target']} ({metrics['ip']})</p>
+            <p><strong>Niveau:</strong> {alert['level']}</p>
+            <p><strong>Métrique:</strong> {alert['metric']}</p>
+            <p><strong>Valeur:</strong> {alert['value']:.1f}</p>
+            <p><strong>Seuil:</strong> {alert['threshold']}</p>
+            <p><strong>Message:</strong> {alert['message']}</p>
+            <p><strong>Timestamp:</strong> {metrics['timestamp']}</p>
+            
+            <h3>Métriques actuelles:</h3>
+            <ul>
+        """
+        
+        for key, value in metrics.items():
+            if key not in ['timestamp', 'target', 'ip']:
+                if isinstance(value, float):
+                    body += f"<li><strong>{key}:</strong> {value:.1f}</li>"
+                else:
+                    body += f"<li><strong>{key}:</strong> {value}</li>"
+        
+        body += """
+            </ul>
+            <p><em>Cet email a été généré automatiquement par le système de monitoring.</em></p>
+        </body>
+        </html>
+        """
+        
+        msg.attach(MIMEText(body, 'html'))
+        return msg
+    
     def send_email_alert(self, alert: Dict, metrics: Dict):
-        """Envoie une alerte par email"""
+        """Met une alerte en file d'envoi par email (sans bloquer le polling)"""
         if not self.config["alerts"]["email_enabled"]:
             return
         
+        start = time.perf_counter()
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.config["alerts"]["sender_email"]
-            msg['To'] = ", ".join(self.config["alerts"]["recipients"])
-            msg['Subject'] = f"ALERTE {alert['level']} - {metrics['target']}"
-            
-            body = f"""
-            <html>
-            <body>
-                <h2>🚨 Alerte de Monitoring Système</h2>
-                <p><strong>Serveur:</strong> {metrics['target']} ({metrics['ip']})</p>
-                <p><strong>Niveau:</strong> {alert['level']}</p>
-                <p><strong>Métrique:</strong> {alert['metric']}</p>
-                <p><strong>Valeur:</strong> {alert['value']:.1f}</p>
-                <p><strong>Seuil:</strong> {alert['threshold']}</p>
-                <p><strong>Message:</strong> {alert['message']}</p>
-                <p><strong>Timestamp:</strong> {metrics['timestamp']}</p>
-                
-                <h3>Métriques actuelles:</h3>
-                <ul>
-            """
-            
-            for key, value in metrics.items():
-                if key not in ['timestamp', 'target', 'ip']:
-                    if isinstance(value, float):
-                        body += f"<li><strong>{key}:</strong> {value:.1f}</li>"
-                    else:
-                        body += f"<li><strong>{key}:</strong> {value}</li>"
-            
-            body += """
-                </ul>
-                <p><em>Cet email a été généré automatiquement par le système de monitoring.</em></p>
-            </body>
-            </html>
-            """
-            
-            msg.attach(MIMEText(body, 'html'))
-            
-            server = smtplib.SMTP(self.config["alerts"]["smtp_server"], 
-                                self.config["alerts"]["smtp_port"])
-            server.starttls()
-            server.login(self.config["alerts"]["sender_email"], 
-                        self.config["alerts"]["sender_password"])
-            server.send_message(msg)
-            server.quit()
-            
-            self.logger.info(f"Email d'alerte envoyé pour {metrics['target']}")
-            
+            self.notifier.start()
+            self.notifier.submit(self.build_alert_message(alert, metrics))
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'envoi de l'email: {str(e)}")
+            self.logger.error(f"Erreur lors de la préparation de l'email: {str(e)}")
+        self.instrumentation.observe(EMAIL, time.perf_counter() - start)
     
     def log_metrics(self, metrics: Dict):
-        """Enregistre les métriques dans le log"""
-        self.logger.info(f"Métriques pour {metrics['target']}: "
-                        f"CPU: {metrics.get('cpu_usage', 'N/A'):.1f}%, "
-                        f"Mémoire: {metrics.get('memory_percent', 'N/A'):.1f}%, "
-                        f"Disque: {metrics.get('disk_usage', 'N/A'):.1f}%")
+        """Enregistre les métriques dans le log (une ligne sur N par cible, sans attendre l'écriture)"""
+        def percent(value):
+            return "N/A" if value is None else f"{value:.1f}%"
+        
+        start = time.perf_counter()
+        if self.log_sampler.allow(metrics['target']):
+            # Champs repris tels quels dans la sortie JSON lines
+            values = {key: value for key, value in metrics.items()
+                      if isinstance(value, (int, float)) and not isinstance(value, bool)}
+            self.logger.info(f"Métriques pour {metrics['target']}: "
+                             f"CPU: {percent(metrics.get('cpu_usage'))}, "
+                             f"Mémoire: {percent(metrics.get('memory_percent'))}, "
+                             f"Disque: {percent(metrics.get('disk_usage'))}",
+                             extra={'fields': {'target': metrics['target'], 'metrics': values}})
+        self.instrumentation.observe(LOG, time.perf_counter() - start)
     
     def monitor_target(self, target: Dict):
         """Surveille une cible spécifique"""
+        if not self.circuit_breaker.allow_request(target):
+            # Cible injoignable : attendre la prochaine sonde (créneau compté dans le cycle)
+            self.instrumentation.record_skip(time.perf_counter())
+            self.report_stats.record_skip(target['name'])
+            return
+        
+        start = time.perf_counter()
         try:
             metrics = self.get_system_metrics(target)
-            if metrics:
-                self.log_metrics(metrics)
-                alerts = self.check_thresholds(metrics)
-                
-                for alert in alerts:
-                    self.alert_history.append({
-                        'timestamp': datetime.now(),
-                        'target': target['name'],
-                        'alert': alert,
-                        'metrics': metrics
-                    })
-                    
-                    self.logger.warning(f"ALERTE {alert['level']} - {alert['message']}")
-                    self.send_email_alert(alert, metrics)
-                    
+            self.process_metrics(target, metrics)
         except Exception as e:
             self.logger.error(f"Erreur lors du monitoring de {target['name']}: {str(e)}")
+        self.instrumentation.record_poll(start, time.perf_counter())
+    
+    def process_metrics(self, target: Dict, metrics: Dict):
+        """Journalise un échantillon et notifie les changements d'état des alertes"""
+        if metrics:
+            self.sample_feed.publish(target['name'], metrics)
+            self.report_stats.record_sample(target['name'], metrics)
+            if self.metric_store:
+                self.metric_store.append_sample(metrics)
+            self.log_metrics(metrics)
+            
+            # Un dépassement persistant ne produit qu'une alerte (puis des rappels espacés)
+            events = self.alert_states.update(target['name'], self.threshold_checks(metrics, target))
+            self.notify_events(target, metrics, events)
+        
+        digest = self.alert_states.collect_digest()
+        if digest:
+            self.send_digest(digest)
+    
+    def process_batch(self, samples: List[Tuple[Dict, Dict]]):
+        """Traite un lot d'échantillons (cible, métriques), les seuils étant évalués en une seule passe"""
+        batch = []
+        seen = set()
+        for target, metrics in samples:
+            if not metrics:
+                continue
+            # Deux échantillons d'une même cible : le second voit l'état laissé par le premier
+            if target['name'] in seen:
+                self.process_checked_batch(batch)
+                batch = []
+                seen = set()
+            seen.add(target['name'])
+            batch.append((target, metrics))
+        self.process_checked_batch(batch)
+        
+        digest = self.alert_states.collect_digest()
+        if digest:
+            self.send_digest(digest)
+    
+    def process_checked_batch(self, batch: List[Tuple[Dict, Dict]]):
+        """Historise, journalise et évalue un lot d'échantillons de cibles distinctes"""
+        if not batch:
+            return
+        for target, metrics in batch:
+            self.sample_feed.publish(target['name'], metrics)
+            self.report_stats.record_sample(target['name'], metrics)
+            try:
+                if self.metric_store:
+                    self.metric_store.append_sample(metrics)
+                self.log_metrics(metrics)
+            except Exception as e:
+                self.logger.error(f"Erreur lors du monitoring de {target['name']}: {str(e)}")
+        
+        # Seules les cellules en dépassement, ou sous alerte en cours, sont transmises aux états
+        watched = self.alert_states.watched_keys()
+        checks = self.fleet_evaluator.evaluate(batch, [watched.get(target['name']) for target, _ in batch])
+        for (target, metrics), target_checks in zip(batch, checks):
+            self.notify_events(target, metrics, self.alert_states.update(target['name'], target_checks))
+    
+    def notify_events(self, target: Dict, metrics: Dict, events: List[Tuple[str, Optional[str], Dict]]):
+        """Historise et notifie les évènements d'alerte d'un échantillon"""
+        for event, level, check in events:
+            alert = self.make_alert(check, level, event)
+            key = (target['name'], alert['level'])
+            self.alert_counts[key] = self.alert_counts.get(key, 0) + 1
+            entry = {
+                'timestamp': datetime.now(),
+                'target': target['name'],
+                'alert': alert,
+                'metrics': metrics
+            }
+            self.alert_history.append(entry)
+            self.report_stats.record_alert(entry)
+            
+            if event == RECOVERY:
+                self.logger.info(f"RÉTABLI - {alert['message']}")
+            else:
+                self.logger.warning(f"ALERTE {alert['level']} - {alert['message']}")
+            self.send_email_alert(alert, metrics)
+    
+    def send_digest(self, digest: Dict):
+        """Envoie le résumé périodique des alertes en cours"""
+        self.logger.info(f"Résumé des alertes: {len(digest['active'])} en cours, "
+                         f"{digest['suppressed']} répétitions non notifiées")
+        if not self.config["alerts"]["email_enabled"]:
+            return
+        
+        msg = MIMEMultipart()
+        msg['From'] = self.config["alerts"]["sender_email"]
+        msg['To'] = ", ".join(self.config["alerts"]["recipients"])
+        msg['Subject'] = f"RÉSUMÉ - {len(digest['active'])} alertes en cours"
+        
+        rows = ""
+        for item in digest['active']:
+            rows += (f"<tr><td>{item['target']}</td><td>{item['metric']}</td><td>{item['level']}</td>"
+                     f"<td>{item['value']:.1f}</td><td>{item['duration'] / 60:.0f} min</td>"
+                     f"<td>{item['suppressed']}</td></tr>")
+        
+        body = f"""
+        <html>
+        <body>
+            <h2>📋 Résumé des alertes en cours</h2>
+            <p>Période: {digest['period'] / 60:.0f} min - {digest['suppressed']} répétitions non notifiées</p>
+            <table border="1" cellpadding="4">
+                <tr><th>Serveur</th><th>Métrique</th><th>Niveau</th><th>Valeur</th><th>Durée</th><th>Répétitions</th></tr>
+                {rows}
+            </table>
+            <p><em>Cet email a été généré automatiquement par le système de monitoring.</em></p>
+        </body>
+        </html>
+        """
+        
+        msg.attach(MIMEText(body, 'html'))
+        self.notifier.start()
+        self.notifier.submit(msg)
     
     def start_monitoring(self):
         """Démarre le monitoring continu"""
         self.monitoring_active = True
         self.logger.info("Démarrage du monitoring système...")
+        if self.exporter:
+            self.exporter.start()
+        
+        mode = self.config["monitoring"].get("mode", "sequential")
+        if mode == "async":
+            asyncio.run(self.run_async_monitoring())
+            return
+        if mode == "sharded":
+            self.sharded_poller = ShardedPoller(self, self.config["monitoring"].get("workers"))
+            self.sharded_poller.run()
+            return
         
+        # Cadence fixe par cible, phases réparties sur l'intervalle
+        self.scheduler = PollScheduler(self.config["targets"], self.config["monitoring"]["interval"])
         while self.monitoring_active:
-            for target in self.config["targets"]:
-                self.monitor_target(target)
+            delay = self.scheduler.next_due() - time.monotonic()
+            if delay > 0:
+                # Attente par tranches d'au plus 1s pour réagir à l'arrêt
+                time.sleep(min(delay, 1))
+                continue
             
-            # Attendre l'intervalle configuré
-            time.sleep(self.config["monitoring"]["interval"])
+            for index, target in self.scheduler.pop_due(time.monotonic()):
+                self.monitor_target(target)
+                self.scheduler.mark_done(index, time.monotonic())
+    
+    async def run_async_monitoring(self):
+        """Boucle de monitoring asynchrone : les cibles sont interrogées en parallèle"""
+        poller = AsyncSnmpPoller(self, self.config["monitoring"].get("concurrency", 256))
+        self.scheduler = PollScheduler(self.config["targets"], self.config["monitoring"]["interval"])
+        try:
+            await poller.run_scheduled(self.scheduler, lambda: self.monitoring_active)
+        finally:
+            poller.close()
     
     def stop_monitoring(self):
         """Arrête le monitoring"""
         self.monitoring_active = False
+        if self.metric_store:
+            self.metric_store.flush()
+        # Les emails déjà en file sont envoyés avant l'arrêt
+        if self.notifier:
+            self.notifier.stop()
+        if self.exporter:
+            self.exporter.stop()
         self.logger.info("Arrêt du monitoring système")
     
-    def get_alert_history(self, hours: int = 24) -> List[Dict]:
+    def get_alert_history(self, hours: int = 24, target: Optional[str] = None) -> List[Dict]:
         """Récupère l'historique des alertes des dernières heures"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [alert for alert in self.alert_history if alert['timestamp'] > cutoff_time]
+        return self.alert_history.range(start=cutoff_time, target=target)
+    
+    def get_target_health(self) -> Dict[str, Dict]:
+        """État du disjoncteur de chaque cible (y compris celles des workers)"""
+        if self.sharded_poller:
+            return self.sharded_poller.get_target_health()
+        return self.circuit_breaker.get_states()
+    
+    def get_poller_stats(self) -> Dict:
+        """Latences SNMP, timeouts, erreurs, cycles et sections chronométrées (tous processus confondus)"""
+        if self.sharded_poller:
+            return merge_stats([self.instrumentation.get_stats()] + self.sharded_poller.get_instrumentation())
+        return self.instrumentation.get_stats()
+    
+    def get_metric_history(self, target_name: str, metric: str, hours: float = 24) -> List[Tuple[float, float]]:
+        """Récupère les points (horodatage epoch, valeur) d'une métrique depuis la base locale"""
+        if not self.metric_store:
+            return []
+        end = time.time()
+        return list(self.metric_store.query(target_name, metric, end - hours * 3600, end))
     
     def generate_report(self) -> str:
-        """Génère un rapport de monitoring"""
-        recent_alerts = self.get_alert_history(24)
+        """Génère un rapport de monitoring à partir des agrégats glissants (sans parcourir l'historique)"""
+        stats = self.report_stats.get_stats()
+        window = f"{stats['window_hours']:g}h"
         
         report = f"""
         ========================================
@@ -350,26 +837,115 @@ class SystemMonitor:
         CIBLES SURVEILLÉES:
         """
         
+        target_health = self.get_target_health()
         for target in self.config["targets"]:
-            report += f"- {target['name']} ({target['ip']})\n"
+            state = target_health.get(target['name'], {}).get('state', 'HEALTHY')
+            report += f"- {target['name']} ({target['ip']}) [{state}]\n"
         
         report += f"""
         
-        ALERTES (24h):
-        Total: {len(recent_alerts)}
+        ALERTES ({window}):
+        Total: {stats['alerts_total']}
         """
         
-        critical_count = len([a for a in recent_alerts if a['alert']['level'] == 'CRITICAL'])
-        warning_count = len([a for a in recent_alerts if a['alert']['level'] == 'WARNING'])
-        
-        report += f"Critiques: {critical_count}\n"
-        report += f"Avertissements: {warning_count}\n"
+        levels = stats['alerts']['level']
+        report += f"Critiques: {levels.get('CRITICAL', 0)}\n"
+        report += f"Avertissements: {levels.get('WARNING', 0)}\n"
+        for field, label in (('target', "Par cible"), ('metric', "Par métrique")):
+            counts = sorted(stats['alerts'][field].items(), key=lambda item: item[1], reverse=True)[:5]
+            if counts:
+                report += f"{label}: " + ", ".join(f"{value} ({count})" for value, count in counts) + "\n"
         
+        # 5 dernières alertes : fin de l'historique, déjà triée par date
+        cutoff = datetime.now() - timedelta(hours=stats['window_hours'])
+        recent_alerts = [alert for alert in self.alert_history[-5:] if alert['timestamp'] > cutoff]
         if recent_alerts:
             report += "\nDERNIÈRES ALERTES:\n"
-            for alert in recent_alerts[-5:]:  # 5 dernières alertes
+            for alert in recent_alerts:
                 report += f"- {alert['timestamp'].strftime('%H:%M:%S')} - {alert['target']}: {alert['alert']['message']}\n"
         
+        report += self.format_target_stats(stats)
+        
+        if self.sharded_poller:
+            report += "\nWORKERS (débit sur le dernier intervalle):\n"
+            for worker_id, stats in sorted(self.sharded_poller.get_worker_stats().items()):
+                report += (f"- Worker {worker_id}: {stats['targets']} cibles, "
+                           f"{stats['throughput']:.1f} échantillons/s, "
+                           f"{stats['overruns']} dépassements\n")
+        
+        alert_stats = self.alert_states.get_stats()
+        report += f"Alertes en cours: {alert_stats['active']}\n"
+        
+        if self.config["alerts"]["email_enabled"] and self.notifier:
+            notifier_stats = self.notifier.get_stats()
+            report += (f"\nEmails: {notifier_stats['sent']} envoyés, {notifier_stats['failed']} en échec, "
+                       f"{notifier_stats['dropped']} abandonnés, {notifier_stats['queue_depth']} en file\n")
+        
+        if self.scheduler:
+            report += f"\nDépassements de créneau: {self.scheduler.total_overruns()}\n"
+        
+        report += self.format_poller_stats(self.get_poller_stats())
+        return report
+    
+    def format_target_stats(self, stats: Dict) -> str:
+        """Disponibilité et min/moyenne/max/p95 des métriques de chaque cible configurée"""
+        def value(metric, number):
+            if number is None:
+                return "N/A"
+            return f"{number:.0f} o/s" if metric == 'network_total' else f"{number:.1f}%"
+        
+        labels = {'cpu_usage': "CPU", 'memory_percent': "Mémoire", 'disk_usage': "Disque",
+                  'network_total': "Réseau"}
+        report = f"\nSTATISTIQUES ({stats['window_hours']:g}h, min/moy/max/p95):\n"
+        for target in self.config["targets"]:
+            target_stats = stats['targets'].get(target['name'])
+            if not target_stats:
+                report += f"- {target['name']}: aucun échantillon\n"
+                continue
+            availability = target_stats['availability']
+            report += (f"- {target['name']}: disponibilité "
+                       f"{'N/A' if availability is None else f'{availability:.1f}%'} "
+                       f"({target_stats['polls']} polls)\n")
+            for metric, label in labels.items():
+                summary = target_stats['metrics'].get(metric)
+                if summary:
+                    report += (f"    {label}: {value(metric, summary['min'])} / {value(metric, summary['avg'])} / "
+                               f"{value(metric, summary['max'])} / {value(metric, summary['p95'])}\n")
+        return report
+    
+    def format_poller_stats(self, stats: Dict) -> str:
+        """Résumé des mesures du poller pour le rapport"""
+        def ms(value):
+            return "N/A" if value is None else f"{value * 1000:.1f} ms"
+        
+        report = "\nPERFORMANCE DU POLLER:\n"
+        cycles = stats['cycles']
+        if cycles['count']:
+            report += (f"Cycles: {cycles['count']}, dernier {cycles['last']:.2f}s "
+                       f"(dont {cycles['last_busy']:.2f}s de polls), moyen {cycles['mean']:.2f}s, "
+                       f"max {cycles['max']:.2f}s pour un intervalle de {cycles['interval']}s, "
+                       f"{cycles['overruns']} dépassements\n")
+        
+        requests = total_histogram(stats['targets'])
+        report += (f"Requêtes SNMP: {requests['count']}, p50 {ms(requests['p50'])}, "
+                   f"p95 {ms(requests['p95'])}, p99 {ms(requests['p99'])}, max {ms(requests['max'] or None)}\n")
+        report += (f"Timeouts: {sum(stats['timeouts'].values())}, "
+                   f"erreurs: {sum(stats['errors'].values())}\n")
+        
+        # Cibles les plus lentes (p95)
+        slowest = sorted(stats['targets'].items(), key=lambda item: item[1]['p95'] or 0, reverse=True)[:5]
+        for name, histogram in slowest:
+            report += (f"- {name}: p95 {ms(histogram['p95'])}, {stats['timeouts'].get(name, 0)} timeouts, "
+                       f"{stats['errors'].get(name, 0)} erreurs\n")
+        
+        labels = {'poll': "Poll complet", 'email': "Mise en file des emails", 'log': "Mise en file des logs"}
+        for section, label in labels.items():
+            histogram = stats['sections'].get(section)
+            if histogram:
+                report += (f"{label}: {histogram['count']} fois, moyenne {ms(histogram['mean'])}, "
+                           f"p95 {ms(histogram['p95'])}\n")
+        if self.log_pipeline.dropped:
+            report += f"Logs abandonnés (file pleine): {self.log_pipeline.dropped}\n"
         return report
 
 def main():
@@ -393,7 +969,7 @@ def main():
             time.sleep(300)  # 5 minutes
             report = monitor.generate_report()
             print("\n" + report)
-            
+    
     except KeyboardInterrupt:
         print("\n🛑 Arrêt du monitoring...")
         monitor.stop_monitoring()
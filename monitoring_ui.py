@@ -11,11 +11,27 @@ from tkinter import ttk, messagebox, filedialog
 import json
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import subprocess
 import sys
 import os
+import queue
 from monitoring_system import SystemMonitor
+from chart_panel import ChartPanel
+from timeseries_store import TimeSeriesStore
+import data_export
+
+# Rafraîchissement des métriques en direct : période et échantillons traités par passage
+UPDATE_INTERVAL_MS = 500
+MAX_SAMPLES_PER_UPDATE = 2000
+
+# Onglet des alertes : lignes par page et période d'ajout des nouvelles alertes
+ALERTS_PAGE_SIZE = 500
+ALERTS_REFRESH_MS = 2000
+
+# Export des données : périodes proposées (heures) et période de lecture de l'avancement
+EXPORT_PERIODS = {"1 h": 1, "24 h": 24, "7 j": 168, "30 j": 720}
+EXPORT_POLL_MS = 200
 
 class MonitoringUI:
     """Interface graphique pour le monitoring système"""
@@ -30,6 +46,27 @@ class MonitoringUI:
         self.monitoring_thread = None
         self.is_monitoring = False
         
+        # Flux des échantillons : file d'abonné, ligne affichée par cible, mise à jour programmée
+        self.sample_queue = None
+        self.metric_items = {}
+        self.metric_rows = {}
+        self.feed_dropped = 0
+        self.update_job = None
+        
+        # Alertes : curseur dans l'historique, page affichée (0 : plus récentes) et nombre correspondant
+        self.alert_cursor = None
+        self.alert_page = 0
+        self.alert_total = 0
+        self.alerts_job = None
+        
+        # Export en cours : thread d'écriture et avancement (lignes, fraction, erreur) lu par l'interface
+        self.export_thread = None
+        self.export_progress = None
+        
+        # Nom d'origine de chaque ligne de cible : les champs non édités ici (groupe, intervalle,
+        # communauté...) sont repris de la configuration à la sauvegarde
+        self.target_items = {}
+        
         self.setup_ui()
         self.load_config()
     
@@ -63,6 +100,9 @@ class MonitoringUI:
         # Onglet Monitoring
         self.setup_monitoring_tab(notebook)
         
+        # Onglet Graphiques
+        self.setup_charts_tab(notebook)
+        
         # Onglet Alertes
         self.setup_alerts_tab(notebook)
         
@@ -182,12 +222,18 @@ class MonitoringUI:
         metrics_frame = ttk.LabelFrame(monitoring_frame, text="Métriques en Temps Réel", padding="10")
         metrics_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
-        # Zone de texte pour les métriques
-        self.metrics_text = tk.Text(metrics_frame, height=15, width=80)
-        scrollbar = ttk.Scrollbar(metrics_frame, orient=tk.VERTICAL, command=self.metrics_text.yview)
-        self.metrics_text.configure(yscrollcommand=scrollbar.set)
-        
-        self.metrics_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Une ligne par cible, mise à jour à chaque nouvel échantillon
+        columns = ('target', 'ip', 'cpu', 'memory', 'disk', 'network', 'time')
+        self.metrics_tree = ttk.Treeview(metrics_frame, columns=columns, show='headings', height=15)
+        for column, title, width in zip(columns,
+                                        ('Cible', 'IP', 'CPU', 'Mémoire', 'Disque', 'Réseau', 'Heure'),
+                                        (150, 110, 70, 70, 70, 100, 80)):
+            self.metrics_tree.heading(column, text=title)
+            self.metrics_tree.column(column, width=width)
+        scrollbar = ttk.Scrollbar(metrics_frame, orient=tk.VERTICAL, command=self.metrics_tree.yview)
+        self.metrics_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.metrics_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
         # Configuration de la grille
@@ -196,6 +242,11 @@ class MonitoringUI:
         metrics_frame.columnconfigure(0, weight=1)
         metrics_frame.rowconfigure(0, weight=1)
     
+    def setup_charts_tab(self, notebook):
+        """Configure l'onglet des graphiques"""
+        self.chart_panel = ChartPanel(notebook)
+        notebook.add(self.chart_panel.frame, text="Graphiques")
+    
     def setup_alerts_tab(self, notebook):
         """Configure l'onglet des alertes"""
         alerts_frame = ttk.Frame(notebook)
@@ -206,6 +257,20 @@ class MonitoringUI:
                                 font=('Arial', 12, 'bold'))
         alerts_label.grid(row=0, column=0, pady=(0, 10))
         
+        # Filtres appliqués par les index de l'historique (vide : tous)
+        filters_frame = ttk.Frame(alerts_frame)
+        filters_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.alert_filter_vars = {}
+        for column, (field, label) in enumerate((('target', "Cible:"), ('level', "Niveau:"), ('metric', "Métrique:"))):
+            ttk.Label(filters_frame, text=label).grid(row=0, column=column * 2, padx=(0, 5))
+            variable = tk.StringVar()
+            combobox = ttk.Combobox(filters_frame, textvariable=variable, width=18)
+            combobox.configure(postcommand=lambda field=field, combobox=combobox:
+                               self.fill_alert_filter(field, combobox))
+            combobox.grid(row=0, column=column * 2 + 1, padx=(0, 10))
+            self.alert_filter_vars[field] = variable
+        ttk.Button(filters_frame, text="Filtrer", command=self.apply_alert_filters).grid(row=0, column=6)
+        
         # Liste des alertes
         self.alerts_tree = ttk.Treeview(alerts_frame, 
                                        columns=('timestamp', 'target', 'level', 'metric', 'message'), 
@@ -222,14 +287,22 @@ class MonitoringUI:
         self.alerts_tree.column('metric', width=80)
         self.alerts_tree.column('message', width=300)
         
-        self.alerts_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        self.alerts_tree.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
-        # Boutons
-        ttk.Button(alerts_frame, text="Actualiser", command=self.refresh_alerts).grid(row=2, column=0, pady=(0, 10))
+        # Pagination et boutons
+        pager_frame = ttk.Frame(alerts_frame)
+        pager_frame.grid(row=3, column=0, pady=(0, 10))
+        ttk.Button(pager_frame, text="◀ Plus récentes",
+                   command=lambda: self.change_alert_page(-1)).grid(row=0, column=0, padx=(0, 10))
+        self.alert_page_var = tk.StringVar(value="")
+        ttk.Label(pager_frame, textvariable=self.alert_page_var).grid(row=0, column=1, padx=(0, 10))
+        ttk.Button(pager_frame, text="Plus anciennes ▶",
+                   command=lambda: self.change_alert_page(1)).grid(row=0, column=2, padx=(0, 10))
+        ttk.Button(pager_frame, text="Actualiser", command=self.refresh_alerts).grid(row=0, column=3)
         
         # Configuration de la grille
         alerts_frame.columnconfigure(0, weight=1)
-        alerts_frame.rowconfigure(1, weight=1)
+        alerts_frame.rowconfigure(2, weight=1)
     
     def setup_reports_tab(self, notebook):
         """Configure l'onglet des rapports"""
@@ -241,12 +314,35 @@ class MonitoringUI:
         controls_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
         ttk.Button(controls_frame, text="Générer Rapport", command=self.generate_report).grid(row=0, column=0, padx=(0, 10))
-        ttk.Button(controls_frame, text="Exporter CSV", command=self.export_csv).grid(row=0, column=1, padx=(0, 10))
+        ttk.Button(controls_frame, text="Exporter", command=self.export_csv).grid(row=0, column=1, padx=(0, 10))
         ttk.Button(controls_frame, text="Ouvrir Logs", command=self.open_logs).grid(row=0, column=2)
         
+        # Export : données, période et cibles (séparées par des ;, vide : toutes), avancement
+        export_frame = ttk.LabelFrame(reports_frame, text="Export des Données", padding="10")
+        export_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(export_frame, text="Données:").grid(row=0, column=0, padx=(0, 5))
+        self.export_kind_var = tk.StringVar(value="Métriques")
+        ttk.Combobox(export_frame, textvariable=self.export_kind_var, values=["Métriques", "Alertes"],
+                     width=10, state='readonly').grid(row=0, column=1, padx=(0, 10))
+        ttk.Label(export_frame, text="Période:").grid(row=0, column=2, padx=(0, 5))
+        self.export_period_var = tk.StringVar(value="24 h")
+        ttk.Combobox(export_frame, textvariable=self.export_period_var, values=list(EXPORT_PERIODS),
+                     width=6, state='readonly').grid(row=0, column=3, padx=(0, 10))
+        ttk.Label(export_frame, text="Cibles:").grid(row=0, column=4, padx=(0, 5))
+        self.export_targets_var = tk.StringVar()
+        ttk.Entry(export_frame, textvariable=self.export_targets_var, width=30).grid(row=0, column=5, sticky=(tk.W, tk.E))
+        
+        self.export_bar = ttk.Progressbar(export_frame, maximum=1.0)
+        self.export_bar.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(10, 0))
+        self.export_status_var = tk.StringVar(value="")
+        ttk.Label(export_frame, textvariable=self.export_status_var).grid(row=1, column=4, columnspan=2,
+                                                                           sticky=tk.W, pady=(10, 0))
+        export_frame.columnconfigure(5, weight=1)
+        
         # Zone de rapport
         report_frame = ttk.LabelFrame(reports_frame, text="Rapport", padding="10")
-        report_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        report_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         self.report_text = tk.Text(report_frame, height=20, width=80)
         report_scrollbar = ttk.Scrollbar(report_frame, orient=tk.VERTICAL, command=self.report_text.yview)
@@ -257,7 +353,7 @@ class MonitoringUI:
         
         # Configuration de la grille
         reports_frame.columnconfigure(0, weight=1)
-        reports_frame.rowconfigure(1, weight=1)
+        reports_frame.rowconfigure(2, weight=1)
         report_frame.columnconfigure(0, weight=1)
         report_frame.rowconfigure(0, weight=1)
     
@@ -282,7 +378,8 @@ class MonitoringUI:
             
             # Charger les cibles
             for target in config['targets']:
-                self.targets_tree.insert('', 'end', values=(target['name'], target['ip'], target['port']))
+                item = self.targets_tree.insert('', 'end', values=(target['name'], target['ip'], target['port']))
+                self.target_items[item] = target['name']
             
             # Charger les seuils
             self.cpu_warning_var.set(str(config['thresholds']['cpu_warning']))
@@ -302,7 +399,15 @@ class MonitoringUI:
     def save_config(self):
         """Sauvegarde la configuration"""
         try:
-            config = {
+            # Les sections non éditées ici (règles, stockage...) sont conservées
+            try:
+                with open('config.json', 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except FileNotFoundError:
+                config = {}
+            existing = {target['name']: target for target in config.get("targets", [])}
+            
+            edited = {
                 "snmp": {
                     "community": self.community_var.get(),
                     "timeout": int(self.timeout_var.get()),
@@ -331,15 +436,24 @@ class MonitoringUI:
                     "log_file": "monitoring.log"
                 }
             }
+            for section, values in edited.items():
+                if isinstance(values, dict):
+                    config.setdefault(section, {}).update(values)
+                else:
+                    config[section] = values
             
-            # Ajouter les cibles
+            # Ajouter les cibles : nom, IP et port édités fusionnés dans la cible existante
             for item in self.targets_tree.get_children():
                 values = self.targets_tree.item(item)['values']
-                config["targets"].append({
-                    "name": values[0],
+                name = str(values[0])
+                target = dict(existing.get(self.target_items.get(item, name)) or existing.get(name) or {})
+                target.update({
+                    "name": name,
                     "ip": values[1],
                     "port": int(values[2])
                 })
+                config["targets"].append(target)
+                self.target_items[item] = name
             
             with open('config.json', 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=4, ensure_ascii=False)
@@ -385,6 +499,13 @@ class MonitoringUI:
         
         try:
             self.monitor = SystemMonitor()
+            # Abonnement avant le démarrage : aucun échantillon n'est manqué
+            self.sample_queue = self.monitor.sample_feed.subscribe()
+            self.feed_dropped = 0
+            self.metrics_tree.delete(*self.metrics_tree.get_children())
+            self.metric_items = {}
+            self.metric_rows = {}
+            self.chart_panel.attach(self.monitor)
             self.monitoring_thread = threading.Thread(target=self.monitor.start_monitoring)
             self.monitoring_thread.daemon = True
             self.monitoring_thread.start()
@@ -394,8 +515,11 @@ class MonitoringUI:
             self.stop_button.config(state='normal')
             self.status_var.set("Monitoring actif")
             
-            # Démarrer la mise à jour des métriques
+            # Démarrer la mise à jour des métriques et des alertes
             self.update_metrics()
+            self.alert_cursor = None
+            self.alert_page = 0
+            self.poll_alerts()
             
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du démarrage du monitoring: {str(e)}")
@@ -408,6 +532,15 @@ class MonitoringUI:
         try:
             if self.monitor:
                 self.monitor.stop_monitoring()
+                if self.sample_queue is not None:
+                    self.monitor.sample_feed.unsubscribe(self.sample_queue)
+            for job in (self.update_job, self.alerts_job):
+                if job is not None:
+                    self.root.after_cancel(job)
+            self.update_job = None
+            self.alerts_job = None
+            self.sample_queue = None
+            self.chart_panel.detach()
             
             self.is_monitoring = False
             self.start_button.config(state='normal')
@@ -418,52 +551,155 @@ class MonitoringUI:
             messagebox.showerror("Erreur", f"Erreur lors de l'arrêt du monitoring: {str(e)}")
     
     def update_metrics(self):
-        """Met à jour les métriques en temps réel"""
-        if self.is_monitoring and self.monitor:
-            try:
-                # Simuler la récupération de métriques
-                current_time = datetime.now().strftime('%H:%M:%S')
-                metrics_text = f"[{current_time}] Monitoring actif...\n"
-                
-                # Ajouter les métriques réelles si disponibles
-                if hasattr(self.monitor, 'last_metrics'):
-                    for target, metrics in self.monitor.last_metrics.items():
-                        metrics_text += f"  {target}: CPU={metrics.get('cpu_usage', 'N/A')}%, "
-                        metrics_text += f"Mémoire={metrics.get('memory_percent', 'N/A')}%\n"
-                
-                self.metrics_text.insert(tk.END, metrics_text)
-                self.metrics_text.see(tk.END)
-                
-                # Limiter le nombre de lignes
-                lines = self.metrics_text.get('1.0', tk.END).split('\n')
-                if len(lines) > 100:
-                    self.metrics_text.delete('1.0', '50.0')
-            
-            except Exception as e:
-                self.metrics_text.insert(tk.END, f"Erreur: {str(e)}\n")
+        """Applique les échantillons publiés par le monitoring (seules les lignes modifiées sont redessinées)"""
+        self.update_job = None
+        if not self.is_monitoring or self.sample_queue is None:
+            return
         
-        # Programmer la prochaine mise à jour
-        if self.is_monitoring:
-            self.root.after(5000, self.update_metrics)  # Toutes les 5 secondes
+        # Vidage par lot : seul le dernier échantillon de chaque cible est affiché
+        changed = {}
+        try:
+            for _ in range(MAX_SAMPLES_PER_UPDATE):
+                target, metrics = self.sample_queue.get_nowait()
+                changed[target] = metrics
+        except queue.Empty:
+            pass
+        
+        feed = self.monitor.sample_feed
+        if feed.dropped != self.feed_dropped:
+            # Échantillons perdus (file pleine) : resynchronisation sur les derniers connus
+            self.feed_dropped = feed.dropped
+            changed.update(feed.snapshot())
+        self.chart_panel.add_samples(changed)
+        
+        updated = 0
+        for target, metrics in changed.items():
+            values = self.metric_row(target, metrics)
+            if self.metric_rows.get(target) == values:
+                continue
+            item = self.metric_items.get(target)
+            if item is None:
+                self.metric_items[target] = self.metrics_tree.insert('', 'end', values=values)
+            else:
+                self.metrics_tree.item(item, values=values)
+            self.metric_rows[target] = values
+            updated += 1
+        if updated:
+            self.status_var.set(f"Monitoring actif - {len(self.metric_rows)} cibles, "
+                                f"dernière mise à jour {datetime.now().strftime('%H:%M:%S')}")
+        
+        # File encore chargée : reprise rapide sans bloquer la boucle Tk
+        delay = 50 if not self.sample_queue.empty() else UPDATE_INTERVAL_MS
+        self.update_job = self.root.after(delay, self.update_metrics)
     
-    def refresh_alerts(self):
-        """Actualise la liste des alertes"""
+    @staticmethod
+    def metric_row(target, metrics):
+        """Valeurs affichées pour une cible"""
+        def percent(value):
+            return "N/A" if value is None else f"{value:.1f}%"
+        
+        network = metrics.get('network_total')
+        return (
+            target,
+            metrics.get('ip', ''),
+            percent(metrics.get('cpu_usage')),
+            percent(metrics.get('memory_percent')),
+            percent(metrics.get('disk_usage')),
+            "N/A" if network is None else f"{network:.0f} o/s",
+            str(metrics.get('timestamp', ''))[11:19]
+        )
+    
+    def alert_filters(self):
+        """Critères saisis dans l'onglet des alertes (None : pas de filtre)"""
+        return {field: variable.get().strip() or None for field, variable in self.alert_filter_vars.items()}
+    
+    def fill_alert_filter(self, field, combobox):
+        """Propose les valeurs présentes dans l'historique"""
         if self.monitor:
-            alerts = self.monitor.get_alert_history(24)
-            
-            # Vider la liste
-            for item in self.alerts_tree.get_children():
-                self.alerts_tree.delete(item)
+            combobox.configure(values=[''] + self.monitor.alert_history.values(field))
+    
+    @staticmethod
+    def alert_row(alert):
+        """Valeurs affichées pour une alerte"""
+        return (
+            alert['timestamp'].strftime('%H:%M:%S'),
+            alert['target'],
+            alert['alert']['level'],
+            alert['alert']['metric'],
+            alert['alert']['message']
+        )
+    
+    def update_alert_pager(self):
+        """Libellé de la page d'alertes affichée"""
+        pages = max(1, -(-self.alert_total // ALERTS_PAGE_SIZE))
+        self.alert_page_var.set(f"Page {self.alert_page + 1}/{pages} ({self.alert_total} alertes)")
+    
+    @staticmethod
+    def alert_cutoff():
+        """Début de la fenêtre des alertes affichées (24 dernières heures)"""
+        return datetime.now() - timedelta(hours=24)
+    
+    def refresh_alerts(self):
+        """Recharge la page d'alertes affichée (filtres et page courants)"""
+        if not self.monitor:
+            return
+        history = self.monitor.alert_history
+        # Page et curseur lus ensemble : aucune alerte manquée ni affichée deux fois
+        with history.lock:
+            self.alert_total, alerts = history.query(start=self.alert_cutoff(),
+                                                     offset=self.alert_page * ALERTS_PAGE_SIZE,
+                                                     limit=ALERTS_PAGE_SIZE, **self.alert_filters())
+            self.alert_cursor = history.next_seq
+        
+        self.alerts_tree.delete(*self.alerts_tree.get_children())
+        for alert in alerts:
+            self.alerts_tree.insert('', 'end', values=self.alert_row(alert))
+        self.update_alert_pager()
+    
+    def apply_alert_filters(self):
+        """Affiche la première page des alertes correspondant aux filtres"""
+        self.alert_page = 0
+        self.refresh_alerts()
+    
+    def change_alert_page(self, step):
+        """Page précédente (-1, plus récentes) ou suivante (+1, plus anciennes)"""
+        pages = max(1, -(-self.alert_total // ALERTS_PAGE_SIZE))
+        page = min(max(0, self.alert_page + step), pages - 1)
+        if page != self.alert_page:
+            self.alert_page = page
+            self.refresh_alerts()
+    
+    def poll_alerts(self):
+        """Ajoute en tête de la première page les alertes arrivées depuis le dernier passage"""
+        self.alerts_job = None
+        if not self.is_monitoring or not self.monitor:
+            return
+        
+        history = self.monitor.alert_history
+        if self.alert_cursor is None:
+            self.refresh_alerts()
+        else:
+            alerts, self.alert_cursor = history.read_since(self.alert_cursor)
+            filters = [(field, value) for field, value in self.alert_filters().items() if value is not None]
+            alerts = [alert for alert in alerts
+                      if all(history.indexed_values(alert)[field] == value for field, value in filters)]
+            if alerts and self.alert_page == 0:
+                for alert in alerts[-ALERTS_PAGE_SIZE:]:
+                    self.alerts_tree.insert('', 0, values=self.alert_row(alert))
+                children = self.alerts_tree.get_children()
+                if len(children) > ALERTS_PAGE_SIZE:
+                    self.alerts_tree.delete(*children[ALERTS_PAGE_SIZE:])
             
-            # Ajouter les alertes
-            for alert in alerts:
-                self.alerts_tree.insert('', 'end', values=(
-                    alert['timestamp'].strftime('%H:%M:%S'),
-                    alert['target'],
-                    alert['alert']['level'],
-                    alert['alert']['metric'],
-                    alert['alert']['message']
-                ))
+            # Total recalculé sur la fenêtre : les alertes sorties des 24 h ne sont plus comptées
+            self.alert_total, _ = history.query(start=self.alert_cutoff(), limit=0, **self.alert_filters())
+            pages = max(1, -(-self.alert_total // ALERTS_PAGE_SIZE))
+            if self.alert_page >= pages:
+                # La page affichée n'existe plus : dernière page réelle
+                self.alert_page = pages - 1
+                self.refresh_alerts()
+            else:
+                self.update_alert_pager()
+        self.alerts_job = self.root.after(ALERTS_REFRESH_MS, self.poll_alerts)
     
     def generate_report(self):
         """Génère un rapport"""
@@ -476,25 +712,76 @@ class MonitoringUI:
             self.report_text.insert('1.0', "Aucun monitoring actif. Démarrez le monitoring pour générer un rapport.")
     
     def export_csv(self):
-        """Exporte les données en CSV"""
+        """Exporte les métriques ou les alertes (CSV, CSV gzip ou Parquet) dans un thread d'écriture"""
+        if self.export_thread is not None and self.export_thread.is_alive():
+            messagebox.showwarning("Attention", "Un export est déjà en cours")
+            return
+        
+        alerts = self.export_kind_var.get() == "Alertes"
+        if alerts and not self.monitor:
+            messagebox.showwarning("Attention", "Démarrez le monitoring pour exporter les alertes")
+            return
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("CSV gzip", "*.csv.gz"), ("Parquet", "*.parquet"),
+                       ("All files", "*.*")]
         )
+        if not filename:
+            return
         
-        if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write("Timestamp,Cible,Niveau,Métrique,Valeur,Message\n")
-                    if self.monitor:
-                        alerts = self.monitor.get_alert_history(24)
-                        for alert in alerts:
-                            f.write(f"{alert['timestamp']},{alert['target']},{alert['alert']['level']},"
-                                   f"{alert['alert']['metric']},{alert['alert']['value']},{alert['alert']['message']}\n")
+        hours = EXPORT_PERIODS.get(self.export_period_var.get(), 24)
+        targets = [name.strip() for name in self.export_targets_var.get().split(';') if name.strip()] or None
+        try:
+            if alerts:
+                start = datetime.now() - timedelta(hours=hours)
+                job = lambda progress: data_export.export_alerts(self.monitor.alert_history, filename, start,
+                                                                  targets=targets, progress=progress)
+            else:
+                store = self.export_store()
+                end = time.time()
                 
-                messagebox.showinfo("Succès", f"Données exportées vers {filename}")
+                def job(progress):
+                    # Points encore en mémoire écrits avant la lecture, dans le thread d'export
+                    store.flush()
+                    return data_export.export_metrics(store, filename, end - hours * 3600, end,
+                                                      targets=targets, progress=progress)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de l'export: {str(e)}")
+            return
+        
+        def run():
+            try:
+                rows = job(lambda written, fraction: setattr(self, 'export_progress', (written, fraction, None)))
+                self.export_progress = (rows, 1.0, None)
             except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de l'export: {str(e)}")
+                self.export_progress = (0, 0.0, str(e))
+        
+        self.export_progress = (0, 0.0, None)
+        self.export_thread = threading.Thread(target=run, daemon=True)
+        self.export_thread.start()
+        self.poll_export(filename)
+    
+    def export_store(self):
+        """Base des métriques : celle du monitoring en cours, sinon celle de la configuration"""
+        if self.monitor and self.monitor.metric_store:
+            return self.monitor.metric_store
+        with open('config.json', 'r', encoding='utf-8') as f:
+            storage = json.load(f).get("storage", {})
+        return TimeSeriesStore(storage.get("path", "metrics_data"),
+                               segment_hours=storage.get("segment_hours", 24), retention_days=None)
+    
+    def poll_export(self, filename):
+        """Affiche l'avancement de l'export jusqu'à sa fin"""
+        rows, fraction, error = self.export_progress
+        self.export_bar['value'] = fraction
+        self.export_status_var.set(f"{rows:,} lignes ({fraction:.0%})".replace(',', ' '))
+        if self.export_thread.is_alive():
+            self.root.after(EXPORT_POLL_MS, lambda: self.poll_export(filename))
+        elif error:
+            self.export_status_var.set("Échec de l'export")
+            messagebox.showerror("Erreur", f"Erreur lors de l'export: {error}")
+        else:
+            messagebox.showinfo("Succès", f"{rows} lignes exportées vers {filename}")
     
     def open_logs(self):
         """Ouvre le fichier de logs"""
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agrégats des Rapports
+=====================
+Compteurs d'alertes et statistiques des métriques sur une fenêtre glissante,
+tenus à jour à chaque échantillon et à chaque alerte : la fenêtre est découpée
+en tranches dont les totaux sont soustraits à leur expiration
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional
+
+# Métriques résumées par cible ; les pourcentages ont des compartiments de 1 %
+REPORT_METRICS = ('cpu_usage', 'memory_percent', 'disk_usage', 'network_total')
+PERCENT_BUCKETS = tuple(float(bound) for bound in range(1, 101))
+# Débits (octets/s) : compartiments géométriques de 1 o/s à 100 Go/s, 10 par décade
+RATE_BUCKETS = tuple(10 ** (exponent / 10) for exponent in range(0, 111))
+
+class ValueHistogram:
+    """Histogramme à compartiments fixes d'une série : ajout et retrait en temps constant"""
+    
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'minimum', 'maximum')
+    
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+    
+    def observe(self, value: float):
+        """Enregistre une valeur"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+    
+    def subtract(self, other: 'ValueHistogram'):
+        """Retire les observations d'une tranche expirée (minimum et maximum recalculés à part)"""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] -= count
+        self.count -= other.count
+        self.total -= other.total
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimation d'un quantile par interpolation dans son compartiment"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else min(self.minimum, 0.0)
+                upper = self.bounds[index] if index < len(self.bounds) else self.maximum
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(max(estimate, self.minimum), self.maximum)
+            cumulative += count
+        return self.maximum
+    
+    def to_dict(self) -> Dict:
+        """Nombre de valeurs, minimum, moyenne, maximum et p95"""
+        return {
+            'count': self.count,
+            'min': self.minimum,
+            'avg': self.total / self.count if self.count else None,
+            'max': self.maximum,
+            'p95': self.quantile(0.95)
+        }
+
+class WindowSlice:
+    """Compteurs d'une tranche de la fenêtre"""
+    
+    __slots__ = ('start', 'alerts', 'series', 'polls')
+    
+    def __init__(self, start: float):
+        self.start = start
+        # (champ, valeur) -> alertes ; (cible, métrique) -> histogramme ; cible -> [réussis, total]
+        self.alerts = {}
+        self.series = {}
+        self.polls = {}
+
+class ReportAggregates:
+    """Agrégats glissants par niveau, cible et métrique, lus par generate_report sans parcourir l'historique"""
+    
+    def __init__(self, window_hours: float = 24, slice_minutes: float = 5):
+        self.window = window_hours * 3600
+        self.slice_seconds = max(1.0, slice_minutes * 60)
+        self.lock = threading.Lock()
+        self.slices = deque()
+        # Totaux de la fenêtre : somme des tranches encore présentes
+        self.totals = WindowSlice(0.0)
+    
+    def current_slice(self, now: float) -> WindowSlice:
+        """Tranche de l'instant now, après expiration des tranches sorties de la fenêtre"""
+        start = now - now % self.slice_seconds
+        if not self.slices or self.slices[-1].start < start:
+            self.slices.append(WindowSlice(start))
+        while self.slices[0].start + self.slice_seconds <= now - self.window:
+            self.expire(self.slices.popleft())
+        return self.slices[-1]
+    
+    def expire(self, expired: WindowSlice):
+        """Soustrait une tranche des totaux"""
+        totals = self.totals
+        for key, count in expired.alerts.items():
+            remaining = totals.alerts[key] - count
+            if remaining:
+                totals.alerts[key] = remaining
+            else:
+                del totals.alerts[key]
+        for target, (ok, total) in expired.polls.items():
+            polls = totals.polls[target]
+            polls[0] -= ok
+            polls[1] -= total
+            if not polls[1]:
+                del totals.polls[target]
+        
+        for key, histogram in expired.series.items():
+            window = totals.series[key]
+            window.subtract(histogram)
+            if not window.count:
+                del totals.series[key]
+            elif histogram.minimum == window.minimum or histogram.maximum == window.maximum:
+                # L'extrême venait peut-être de la tranche expirée : recalcul sur les tranches restantes
+                remaining = [piece.series[key] for piece in self.slices if key in piece.series]
+                window.minimum = min(piece.minimum for piece in remaining)
+                window.maximum = max(piece.maximum for piece in remaining)
+    
+    def record_sample(self, target_name: str, metrics: Dict, now: Optional[float] = None):
+        """Compte un poll (réussi s'il a rapporté au moins une métrique) et ses valeurs"""
+        now = time.time() if now is None else now
+        with self.lock:
+            piece = self.current_slice(now)
+            values = [(metric, metrics.get(metric)) for metric in REPORT_METRICS]
+            values = [(metric, float(value)) for metric, value in values if value is not None]
+            self.count_poll(piece, target_name, 1 if values else 0)
+            
+            for metric, value in values:
+                key = (target_name, metric)
+                bounds = RATE_BUCKETS if metric == 'network_total' else PERCENT_BUCKETS
+                for series in (piece.series, self.totals.series):
+                    histogram = series.get(key)
+                    if histogram is None:
+                        histogram = series[key] = ValueHistogram(bounds)
+                    histogram.observe(value)
+    
+    def record_skip(self, target_name: str, now: Optional[float] = None):
+        """Compte comme échoué le créneau d'une cible non interrogée (disjoncteur ouvert)"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.count_poll(self.current_slice(now), target_name, 0)
+    
+    def count_poll(self, piece: WindowSlice, target_name: str, success: int):
+        """Ajoute un poll à la tranche et aux totaux (verrou tenu)"""
+        for counters in (piece.polls, self.totals.polls):
+            polls = counters.setdefault(target_name, [0, 0])
+            polls[0] += success
+            polls[1] += 1
+    
+    def record_alert(self, entry: Dict, now: Optional[float] = None):
+        """Compte une alerte de l'historique par niveau, cible et métrique"""
+        now = time.time() if now is None else now
+        alert = entry.get('alert', {})
+        keys = [('level', alert.get('level')), ('target', entry['target']), ('metric', alert.get('metric'))]
+        with self.lock:
+            piece = self.current_slice(now)
+            for counters in (piece.alerts, self.totals.alerts):
+                for key in keys:
+                    counters[key] = counters.get(key, 0) + 1
+    
+    def get_stats(self, now: Optional[float] = None) -> Dict:
+        """Compteurs d'alertes et statistiques par cible sur la fenêtre"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.current_slice(now)
+            totals = self.totals
+            alerts = {'level': {}, 'target': {}, 'metric': {}}
+            for (field, value), count in totals.alerts.items():
+                alerts[field][value] = count
+            
+            targets = {}
+            for target, (ok, total) in totals.polls.items():
+                targets[target] = {'polls': total, 'availability': 100.0 * ok / total, 'metrics': {}}
+            for (target, metric), histogram in totals.series.items():
+                targets.setdefault(target, {'polls': 0, 'availability': None, 'metrics': {}})
+                targets[target]['metrics'][metric] = histogram.to_dict()
+        
+        return {
+            'window_hours': self.window / 3600,
+            'alerts_total': sum(alerts['level'].values()),
+            'alerts': alerts,
+            'targets': targets
+        }
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordonnanceur de Polling
+=======================
+Cadence fixe par cible, avec décalage de phase pour lisser la charge
+"""
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+class PollScheduler:
+    """Ordonnanceur à tas : chaque cible est interrogée à cadence fixe"""
+    
+    def __init__(self, targets: List[Dict], default_interval: float, start: Optional[float] = None):
+        self.targets = targets
+        self.intervals = [float(target.get("interval", default_interval)) for target in targets]
+        self.next_due_at = [0.0] * len(targets)
+        self.overruns = [0] * len(targets)
+        self.skipped = [0] * len(targets)
+        self.heap = []
+        
+        start = time.monotonic() if start is None else start
+        
+        # Les cibles de même intervalle sont réparties uniformément sur cet intervalle
+        groups = {}
+        for index, interval in enumerate(self.intervals):
+            groups.setdefault(interval, []).append(index)
+        for interval, indexes in groups.items():
+            for position, index in enumerate(indexes):
+                due = start + position * interval / len(indexes)
+                self.next_due_at[index] = due
+                self.heap.append((due, index))
+        heapq.heapify(self.heap)
+    
+    def next_due(self) -> float:
+        """Instant (time.monotonic) de la prochaine interrogation"""
+        return self.heap[0][0] if self.heap else float('inf')
+    
+    def pop_due(self, now: float) -> List[Tuple[int, Dict]]:
+        """Retourne les cibles à interroger et planifie leur créneau suivant"""
+        due_targets = []
+        while self.heap and self.heap[0][0] <= now:
+            due, index = heapq.heappop(self.heap)
+            interval = self.intervals[index]
+            
+            # Cadence fixe : le créneau suivant ne dépend pas de la durée du poll
+            next_due = due + interval
+            if next_due <= now:
+                # Créneaux entièrement manqués : on se recale sur le prochain
+                missed = int((now - due) // interval)
+                self.skipped[index] += missed
+                next_due = due + (missed + 1) * interval
+            
+            self.next_due_at[index] = next_due
+            heapq.heappush(self.heap, (next_due, index))
+            due_targets.append((index, self.targets[index]))
+        return due_targets
+    
+    def mark_done(self, index: int, finished_at: float):
+        """Compte un dépassement si le poll s'est terminé après son créneau suivant"""
+        if finished_at > self.next_due_at[index]:
+            self.overruns[index] += 1
+    
+    def record_overrun(self, index: int):
+        """Compte un dépassement (poll précédent encore en cours)"""
+        self.overruns[index] += 1
+    
+    def total_overruns(self) -> int:
+        """Nombre total de dépassements de créneau"""
+        return sum(self.overruns)
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """Intervalle, dépassements et créneaux manqués par cible"""
+        return {
+            target['name']: {
+                'interval': self.intervals[index],
+                'overruns': self.overruns[index],
+                'skipped': self.skipped[index]
+            }
+            for index, target in enumerate(self.targets)
+        }
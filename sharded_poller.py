@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Poller SNMP Multi-Processus
+===========================
+Répartit les cibles sur plusieurs processus pour exploiter tous les cœurs CPU
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from log_pipeline import dispatch_record
+
+def shard_for(target: Dict, workers: int) -> int:
+    """Worker attribué à une cible (hash stable, identique d'un lancement à l'autre)"""
+    key = f"{target['ip']}:{target['port']}".encode('utf-8')
+    return zlib.crc32(key) % workers
+
+def split_targets(targets: List[Dict], workers: int) -> List[List[Dict]]:
+    """Répartit les cibles entre les workers"""
+    shards = [[] for _ in range(workers)]
+    for target in targets:
+        shards[shard_for(target, workers)].append(target)
+    return shards
+
+def poll_worker(worker_id: int, config_file: str, targets: List[Dict],
+                samples: multiprocessing.Queue, stop_event):
+    """Processus worker : interroge sa partition et renvoie les échantillons au processus principal"""
+    # Import local : le module principal importe celui-ci
+    from monitoring_system import SystemMonitor
+    from async_poller import AsyncSnmpPoller
+    from scheduler import PollScheduler
+    from log_pipeline import forward_to_parent
+    
+    # Journal écrit par le seul processus principal (rotation sans fichier tenu ouvert par les workers)
+    forward_to_parent(samples, worker_id)
+    # Contexte de polling seul : ni emails, ni export Prometheus, ni base locale partagée avec le parent
+    monitor = SystemMonitor(config_file, worker=True)
+    monitor.config["targets"] = targets
+    interval = monitor.config["monitoring"]["interval"]
+    scheduler = PollScheduler(targets, interval)
+    # Un cycle du worker couvre sa seule partition
+    monitor.instrumentation.configure(interval, len(targets))
+    
+    sample_count = 0
+    
+    def forward(target, metrics):
+        nonlocal sample_count
+        sample_count += 1
+        samples.put(('sample', worker_id, target, metrics))
+    
+    async def report_stats():
+        nonlocal sample_count
+        while not stop_event.is_set():
+            window_start = time.monotonic()
+            sample_count = 0
+            await asyncio.sleep(interval)
+            duration = time.monotonic() - window_start
+            samples.put(('stats', worker_id, None, {
+                'pid': os.getpid(),
+                'targets': len(targets),
+                'samples': sample_count,
+                'duration': duration,
+                'throughput': sample_count / duration if duration > 0 else 0.0,
+                'overruns': scheduler.total_overruns(),
+                'health': monitor.circuit_breaker.get_states(),
+                'instrumentation': monitor.instrumentation.get_stats()
+            }))
+    
+    async def run():
+        poller = AsyncSnmpPoller(monitor, monitor.config["monitoring"].get("concurrency", 256),
+                                 sample_callback=forward,
+                                 skip_callback=lambda target: samples.put(('skip', worker_id, target, None)))
+        stats_task = asyncio.ensure_future(report_stats())
+        try:
+            await poller.run_scheduled(scheduler, lambda: not stop_event.is_set())
+        finally:
+            stats_task.cancel()
+            poller.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+class ShardedPoller:
+    """Pilote un pool de workers et centralise alertes et agrégation"""
+    
+    def __init__(self, monitor, workers: Optional[int] = None):
+        self.monitor = monitor
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # spawn : les workers démarrent d'un interpréteur neuf, sans hériter des threads du parent
+        # (écriture des logs, envoi des emails) ni de leurs verrous
+        self.context = multiprocessing.get_context('spawn')
+        self.samples = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.processes = []
+        self.worker_stats = {}
+        # Échantillons traités ensemble par le processus principal
+        self.batch_size = monitor.config["monitoring"].get("batch_size", 1000)
+    
+    def start(self):
+        """Démarre un processus par partition"""
+        shards = split_targets(self.monitor.config["targets"], self.workers)
+        for worker_id, targets in enumerate(shards):
+            if not targets:
+                continue
+            process = self.context.Process(
+                target=poll_worker,
+                args=(worker_id, self.monitor.config_file, targets, self.samples, self.stop_event),
+                name=f"snmp-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        self.monitor.logger.info(f"Poller multi-processus: {len(self.processes)} workers "
+                                 f"pour {len(self.monitor.config['targets'])} cibles")
+    
+    def stop(self):
+        """Arrête les workers"""
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+    
+    def run(self):
+        """Consomme le flux d'échantillons jusqu'à l'arrêt du monitoring"""
+        self.start()
+        try:
+            while self.monitor.monitoring_active:
+                try:
+                    messages = [self.samples.get(timeout=1)]
+                except queue.Empty:
+                    continue
+                # Lot : tous les échantillons déjà arrivés, évalués en une seule passe
+                while len(messages) < self.batch_size:
+                    try:
+                        messages.append(self.samples.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                batch = [(target, payload) for kind, _, target, payload in messages if kind == 'sample']
+                if batch:
+                    try:
+                        self.monitor.process_batch(batch)
+                    except Exception as e:
+                        self.monitor.logger.error(f"Erreur lors du traitement de {len(batch)} échantillons: {str(e)}")
+                
+                for kind, worker_id, target, payload in messages:
+                    if kind == 'log':
+                        dispatch_record(payload)
+                    if kind == 'skip':
+                        # Cible non interrogée par un worker : poll échoué pour la disponibilité
+                        self.monitor.report_stats.record_skip(target['name'])
+                    if kind != 'stats':
+                        continue
+                    self.worker_stats[worker_id] = payload
+                    self.monitor.logger.info(f"Worker {worker_id}: {payload['samples']} échantillons en "
+                                             f"{payload['duration']:.2f}s ({payload['throughput']:.1f}/s, "
+                                             f"{payload['overruns']} dépassements)")
+        finally:
+            self.stop()
+    
+    def get_target_health(self) -> Dict[str, Dict]:
+        """État du disjoncteur des cibles, tel que remonté par les workers"""
+        health = {}
+        for stats in self.worker_stats.values():
+            health.update(stats.get('health', {}))
+        return health
+    
+    def get_worker_stats(self) -> Dict[int, Dict]:
+        """Débit par worker sur le dernier intervalle"""
+        return dict(self.worker_stats)
+    
+    def get_instrumentation(self) -> List[Dict]:
+        """Dernières mesures de latence et de cycle remontées par chaque worker"""
+        return [stats['instrumentation'] for stats in self.worker_stats.values() if 'instrumentation' in stats]
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Répondeur SNMP Local
+====================
+Agent SNMP v2c servant des équipements virtuels sur la boucle locale (un port
+UDP par équipement, ou un port partagé et une communauté par équipement), avec
+latence, pertes de paquets et anomalies simulées
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import socket
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from pyasn1.codec.ber import encoder, decoder
+from pysnmp.proto import api
+from pysnmp.proto.rfc1902 import Counter32, Counter64, Integer, OctetString, TimeTicks
+from metric_generator import ANOMALY_TYPES, MetricGenerator, np
+from monitoring_system import SNMP_OIDS
+from snmp_tables import NAME_COLUMNS, VALUE_COLUMNS
+
+pMod = api.protoModules[api.protoVersion2c]
+
+# Fréquence de mise à jour des jauges et des débits (secondes)
+TICK = 1.0
+
+# Varbinds maximum d'une réponse GETBULK (reste sous la taille d'un datagramme)
+MAX_BULK_VARBINDS = 1000
+
+def parse_oid(oid: str) -> Tuple[int, ...]:
+    """OID pointée en tuple d'entiers"""
+    return tuple(int(part) for part in oid.split('.'))
+
+class MibLayout:
+    """OIDs servies par un équipement virtuel, triées pour GETNEXT/GETBULK"""
+    
+    def __init__(self, interfaces: int = 2, disks: int = 2):
+        # Colonnes des tables parcourues par le poller, puis OIDs de SystemMonitor.snmp_oids
+        # (network_in, disk_usage, ... désignent la première ligne d'une table)
+        self.sources = {}
+        for name, column in {**NAME_COLUMNS, **VALUE_COLUMNS}.items():
+            rows = disks if name.startswith('dsk_') else interfaces
+            for row in range(1, rows + 1):
+                self.sources[parse_oid(column) + (row,)] = (name, row)
+        for name, oid in SNMP_OIDS.items():
+            self.sources.setdefault(parse_oid(oid), (name, 0))
+        self.oids = sorted(self.sources)
+    
+    def next_oid(self, oid: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        """OID suivante dans l'ordre lexicographique, ou None en fin de vue"""
+        position = bisect_right(self.oids, oid)
+        return self.oids[position] if position < len(self.oids) else None
+
+class VirtualFleet:
+    """Équipements virtuels d'un processus : une ligne du générateur chacun, mis à jour d'un bloc par tick"""
+    
+    def __init__(self, count: int, options: Dict, start: float, seed):
+        self.verbose = options["verbose"]
+        self.duration = (options["anomalies"] or {}).get("duration", 300)
+        self.generator = MetricGenerator(count, options["profile"], options["anomalies"], seed,
+                                         options["interfaces"], options["disks"])
+        self.indexes = []
+        
+        # Démarrage des agents antérieur au répondeur (sysUpTime non nul)
+        self.boot = start - self.generator.rng.uniform(3600, 86400, count)
+        self.memory_total = 8388608
+        self.columns = self.generator.tick(start)
+        self.memory_used = (self.memory_total * self.columns['memory_percent'] / 100).astype(np.int64)
+        # Compteurs d'octets depuis le démarrage de l'agent (équipements × interfaces)
+        uptime = (start - self.boot)[:, None]
+        self.octets_in = self.columns['interfaces_in'] * uptime
+        self.octets_out = self.columns['interfaces_out'] * uptime
+        self.last_tick = start
+    
+    def add(self, index: int) -> int:
+        """Attribue la ligne suivante du générateur à l'équipement index"""
+        self.indexes.append(index)
+        return len(self.indexes) - 1
+    
+    def advance(self, now: float):
+        """Nouveau tick si la période est écoulée : compteurs intégrés, jauges et débits régénérés"""
+        elapsed = now - self.last_tick
+        if elapsed < TICK:
+            return
+        self.octets_in += self.columns['interfaces_in'] * elapsed
+        self.octets_out += self.columns['interfaces_out'] * elapsed
+        self.columns = self.generator.tick(now)
+        self.memory_used = (self.memory_total * self.columns['memory_percent'] / 100).astype(np.int64)
+        self.last_tick = now
+        if self.verbose:
+            for row in np.flatnonzero(self.columns['anomaly_started']):
+                kind = ANOMALY_TYPES[self.columns['anomaly'][row]]
+                print(f"🚨 ANOMALIE injectée sur l'équipement {self.indexes[row]}: {kind} pendant {self.duration}s")
+    
+    def value(self, device: int, name: str, row: int, now: float):
+        """Valeur SNMP d'une OID de la vue pour l'équipement de la ligne device"""
+        columns = self.columns
+        if name == 'sys_uptime':
+            return TimeTicks(int((now - self.boot[device]) * 100) % 2 ** 32)
+        if name == 'cpu_usage':
+            return Integer(round(float(columns['cpu_usage'][device])))
+        if name == 'memory_total':
+            return Integer(self.memory_total)
+        if name == 'memory_used':
+            return Integer(int(self.memory_used[device]))
+        if name == 'if_descr':
+            return OctetString(f"eth{row - 1}")
+        if name == 'dsk_path':
+            return OctetString('/' if row == 1 else f"/data{row - 1}")
+        if name == 'dsk_percent':
+            return Integer(round(float(columns['disks'][device, row - 1])))
+        if name in ('if_in', 'if_out', 'if_in_hc', 'if_out_hc'):
+            # Compteur au dernier tick plus le débit courant depuis
+            if name in ('if_in', 'if_in_hc'):
+                octets, rates = self.octets_in, columns['interfaces_in']
+            else:
+                octets, rates = self.octets_out, columns['interfaces_out']
+            total = int(octets[device, row - 1] + rates[device, row - 1] * (now - self.last_tick))
+            if name in ('if_in', 'if_out'):
+                return Counter32(total % 2 ** 32)
+            return Counter64(total % 2 ** 64)
+        return pMod.NoSuchObject()
+
+class AgentProtocol(asyncio.DatagramProtocol):
+    """Socket UDP partagé par un ou plusieurs équipements virtuels (un par communauté)"""
+    
+    def __init__(self, fleet: VirtualFleet, devices: Dict[str, int], layout: MibLayout,
+                 latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, seed: int = 0):
+        self.fleet = fleet
+        # Communauté -> ligne de l'équipement dans la flotte
+        self.devices = {community.encode('utf-8'): device for community, device in devices.items()}
+        self.layout = layout
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.transport = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data, addr):
+        try:
+            message, _ = decoder.decode(data, asn1Spec=pMod.Message())
+        except Exception:
+            return
+        # Communauté inconnue : pas de réponse, comme un agent réel
+        device = self.devices.get(bytes(pMod.apiMessage.getCommunity(message)))
+        if device is None:
+            return
+        if self.loss and self.rng.random() < self.loss:
+            return
+        
+        now = time.time()
+        self.fleet.advance(now)
+        response = pMod.apiMessage.getResponse(message)
+        pMod.apiPDU.setVarBinds(pMod.apiMessage.getPDU(response),
+                                self.answer(device, pMod.apiMessage.getPDU(message), now))
+        payload = encoder.encode(response)
+        
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.send, payload, addr)
+        else:
+            self.send(payload, addr)
+    
+    def send(self, payload: bytes, addr):
+        """Envoie une réponse (socket éventuellement fermé entre-temps)"""
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(payload, addr)
+    
+    def lookup(self, device: int, oid: Tuple[int, ...], now: float):
+        """Valeur d'une OID exacte, ou noSuchObject"""
+        source = self.layout.sources.get(oid)
+        if source is None:
+            return pMod.NoSuchObject()
+        return self.fleet.value(device, source[0], source[1], now)
+    
+    def successor(self, device: int, oid: Tuple[int, ...], now: float):
+        """(OID suivante, valeur), ou endOfMibView"""
+        following = self.layout.next_oid(oid)
+        if following is None:
+            return pMod.ObjectIdentifier(oid), pMod.EndOfMibView()
+        return pMod.ObjectIdentifier(following), self.lookup(device, following, now)
+    
+    def answer(self, device: int, pdu, now: float) -> List:
+        """Varbinds de la réponse à une requête GET, GETNEXT ou GETBULK"""
+        requested = [tuple(oid) for oid, _ in pMod.apiPDU.getVarBinds(pdu)]
+        if pdu.isSameTypeWith(pMod.GetRequestPDU()):
+            return [(pMod.ObjectIdentifier(oid), self.lookup(device, oid, now)) for oid in requested]
+        if pdu.isSameTypeWith(pMod.GetNextRequestPDU()):
+            return [self.successor(device, oid, now) for oid in requested]
+        if not pdu.isSameTypeWith(pMod.GetBulkRequestPDU()):
+            return []
+        
+        non_repeaters = min(int(pMod.apiBulkPDU.getNonRepeaters(pdu)), len(requested))
+        repetitions = int(pMod.apiBulkPDU.getMaxRepetitions(pdu))
+        var_binds = [self.successor(device, oid, now) for oid in requested[:non_repeaters]]
+        cursors = requested[non_repeaters:]
+        if cursors:
+            repetitions = min(repetitions, (MAX_BULK_VARBINDS - len(var_binds)) // len(cursors))
+        # Réponse rangée ligne par ligne, comme attendu par le poller
+        for _ in range(repetitions):
+            for position, oid in enumerate(cursors):
+                next_oid, value = self.successor(device, oid, now)
+                var_binds.append((next_oid, value))
+                cursors[position] = tuple(next_oid)
+        return var_binds
+
+def raise_file_limit(sockets: int):
+    """Relève la limite de descripteurs ouverts si le nombre de sockets l'exige"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = sockets + 64
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        limit = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+
+def serve_devices(options: Dict, ports: List[int], ready, stop_event):
+    """Processus répondeur : sert les équipements de ses ports jusqu'à l'arrêt"""
+    raise_file_limit(len(ports))
+    layout = MibLayout(options["interfaces"], options["disks"])
+    
+    async def run():
+        loop = asyncio.get_running_loop()
+        indexes = [range(port, options["devices"], options["ports"]) for port in ports]
+        # Tirages reproductibles pour une graine et une répartition des ports données
+        fleet = VirtualFleet(sum(len(port_indexes) for port_indexes in indexes), options, time.time(),
+                             [options["seed"], ports[0]])
+        transports = []
+        for port, port_indexes in zip(ports, indexes):
+            devices = {device_community(index, options): fleet.add(index) for index in port_indexes}
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda devices=devices, port=port: AgentProtocol(fleet, devices, layout, options["latency"],
+                                                                        options["jitter"], options["loss"],
+                                                                        options["seed"] * 1000003 + port),
+                local_addr=(options["host"], options["base_port"] + port), family=socket.AF_INET)
+            transports.append(transport)
+        ready.set()
+        try:
+            while not stop_event.is_set():
+                await asyncio.sleep(0.2)
+        finally:
+            for transport in transports:
+                transport.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+def device_community(index: int, options: Dict) -> str:
+    """Communauté d'un équipement : celle du répondeur, suffixée de l'index si le port est partagé"""
+    if options["ports"] >= options["devices"]:
+        return options["community"]
+    return f"{options['community']}@{index}"
+
+class SnmpResponder:
+    """Équipements virtuels servis par un ou plusieurs processus"""
+    
+    def __init__(self, devices: int, base_port: int = 16100, host: str = '127.0.0.1',
+                 community: str = 'public', workers: int = 1, interfaces: int = 2, disks: int = 2,
+                 ports: Optional[int] = None, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                 profile: Optional[Dict] = None, anomalies: Optional[Dict] = None,
+                 seed: int = 0, verbose: bool = False):
+        # Un port par équipement par défaut ; moins de ports : équipements distingués par communauté
+        ports = max(1, min(ports or devices, devices))
+        self.options = {
+            "devices": devices,
+            "base_port": base_port,
+            "host": host,
+            "community": community,
+            "ports": ports,
+            "interfaces": max(1, interfaces),
+            "disks": max(1, disks),
+            "latency": latency,
+            "jitter": jitter,
+            "loss": loss,
+            "profile": profile,
+            "anomalies": anomalies,
+            "seed": seed,
+            "verbose": verbose
+        }
+        self.workers = max(1, min(workers, ports))
+        self.stop_event = multiprocessing.Event()
+        self.processes = []
+    
+    def targets(self, prefix: str = "Équipement") -> List[Dict]:
+        """Cibles de configuration correspondant aux équipements virtuels"""
+        options = self.options
+        return [{'name': f"{prefix} {index}", 'ip': options["host"],
+                 'port': options["base_port"] + index % options["ports"],
+                 'community': device_community(index, options)}
+                for index in range(options["devices"])]
+    
+    def start(self, timeout: float = 60):
+        """Démarre les processus et attend que tous les ports soient ouverts"""
+        self.stop_event.clear()
+        events = []
+        for worker in range(self.workers):
+            ready = multiprocessing.Event()
+            process = multiprocessing.Process(
+                target=serve_devices,
+                args=(self.options, list(range(worker, self.options["ports"], self.workers)),
+                      ready, self.stop_event),
+                name=f"snmp-responder-{worker}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            events.append(ready)
+        
+        deadline = time.monotonic() + timeout
+        for ready, process in zip(events, self.processes):
+            while not ready.wait(0.2):
+                if not process.is_alive() or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"Le répondeur SNMP n'a pas pu ouvrir ses ports ({process.name})")
+    
+    def stop(self):
+        """Arrête les processus répondeurs"""
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Répondeur SNMP local (équipements virtuels)")
+    parser.add_argument('--devices', type=int, default=10)
+    parser.add_argument('--base-port', type=int, default=16100)
+    parser.add_argument('--ports', type=int, default=None, help="ports UDP (défaut: un par équipement)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--community', default='public')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.0, help="latence de réponse (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="variation de la latence (ms)")
+    parser.add_argument('--loss', type=float, default=0.0, help="taux de pertes (0 à 1)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    responder = SnmpResponder(args.devices, args.base_port, args.host, args.community, args.workers,
+                              ports=args.ports, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                              loss=args.loss, seed=args.seed)
+    responder.start()
+    ports = responder.options["ports"]
+    print(f"✅ {args.devices} équipements virtuels sur {args.host}:{args.base_port}-"
+          f"{args.base_port + ports - 1} (communauté {args.community}"
+          f"{'@<index>' if ports < args.devices else ''})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du répondeur...")
+        responder.stop()
+
+if __name__ == "__main__":
+    main()
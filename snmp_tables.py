@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tables SNMP (interfaces et disques)
+===================================
+Parcours GETBULK de ifTable/ifXTable et dskTable, métriques par ligne
+"""
+
+from typing import Dict, Optional, Tuple
+
+# Colonnes donnant le nom des lignes (relues seulement après un redémarrage de l'agent)
+NAME_COLUMNS = {
+    'if_descr': '1.3.6.1.2.1.2.2.1.2',        # ifDescr
+    'dsk_path': '1.3.6.1.4.1.2021.9.1.2'      # dskPath
+}
+
+# Colonnes relues à chaque cycle
+VALUE_COLUMNS = {
+    'if_in': '1.3.6.1.2.1.2.2.1.10',          # ifInOctets
+    'if_out': '1.3.6.1.2.1.2.2.1.16',         # ifOutOctets
+    'if_in_hc': '1.3.6.1.2.1.31.1.1.1.6',     # ifHCInOctets
+    'if_out_hc': '1.3.6.1.2.1.31.1.1.1.10',   # ifHCOutOctets
+    'dsk_percent': '1.3.6.1.4.1.2021.9.1.9'   # dskPercent
+}
+
+# Garde-fou des parcours : au-delà, l'agent est considéré comme défaillant
+MAX_TABLE_ROWS = 10000
+
+def oid_key(oid: str) -> Tuple[int, ...]:
+    """OID sous forme comparable (ordre lexicographique SNMP, pas celui des chaînes)"""
+    return tuple(int(part) for part in oid.split('.') if part)
+
+def column_index(oid: str, column: str) -> Optional[str]:
+    """Index de ligne d'une OID dans une colonne, ou None si elle est hors de la colonne"""
+    prefix = column + '.'
+    if oid.startswith(prefix):
+        return oid[len(prefix):]
+    return None
+
+class TableIndexCache:
+    """Correspondance index → nom (ifDescr, dskPath) par cible, invalidée au redémarrage de l'agent"""
+    
+    def __init__(self):
+        self.entries = {}
+    
+    def needs_refresh(self, target_name: str, uptime: Optional[float]) -> bool:
+        """Indique si les noms doivent être relus (première collecte ou sysUpTime remis à zéro)"""
+        entry = self.entries.get(target_name)
+        if entry is None:
+            return True
+        if uptime is None or entry['uptime'] is None:
+            return False
+        return uptime < entry['uptime']
+    
+    def columns(self, target_name: str, uptime: Optional[float]) -> Dict[str, str]:
+        """Colonnes à parcourir pour cette cible lors du cycle courant"""
+        if self.needs_refresh(target_name, uptime):
+            return {**NAME_COLUMNS, **VALUE_COLUMNS}
+        return dict(VALUE_COLUMNS)
+    
+    def build_tables(self, target_name: str, uptime: Optional[float],
+                     walked: Dict[str, Dict[str, object]]) -> Dict[str, Dict]:
+        """Convertit le résultat du parcours en métriques par interface et par disque"""
+        if 'if_descr' in walked or 'dsk_path' in walked:
+            self.entries[target_name] = {
+                'uptime': uptime,
+                'interfaces': {index: str(value) for index, value in walked.get('if_descr', {}).items()},
+                'disks': {index: str(value) for index, value in walked.get('dsk_path', {}).items()}
+            }
+        entry = self.entries.get(target_name)
+        if entry is None:
+            return {'interfaces': {}, 'disks': {}}
+        entry['uptime'] = uptime
+        
+        interfaces = {}
+        for index, name in entry['interfaces'].items():
+            counters = {}
+            for direction in ('in', 'out'):
+                # Compteurs 64 bits de préférence
+                if index in walked.get(f'if_{direction}_hc', {}):
+                    counters[direction] = (float(walked[f'if_{direction}_hc'][index]), 64)
+                elif index in walked.get(f'if_{direction}', {}):
+                    counters[direction] = (float(walked[f'if_{direction}'][index]), 32)
+            if counters:
+                interfaces[name] = counters
+        
+        disks = {}
+        for index, path in entry['disks'].items():
+            if index in walked.get('dsk_percent', {}):
+                disks[path] = float(walked['dsk_percent'][index])
+        
+        return {'interfaces': interfaces, 'disks': disks}
+
+def next_repetitions(rows: int, maximum: int) -> int:
+    """max-repetitions pour le prochain parcours : toute la table en un aller-retour si possible"""
+    return max(1, min(rows + 1, maximum))
@@ -30,14 +30,23 @@ def test_snmp_connection(ip, community="public", port=161, timeout=3):
     success_count = 0
     total_count = len(test_oids)
     
+    # Moteur, authentification et transport partagés par tous les tests
+    snmp_engine = SnmpEngine()
+    auth = CommunityData(community)
+    try:
+        transport = UdpTransportTarget((ip, port), timeout=timeout, retries=1)
+    except Exception as e:
+        print(f"❌ Adresse invalide: {str(e)}")
+        return False
+    
     for name, oid in test_oids.items():
         try:
             print(f"📡 Test de {name} ({oid})...", end=" ")
             
             iterator = getCmd(
-                SnmpEngine(),
-                CommunityData(community),
-                UdpTransportTarget((ip, port), timeout=timeout, retries=1),
+                snmp_engine,
+                auth,
+                transport,
                 ContextData(),
                 ObjectType(ObjectIdentity(oid))
             )
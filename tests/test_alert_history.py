@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de l'Historique des Alertes
+=================================
+Limites de taille et d'ancienneté, requêtes par index et curseurs de lecture
+incrémentale d'AlertHistory
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert_history import AlertHistory
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+def make_entry(seconds: float, target: str = 'srv', level: str = 'WARNING', metric: str = 'cpu') -> dict:
+    """Alerte horodatée START + seconds"""
+    return {'timestamp': START + timedelta(seconds=seconds), 'target': target,
+            'alert': {'level': level, 'metric': metric, 'message': f"{metric} {level}"}}
+
+def brute_force(entries, start=None, end=None, **filters):
+    """Référence : filtrage linéaire, plus récentes en premier"""
+    selected = [entry for entry in entries
+                if (start is None or entry['timestamp'] > start) and (end is None or entry['timestamp'] <= end)
+                and all(AlertHistory.indexed_values(entry)[field] == value for field, value in filters.items())]
+    return selected[::-1]
+
+class AlertHistoryTest(unittest.TestCase):
+    
+    def test_size_limit_trims_by_batches(self):
+        history = AlertHistory(max_entries=100, max_age_hours=None)
+        for second in range(125):
+            history.append(make_entry(second))
+        # Marge de 25 % avant compactage
+        self.assertEqual(len(history), 125)
+        history.append(make_entry(125))
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history[0]['timestamp'], START + timedelta(seconds=26))
+        self.assertEqual(history.next_seq, 126)
+    
+    def test_age_limit(self):
+        history = AlertHistory(max_entries=1000, max_age_hours=1)
+        for minute in range(0, 60, 10):
+            history.append(make_entry(minute * 60))
+        # 66 minutes après la première alerte (marge de 10 %) : les alertes de plus d'une heure partent
+        history.append(make_entry(67 * 60))
+        self.assertEqual([entry['timestamp'] for entry in history],
+                         [START + timedelta(minutes=minute) for minute in (10, 20, 30, 40, 50, 67)])
+    
+    def test_query_matches_brute_force(self):
+        history = AlertHistory(max_entries=150, max_age_hours=None)
+        entries = []
+        for second in range(400):
+            entry = make_entry(second, target=f"srv{second % 3}", level=('WARNING', 'CRITICAL')[second % 2],
+                               metric=('cpu', 'memory', 'disk')[second % 5 % 3])
+            entries.append(entry)
+            history.append(entry)
+        kept = list(history)
+        self.assertEqual(kept, entries[-len(kept):])
+        
+        start = START + timedelta(seconds=300)
+        end = START + timedelta(seconds=380)
+        for filters in ({}, {'target': 'srv1'}, {'level': 'CRITICAL', 'metric': 'disk'},
+                        {'target': 'srv2', 'level': 'WARNING', 'metric': 'cpu'}):
+            expected = brute_force(kept, start, end, **filters)
+            total, page = history.query(start=start, end=end, offset=3, limit=10, **filters)
+            self.assertEqual(total, len(expected), filters)
+            self.assertEqual(page, expected[3:13], filters)
+        
+        self.assertEqual(history.range(start, end, 'srv0'),
+                         brute_force(kept, start, end, target='srv0')[::-1])
+        self.assertEqual(history.targets(), ['srv0', 'srv1', 'srv2'])
+    
+    def test_cursor_survives_trimming(self):
+        history = AlertHistory(max_entries=10, max_age_hours=None)
+        for second in range(5):
+            history.append(make_entry(second))
+        alerts, cursor = history.read_since(0)
+        self.assertEqual((len(alerts), cursor), (5, 5))
+        
+        for second in range(5, 40):
+            history.append(make_entry(second))
+        alerts, cursor = history.read_since(cursor)
+        # Alertes supprimées avant d'avoir été lues : seules les restantes sont rendues
+        self.assertEqual(cursor, 40)
+        self.assertEqual(alerts, list(history))
+        self.assertEqual(history.read_since(cursor), ([], 40))
+    
+    def test_clock_going_backwards_keeps_order(self):
+        history = AlertHistory(max_entries=100, max_age_hours=None)
+        history.append(make_entry(10))
+        history.append(make_entry(5))
+        self.assertEqual(history.timestamps, sorted(history.timestamps))
+        total, _ = history.query(start=START + timedelta(seconds=9))
+        self.assertEqual(total, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de l'Envoi des Alertes
+============================
+AlertNotifier face à un serveur SMTP local (aiosmtpd) : regroupement des
+envois, connexion réutilisée et compteurs de contre-pression
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import sys
+import time
+import unittest
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert_notifier import AlertNotifier
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+RECIPIENTS = ["admin@example.com", "ops@example.com"]
+
+def free_port() -> int:
+    """Port TCP local libre"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+def make_message(number: int) -> MIMEText:
+    """Email d'alerte minimal"""
+    message = MIMEText(f"Alerte {number}")
+    message['Subject'] = f"Alerte {number}"
+    message['From'] = "monitoring@example.com"
+    message['To'] = ", ".join(RECIPIENTS)
+    return message
+
+class RecordingHandler:
+    """Serveur SMTP de test : conserve les enveloppes reçues (après un délai éventuel)"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.envelopes = []
+        self.delay = delay
+    
+    async def handle_DATA(self, server, session, envelope):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.envelopes.append(envelope)
+        return '250 OK'
+
+@unittest.skipIf(Controller is None, "aiosmtpd n'est pas installé")
+class AlertNotifierTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.port = free_port()
+        self.controller = Controller(self.handler, hostname='127.0.0.1', port=self.port)
+        self.controller.start()
+        self.logger = logging.getLogger("test_alert_notifier")
+    
+    def tearDown(self):
+        self.controller.stop()
+    
+    def make_notifier(self, port=None, **options) -> AlertNotifier:
+        config = {
+            "smtp_server": "127.0.0.1",
+            "smtp_port": port or self.port,
+            "smtp_starttls": False,
+            "sender_email": "monitoring@example.com",
+            "sender_password": "",
+            "recipients": RECIPIENTS
+        }
+        return AlertNotifier(config, self.logger, **options)
+    
+    def test_queued_messages_sent_in_one_batch_over_one_connection(self):
+        notifier = self.make_notifier(batch_size=50)
+        for number in range(5):
+            self.assertTrue(notifier.submit(make_message(number)))
+        notifier.start()
+        notifier.stop()
+        
+        stats = notifier.get_stats()
+        self.assertEqual(stats['sent'], 5)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+        # Une transaction par message, tous les destinataires dans la même enveloppe
+        self.assertEqual(len(self.handler.envelopes), 5)
+        for envelope in self.handler.envelopes:
+            self.assertEqual(sorted(envelope.rcpt_tos), sorted(RECIPIENTS))
+    
+    def test_batch_size_limits_messages_per_wakeup(self):
+        notifier = self.make_notifier(batch_size=2)
+        for number in range(5):
+            notifier.submit(make_message(number))
+        notifier.start()
+        notifier.stop()
+        
+        stats = notifier.get_stats()
+        self.assertEqual(stats['sent'], 5)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(stats['connections'], 1)
+    
+    def test_full_queue_drops_instead_of_blocking(self):
+        notifier = self.make_notifier(queue_size=3)
+        accepted = [notifier.submit(make_message(number)) for number in range(5)]
+        self.assertEqual(accepted, [True, True, True, False, False])
+        
+        stats = notifier.get_stats()
+        self.assertEqual(stats['submitted'], 3)
+        self.assertEqual(stats['dropped'], 2)
+        self.assertEqual(stats['max_queue_depth'], 3)
+        self.assertEqual(stats['queue_capacity'], 3)
+        
+        notifier.start()
+        notifier.stop()
+        self.assertEqual(notifier.get_stats()['sent'], 3)
+        self.assertEqual(len(self.handler.envelopes), 3)
+    
+    def test_unreachable_server_counts_failures(self):
+        notifier = self.make_notifier(port=free_port())
+        for number in range(2):
+            notifier.submit(make_message(number))
+        notifier.start()
+        notifier.stop()
+        
+        stats = notifier.get_stats()
+        self.assertEqual(stats['sent'], 0)
+        self.assertEqual(stats['failed'], 2)
+        self.assertIsNotNone(stats['last_error'])
+        self.assertFalse(stats['connected'])
+    
+    def test_stop_timeout_leaves_session_to_sender_thread(self):
+        self.handler.delay = 0.3
+        notifier = self.make_notifier()
+        for number in range(3):
+            notifier.submit(make_message(number))
+        notifier.start()
+        time.sleep(0.1)
+        # Lot en cours : stop rend la main sans fermer la session sous le thread d'envoi
+        notifier.stop(timeout=0.05)
+        thread = notifier.thread
+        self.assertTrue(thread.is_alive())
+        
+        thread.join(5)
+        stats = notifier.get_stats()
+        self.assertEqual(stats['sent'], 3)
+        self.assertEqual(stats['failed'], 0)
+        self.assertFalse(stats['connected'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des États des Alertes
+===========================
+Hystérésis, confirmation sur plusieurs échantillons, rappels et résumés
+périodiques d'AlertStateTracker
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert_state import (CHANGE, CRITICAL, RAISE, RECOVERY, REMINDER, WARNING,
+                         AlertStateTracker, breach_level)
+
+def cpu_check(value: float, comparator: str = '>=') -> dict:
+    """Contrôle CPU : avertissement à 80, critique à 90"""
+    return {'metric': 'cpu', 'key': 'cpu_usage', 'value': value,
+            'warning': 80, 'critical': 90, 'comparator': comparator}
+
+def low_check(value: float) -> dict:
+    """Contrôle d'une valeur trop basse : avertissement sous 20, critique sous 10"""
+    return {'metric': 'free', 'key': 'free', 'value': value,
+            'warning': 20, 'critical': 10, 'comparator': '<='}
+
+def make_tracker(**options) -> AlertStateTracker:
+    config = {'hysteresis': 5, 'raise_after_samples': 1, 'clear_after_samples': 1,
+              'renotify_interval': 0, 'digest_interval': 0}
+    config.update(options)
+    return AlertStateTracker(config)
+
+class BreachLevelTest(unittest.TestCase):
+    
+    def test_levels_and_comparators(self):
+        self.assertIsNone(breach_level(79.9, 80, 90))
+        self.assertEqual(breach_level(80, 80, 90), WARNING)
+        self.assertEqual(breach_level(95, 80, 90), CRITICAL)
+        self.assertIsNone(breach_level(80, 80, 90, '>'))
+        self.assertEqual(breach_level(5, 20, 10, '<='), CRITICAL)
+        self.assertEqual(breach_level(15, None, 10, '<'), None)
+
+class AlertStateTrackerTest(unittest.TestCase):
+    
+    def events(self, tracker, check, now):
+        return [(kind, level) for kind, level, _ in tracker.update('srv', [check], now)]
+    
+    def test_raise_change_and_recovery(self):
+        tracker = make_tracker()
+        self.assertEqual(self.events(tracker, cpu_check(50), 0), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 1), [(RAISE, WARNING)])
+        self.assertEqual(self.events(tracker, cpu_check(95), 2), [(CHANGE, CRITICAL)])
+        self.assertEqual(self.events(tracker, cpu_check(50), 3), [(RECOVERY, CRITICAL)])
+        self.assertEqual(tracker.get_active(), {})
+    
+    def test_hysteresis_holds_level_inside_margin(self):
+        tracker = make_tracker(hysteresis=5)
+        self.events(tracker, cpu_check(92), 0)
+        # Critique à 90 avec 5 % de marge : maintenu jusqu'à 85.5
+        self.assertEqual(self.events(tracker, cpu_check(86), 1), [])
+        self.assertEqual(tracker.get_active()[('srv', 'cpu')]['level'], CRITICAL)
+        self.assertEqual(self.events(tracker, cpu_check(85), 2), [(CHANGE, WARNING)])
+        # Avertissement à 80 : maintenu jusqu'à 76
+        self.assertEqual(self.events(tracker, cpu_check(77), 3), [])
+        self.assertEqual(self.events(tracker, cpu_check(75), 4), [(RECOVERY, WARNING)])
+    
+    def test_hysteresis_for_low_value_rules(self):
+        tracker = make_tracker(hysteresis=10)
+        self.assertEqual(self.events(tracker, low_check(18), 0), [(RAISE, WARNING)])
+        # Avertissement sous 20 avec 10 % de marge : maintenu jusqu'à 22
+        self.assertEqual(self.events(tracker, low_check(21.5), 1), [])
+        self.assertEqual(self.events(tracker, low_check(23), 2), [(RECOVERY, WARNING)])
+    
+    def test_raise_after_consecutive_samples(self):
+        tracker = make_tracker(raise_after_samples=3)
+        self.assertEqual(self.events(tracker, cpu_check(85), 0), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 1), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 2), [(RAISE, WARNING)])
+    
+    def test_unconfirmed_breach_is_forgotten(self):
+        tracker = make_tracker(raise_after_samples=2)
+        self.events(tracker, cpu_check(85), 0)
+        self.assertIn('srv', tracker.watched_keys())
+        self.assertEqual(self.events(tracker, cpu_check(50), 1), [])
+        self.assertEqual(tracker.watched_keys(), {})
+        # Le compteur repart de zéro
+        self.assertEqual(self.events(tracker, cpu_check(85), 2), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 3), [(RAISE, WARNING)])
+    
+    def test_clear_after_consecutive_samples(self):
+        tracker = make_tracker(clear_after_samples=2)
+        self.events(tracker, cpu_check(85), 0)
+        self.assertEqual(self.events(tracker, cpu_check(50), 1), [])
+        # Retour en dépassement : la confirmation du rétablissement est annulée
+        self.assertEqual(self.events(tracker, cpu_check(85), 2), [])
+        self.assertEqual(self.events(tracker, cpu_check(50), 3), [])
+        self.assertEqual(self.events(tracker, cpu_check(50), 4), [(RECOVERY, WARNING)])
+    
+    def test_reminders_and_suppressed_repeats(self):
+        tracker = make_tracker(renotify_interval=60)
+        self.events(tracker, cpu_check(85), 0)
+        self.assertEqual(self.events(tracker, cpu_check(85), 30), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 59), [])
+        self.assertEqual(self.events(tracker, cpu_check(85), 60), [(REMINDER, WARNING)])
+        self.assertEqual(self.events(tracker, cpu_check(85), 90), [])
+        stats = tracker.get_stats()
+        self.assertEqual(stats['suppressed'], 3)
+        self.assertEqual(stats['events'], 2)
+        self.assertEqual(stats['active'], 1)
+    
+    def test_digest_lists_active_alerts_and_resets_counters(self):
+        tracker = make_tracker(digest_interval=300)
+        tracker.last_digest = 0
+        tracker.update('a', [cpu_check(95)], 10)
+        tracker.update('a', [cpu_check(95)], 20)
+        tracker.update('b', [cpu_check(85)], 30)
+        self.assertIsNone(tracker.collect_digest(299))
+        
+        digest = tracker.collect_digest(310)
+        self.assertEqual(digest['period'], 310)
+        self.assertEqual(digest['suppressed'], 1)
+        self.assertEqual([(entry['target'], entry['level'], entry['duration']) for entry in digest['active']],
+                         [('a', CRITICAL, 300), ('b', WARNING, 280)])
+        self.assertEqual(digest['active'][0]['suppressed'], 1)
+        
+        # Intervalle suivant : alertes toujours en cours, compteurs remis à zéro
+        digest = tracker.collect_digest(610)
+        self.assertEqual(digest['suppressed'], 0)
+        self.assertEqual(len(digest['active']), 2)
+        
+        tracker.update('a', [cpu_check(10)], 700)
+        tracker.update('b', [cpu_check(10)], 700)
+        self.assertIsNone(tracker.collect_digest(910))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du Calcul des Débits Réseau
+=================================
+Deltas de compteurs, rebouclage des compteurs 32 bits et redémarrage de l'agent
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from counter_rates import COUNTER32_MAX, CounterRates
+
+class CounterRatesTest(unittest.TestCase):
+    
+    def test_first_sample_has_no_rate(self):
+        rates = CounterRates()
+        self.assertEqual(rates.update('srv', {'in': (1000.0, 32)}, now=0), {})
+    
+    def test_rate_from_uptime(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (1000.0, 32), 'out': (0.0, 64)}, uptime=10000, now=0)
+        # 10 s côté agent (sysUpTime en centièmes), même si la réponse est arrivée plus tard
+        result = rates.update('srv', {'in': (21000.0, 32), 'out': (5000.0, 64)}, uptime=11000, now=12)
+        self.assertEqual(result, {'in': 2000.0, 'out': 500.0})
+    
+    def test_rate_from_local_clock_without_uptime(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (0.0, 64)}, now=100)
+        self.assertEqual(rates.update('srv', {'in': (400.0, 64)}, now=104), {'in': 100.0})
+    
+    def test_counter32_wrap(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (COUNTER32_MAX - 1000.0, 32)}, uptime=0, now=0)
+        result = rates.update('srv', {'in': (3000.0, 32)}, uptime=100, now=1)
+        self.assertEqual(result, {'in': 4000.0})
+    
+    def test_counter64_decrease_is_skipped(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (5000.0, 64), 'out': (0.0, 64)}, now=0)
+        self.assertEqual(rates.update('srv', {'in': (10.0, 64), 'out': (100.0, 64)}, now=1), {'out': 100.0})
+    
+    def test_agent_reboot_resets_baseline(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (90000.0, 32)}, uptime=500000, now=0)
+        # sysUpTime revenu en arrière : compteurs repartis de zéro, pas de faux rebouclage
+        self.assertEqual(rates.update('srv', {'in': (100.0, 32)}, uptime=1000, now=10), {})
+        self.assertEqual(rates.update('srv', {'in': (1100.0, 32)}, uptime=2000, now=20), {'in': 100.0})
+    
+    def test_counter_width_change_and_zero_elapsed(self):
+        rates = CounterRates()
+        rates.update('srv', {'in': (100.0, 32)}, now=0)
+        self.assertEqual(rates.update('srv', {'in': (200.0, 64)}, now=1), {})
+        self.assertEqual(rates.update('srv', {'in': (300.0, 64)}, now=1), {})
+    
+    def test_targets_are_independent_and_reset(self):
+        rates = CounterRates()
+        rates.update('a', {'in': (0.0, 64)}, now=0)
+        rates.update('b', {'in': (0.0, 64)}, now=0)
+        rates.reset('a')
+        self.assertEqual(rates.update('a', {'in': (100.0, 64)}, now=1), {})
+        self.assertEqual(rates.update('b', {'in': (100.0, 64)}, now=1), {'in': 100.0})
+
+if __name__ == "__main__":
+    unittest.main()
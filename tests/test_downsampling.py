@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la Réduction des Séries
+================================
+LTTB, regroupement min/max et résumés par blocs de SeriesBuffer
+"""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import downsampling
+from downsampling import FANOUT, LTTB, MINMAX, SeriesBuffer, lttb_indices, minmax_indices
+
+def noisy_series(count: int, seed: int = 1):
+    """Horodatages toutes les 10 s et valeurs bruitées autour d'une sinusoïde"""
+    rng = random.Random(seed)
+    x = [1000.0 + 10 * index for index in range(count)]
+    y = [50 + 30 * math.sin(index / 500) + rng.uniform(-5, 5) for index in range(count)]
+    return x, y
+
+class LttbTest(unittest.TestCase):
+    
+    def test_short_series_unchanged(self):
+        x, y = noisy_series(10)
+        self.assertEqual(lttb_indices(x, y, 10), list(range(10)))
+        self.assertEqual(lttb_indices(x, y, 2), list(range(10)))
+    
+    def test_threshold_points_with_edges_kept(self):
+        for count in (500, 50000):
+            x, y = noisy_series(count)
+            indices = lttb_indices(x, y, 100)
+            self.assertEqual(len(indices), 100)
+            self.assertEqual((indices[0], indices[-1]), (0, count - 1))
+            self.assertEqual(indices, sorted(set(indices)))
+    
+    def test_isolated_spike_is_kept(self):
+        x = [float(index) for index in range(10000)]
+        y = [0.0] * 10000
+        y[4321] = 100.0
+        for numpy in (downsampling.np, None):
+            saved = downsampling.np
+            downsampling.np = numpy
+            try:
+                self.assertIn(4321, lttb_indices(x, y, 50))
+            finally:
+                downsampling.np = saved
+
+class MinMaxTest(unittest.TestCase):
+    
+    def test_each_bucket_extremes(self):
+        x, y = noisy_series(1000)
+        indices = minmax_indices(x, y, 10)
+        for bucket in range(10):
+            values = y[bucket * 100:(bucket + 1) * 100]
+            kept = [y[index] for index in indices if bucket * 100 <= index < (bucket + 1) * 100]
+            self.assertEqual((min(kept), max(kept)), (min(values), max(values)))
+        self.assertEqual(indices, sorted(indices))
+    
+    def test_numpy_and_python_paths_agree(self):
+        if downsampling.np is None:
+            self.skipTest("NumPy n'est pas installé")
+        x, y = noisy_series(20000)
+        vectorized = minmax_indices(x, y, 37)
+        saved = downsampling.np
+        downsampling.np = None
+        try:
+            self.assertEqual(minmax_indices(x, y, 37), vectorized)
+        finally:
+            downsampling.np = saved
+
+class SeriesBufferTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.x, self.y = noisy_series(FANOUT ** 3 + 123)
+        self.buffer = SeriesBuffer()
+        self.buffer.extend(zip(self.x, self.y))
+    
+    def test_block_summaries_match_brute_force(self):
+        for level, (mins, maxs) in enumerate(zip(self.buffer.mins, self.buffer.maxs)):
+            size = FANOUT ** (level + 1)
+            self.assertEqual(len(mins), len(self.y) // size)
+            for block in range(len(mins)):
+                values = self.y[block * size:(block + 1) * size]
+                self.assertEqual(self.y[mins[block]], min(values))
+                self.assertEqual(self.y[maxs[block]], max(values))
+    
+    def test_out_of_order_points_ignored(self):
+        count = len(self.buffer)
+        self.buffer.append(self.x[10], 0.0)
+        self.buffer.append(self.x[-1], 0.0)
+        self.assertEqual(len(self.buffer), count)
+    
+    def test_candidates_keep_range_extremes_and_edges(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            low = rng.randrange(0, len(self.y) - 2)
+            high = rng.randrange(low + 1, len(self.y) + 1)
+            indices = self.buffer.candidates(low, high, 40)
+            self.assertEqual(indices, sorted(set(indices)))
+            self.assertEqual((indices[0], indices[-1]), (low, high - 1))
+            kept = [self.y[index] for index in indices]
+            self.assertEqual(min(kept), min(self.y[low:high]))
+            self.assertEqual(max(kept), max(self.y[low:high]))
+    
+    def test_points_respect_width_and_period(self):
+        start, end = self.x[100], self.x[3000]
+        for method in (LTTB, MINMAX):
+            xs, ys = self.buffer.points(start, end, 200, method)
+            self.assertLessEqual(len(xs), 400)
+            self.assertEqual((xs[0], xs[-1]), (start, end))
+            self.assertTrue(all(start <= timestamp <= end for timestamp in xs))
+        # Min/max : les extrêmes de la période restent visibles
+        _, ys = self.buffer.points(start, end, 200, MINMAX)
+        self.assertEqual((min(ys), max(ys)), (min(self.y[100:3001]), max(self.y[100:3001])))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de l'Évaluation Vectorisée des Seuils
+===========================================
+FleetEvaluator doit rendre, pour chaque échantillon, les mêmes contrôles que
+ThresholdRules.evaluate filtré sur les dépassements et les métriques suivies
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fleet_eval
+from fleet_eval import FleetEvaluator, is_breach
+from threshold_rules import ThresholdRules
+
+CONFIG = {
+    "thresholds": {
+        "cpu_warning": 80, "cpu_critical": 90,
+        "memory_warning": 85, "memory_critical": 95,
+        "disk_warning": 85, "disk_critical": 95,
+        "network_warning": 1000, "network_critical": 5000
+    },
+    "rules": None
+}
+
+def make_samples(count: int, seed: int = 7):
+    """Échantillons variés : métriques manquantes, valeurs non numériques, tables hétérogènes, groupes"""
+    rng = random.Random(seed)
+    samples = []
+    for number in range(count):
+        target = {'name': f"srv{number}", 'group': rng.choice([None, 'db'])}
+        metrics = {'target': target['name'], 'timestamp': '2026-01-01T00:00:00'}
+        for key in ('cpu_usage', 'memory_percent', 'disk_usage', 'network_total'):
+            roll = rng.random()
+            if roll < 0.1:
+                continue
+            metrics[key] = None if roll < 0.15 else rng.uniform(0, 6000 if key == 'network_total' else 100)
+        if rng.random() < 0.5:
+            metrics['disks'] = {path: rng.uniform(50, 100) for path in rng.sample(['/', '/var', '/home'], 2)}
+        if rng.random() < 0.5:
+            metrics['interfaces'] = {name: {'in': rng.uniform(0, 3000), 'out': rng.uniform(0, 3000),
+                                            'total': rng.uniform(0, 6000)}
+                                     for name in rng.sample(['eth0', 'eth1', 'lo'], 2)}
+        samples.append((target, metrics))
+    return samples
+
+def expected_checks(rules, samples, watch):
+    """Référence : évaluation cible par cible"""
+    return [[check for check in rules.evaluate(target, metrics)
+             if (keys and check['key'] in keys) or is_breach(check)]
+            for (target, metrics), keys in zip(samples, watch)]
+
+class FleetEvaluatorTest(unittest.TestCase):
+    
+    def setUp(self):
+        config = dict(CONFIG)
+        config["rules"] = [
+            {"metric": "cpu_usage", "label": "CPU", "warning": "cpu_warning", "critical": "cpu_critical",
+             "groups": {"db": {"warning": 60}}},
+            {"metric": "memory_percent", "label": "Mémoire", "warning": "memory_warning",
+             "critical": "memory_critical"},
+            {"metric": "disk.*", "label": "Disque {name}", "warning": "disk_warning", "critical": "disk_critical"},
+            {"metric": "disk_usage", "label": "Disque", "unless": "disks",
+             "warning": "disk_warning", "critical": "disk_critical"},
+            {"metric": "if.*.total", "label": "Réseau {name}", "warning": "network_warning",
+             "critical": "network_critical"},
+            {"metric": "if.*", "label": "Débit {name}", "comparator": "<", "warning": 100},
+            {"metric": "network_total", "label": "Réseau", "unless": "interfaces",
+             "warning": "network_warning", "critical": "network_critical"}
+        ]
+        self.rules = ThresholdRules(config)
+        self.evaluator = FleetEvaluator(self.rules)
+        self.samples = make_samples(300)
+        rng = random.Random(3)
+        self.watch = [rng.choice([None, {'cpu_usage'}, {'disk./var', 'if.eth0.total'}]) for _ in self.samples]
+    
+    def test_matches_per_target_evaluation(self):
+        self.assertEqual(self.evaluator.evaluate(self.samples, self.watch),
+                         expected_checks(self.rules, self.samples, self.watch))
+    
+    def test_matches_without_watch(self):
+        watch = [None] * len(self.samples)
+        self.assertEqual(self.evaluator.evaluate(self.samples), expected_checks(self.rules, self.samples, watch))
+    
+    def test_row_by_row_tables_match(self):
+        # Tables trop hétérogènes : évaluation ligne par ligne
+        limit = fleet_eval.MAX_TABLE_COLUMNS
+        fleet_eval.MAX_TABLE_COLUMNS = 1
+        try:
+            result = self.evaluator.evaluate(self.samples, self.watch)
+        finally:
+            fleet_eval.MAX_TABLE_COLUMNS = limit
+        self.assertEqual(result, expected_checks(self.rules, self.samples, self.watch))
+    
+    def test_matches_without_numpy(self):
+        numpy = fleet_eval.np
+        fleet_eval.np = None
+        try:
+            result = self.evaluator.evaluate(self.samples, self.watch)
+        finally:
+            fleet_eval.np = numpy
+        self.assertEqual(result, expected_checks(self.rules, self.samples, self.watch))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests des Règles de Seuil
+=========================
+Règles par défaut, motifs, surcharges par groupe et par cible et règles
+invalides de ThresholdRules
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from threshold_rules import ThresholdRules
+
+THRESHOLDS = {
+    "cpu_warning": 80, "cpu_critical": 90,
+    "memory_warning": 85, "memory_critical": 95,
+    "disk_warning": 85, "disk_critical": 95,
+    "network_warning": 1000, "network_critical": 5000
+}
+
+def checks_by_key(rules, target, metrics):
+    return {check['key']: check for check in rules.evaluate(target, metrics)}
+
+class ThresholdRulesTest(unittest.TestCase):
+    
+    def test_default_rules_use_thresholds_section(self):
+        rules = ThresholdRules({"thresholds": THRESHOLDS})
+        checks = checks_by_key(rules, {'name': 'srv'},
+                               {'cpu_usage': 50, 'memory_percent': 90, 'disk_usage': 70, 'uptime': 12})
+        self.assertEqual(sorted(checks), ['cpu_usage', 'disk_usage', 'memory_percent'])
+        self.assertEqual((checks['cpu_usage']['warning'], checks['cpu_usage']['critical']), (80, 90))
+        self.assertEqual(checks['memory_percent']['metric'], "Mémoire")
+    
+    def test_tables_replace_global_metrics(self):
+        rules = ThresholdRules({"thresholds": THRESHOLDS})
+        metrics = {
+            'disk_usage': 70, 'network_total': 10,
+            'disks': {'/': 40, '/var': 90},
+            'interfaces': {'eth0': {'in': 5, 'out': 5, 'total': 10}}
+        }
+        checks = checks_by_key(rules, {'name': 'srv'}, metrics)
+        # disk_usage et network_total ignorés quand les tables sont présentes ("unless")
+        self.assertEqual(sorted(checks), ['disk./', 'disk./var', 'if.eth0.total'])
+        self.assertEqual(checks['disk./var']['metric'], "Disque /var")
+        self.assertEqual(checks['if.eth0.total']['metric'], "Réseau eth0")
+        self.assertEqual(checks['if.eth0.total']['unit'], " o/s")
+    
+    def test_group_then_target_overrides(self):
+        config = {"thresholds": THRESHOLDS, "rules": [{
+            "metric": "cpu_usage", "label": "CPU", "warning": 70, "critical": 90,
+            "groups": {"db": {"warning": 60}},
+            "targets": {"db1": {"critical": 75}, "quiet": {"enabled": False}}
+        }]}
+        rules = ThresholdRules(config)
+        sample = {'cpu_usage': 50}
+        limits = lambda target: [(check['warning'], check['critical']) for check in rules.evaluate(target, sample)]
+        self.assertEqual(limits({'name': 'web1'}), [(70, 90)])
+        self.assertEqual(limits({'name': 'db2', 'group': 'db'}), [(60, 90)])
+        self.assertEqual(limits({'name': 'db1', 'group': 'db'}), [(60, 75)])
+        self.assertEqual(limits({'name': 'quiet'}), [])
+        # Cibles sans surcharge propre : un seul jeu de règles compilé
+        self.assertIs(rules.compile_for({'name': 'web1'}), rules.compile_for({'name': 'web2'}))
+    
+    def test_patterns_and_comparators(self):
+        config = {"rules": [
+            {"metric": "*_temp", "label": "Température {name}", "warning": 60},
+            {"metric": "free_*", "label": "Libre {name}", "comparator": "<", "critical": 10},
+            {"metric": "cpu_usage"}
+        ]}
+        rules = ThresholdRules(config)
+        checks = checks_by_key(rules, {'name': 'srv'}, {'cpu_temp': 65, 'free_mem': 5, '_temp': 1, 'cpu_usage': 99})
+        # Règle sans seuil ignorée ; '*' couvre au moins un caractère
+        self.assertEqual(sorted(checks), ['cpu_temp', 'free_mem'])
+        self.assertEqual(checks['cpu_temp']['metric'], "Température cpu")
+        self.assertEqual(checks['free_mem']['comparator'], '<')
+    
+    def test_invalid_rules_are_skipped(self):
+        errors = []
+        logger = type('Logger', (), {'error': lambda self, message: errors.append(message)})()
+        config = {"rules": [
+            {"label": "sans métrique", "warning": 1},
+            {"metric": "cpu_usage", "comparator": "!=", "warning": 1},
+            {"metric": "a*b*", "warning": 1},
+            {"metric": "cpu_usage", "warning": 1}
+        ]}
+        rules = ThresholdRules(config, logger)
+        self.assertEqual(len(rules.rules), 1)
+        self.assertEqual(len(errors), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Règles de Seuil
+===============
+Table de règles déclarative (config.json, section "rules") compilée par cible
+en un index par nom de métrique
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from alert_state import COMPARATORS
+from metric_names import flatten_metrics
+
+DEFAULT_MESSAGES = {
+    'CRITICAL': "{label} critique: {value} (seuil: {threshold})",
+    'WARNING': "{label} {adjective}: {value} (seuil: {threshold})",
+    'OK': "{label} rétabli: {value} (seuil: {threshold})"
+}
+
+# Règles équivalentes aux seuils historiques ; une chaîne renvoie à la section "thresholds"
+DEFAULT_RULES = [
+    {"metric": "cpu_usage", "label": "CPU", "warning": "cpu_warning", "critical": "cpu_critical"},
+    {"metric": "memory_percent", "label": "Mémoire", "adjective": "élevée",
+     "warning": "memory_warning", "critical": "memory_critical"},
+    {"metric": "disk.*", "label": "Disque {name}", "warning": "disk_warning", "critical": "disk_critical"},
+    {"metric": "disk_usage", "label": "Disque", "unless": "disks",
+     "warning": "disk_warning", "critical": "disk_critical"},
+    {"metric": "if.*.total", "label": "Réseau {name}", "unit": " o/s", "precision": 0,
+     "warning": "network_warning", "critical": "network_critical"},
+    {"metric": "network_total", "label": "Réseau", "unless": "interfaces", "unit": " o/s", "precision": 0,
+     "warning": "network_warning", "critical": "network_critical"}
+]
+
+def match(spec: Dict, key: str) -> Optional[str]:
+    """Partie de la métrique couverte par le '*' du motif, ou None"""
+    prefix, suffix = spec['prefix'], spec['suffix']
+    if len(key) > len(prefix) + len(suffix) and key.startswith(prefix) and key.endswith(suffix):
+        return key[len(prefix):len(key) - len(suffix)]
+    return None
+
+def make_check(spec: Dict, key: str, value: float, name: str) -> Dict:
+    """Contrôle d'une valeur par une règle"""
+    return {
+        'metric': spec['label'].format(name=name, metric=key),
+        'key': key,
+        'value': value,
+        'warning': spec['warning'],
+        'critical': spec['critical'],
+        'comparator': spec['comparator'],
+        'unit': spec['unit'],
+        'precision': spec['precision'],
+        'adjective': spec['adjective'],
+        'messages': spec['messages']
+    }
+
+class CompiledRules:
+    """Règles d'une cible indexées par métrique exacte et par famille (préfixe avant le premier '.')"""
+    
+    def __init__(self):
+        self.exact = {}
+        self.families = {}
+        # Motifs commençant par '*' : testés sur toutes les métriques
+        self.wildcards = []
+        # Règles applicables à chaque nom de métrique déjà rencontré
+        self.matches = {}
+    
+    def add(self, spec: Dict):
+        """Range une règle compilée dans l'index"""
+        pattern = spec['pattern']
+        if '*' not in pattern:
+            self.exact.setdefault(pattern, []).append(spec)
+            return
+        
+        prefix, suffix = pattern.split('*', 1)
+        spec['prefix'] = prefix
+        spec['suffix'] = suffix
+        if '.' in prefix:
+            self.families.setdefault(prefix[:prefix.index('.')], []).append(spec)
+        else:
+            self.wildcards.append(spec)
+    
+    def matching(self, key: str) -> List[Tuple[Dict, str]]:
+        """Règles (et partie couverte par le '*') applicables à une métrique, résolues une seule fois"""
+        specs = self.matches.get(key)
+        if specs is not None:
+            return specs
+        
+        specs = [(spec, key) for spec in self.exact.get(key, ())]
+        dot = key.find('.')
+        if dot > 0:
+            for spec in self.families.get(key[:dot], ()):
+                name = match(spec, key)
+                if name is not None:
+                    specs.append((spec, name))
+        for spec in self.wildcards:
+            name = match(spec, key)
+            if name is not None:
+                specs.append((spec, name))
+        self.matches[key] = specs
+        return specs
+
+class ThresholdRules:
+    """Moteur de règles de seuil : compilation à la demande, évaluation par métrique présente"""
+    
+    def __init__(self, config: Dict, logger=None):
+        self.thresholds = config.get("thresholds", {})
+        self.logger = logger
+        self.rules = [rule for rule in config.get("rules") or DEFAULT_RULES if self.validate(rule)]
+        # Règles compilées, partagées par les cibles sans surcharge propre
+        self.compiled = {}
+        self.override_targets = {name for rule in self.rules for name in rule.get('targets', {})}
+        self.override_groups = {group for rule in self.rules for group in rule.get('groups', {})}
+    
+    def validate(self, rule: Dict) -> bool:
+        """Écarte les règles incomplètes ou au comparateur inconnu"""
+        error = None
+        if not rule.get('metric'):
+            error = "métrique manquante"
+        elif rule.get('comparator', '>=') not in COMPARATORS:
+            error = f"comparateur inconnu {rule.get('comparator')}"
+        elif rule['metric'].count('*') > 1:
+            error = "un seul '*' par motif"
+        if error and self.logger:
+            self.logger.error(f"Règle de seuil ignorée ({error}): {rule}")
+        return error is None
+    
+    def resolve(self, value) -> Optional[float]:
+        """Seuil numérique, ou référence à une clé de la section "thresholds" """
+        if isinstance(value, str):
+            value = self.thresholds.get(value)
+        return value
+    
+    def compile_for(self, target: Dict) -> CompiledRules:
+        """Règles effectives d'une cible (surcharges de groupe puis de cible appliquées)"""
+        key = (target['name'] if target['name'] in self.override_targets else None,
+               target.get('group') if target.get('group') in self.override_groups else None)
+        compiled = self.compiled.get(key)
+        if compiled is not None:
+            return compiled
+        
+        compiled = CompiledRules()
+        for rule in self.rules:
+            effective = dict(rule)
+            if target.get('group'):
+                effective.update(rule.get('groups', {}).get(target['group'], {}))
+            effective.update(rule.get('targets', {}).get(target['name'], {}))
+            if not effective.get('enabled', True):
+                continue
+            
+            warning = self.resolve(effective.get('warning'))
+            critical = self.resolve(effective.get('critical'))
+            if warning is None and critical is None:
+                continue
+            
+            compiled.add({
+                'pattern': effective['metric'],
+                'label': effective.get('label', effective['metric']),
+                'comparator': effective.get('comparator', '>='),
+                'warning': warning,
+                'critical': critical,
+                'unit': effective.get('unit', '%'),
+                'precision': effective.get('precision', 1),
+                'adjective': effective.get('adjective', 'élevé'),
+                'messages': {**DEFAULT_MESSAGES, **effective.get('messages', {})},
+                'unless': effective.get('unless')
+            })
+        
+        self.compiled[key] = compiled
+        return compiled
+    
+    def evaluate(self, target: Dict, metrics: Dict) -> List[Dict]:
+        """Contrôles de seuil des métriques présentes dans l'échantillon"""
+        compiled = self.compile_for(target)
+        checks = []
+        for key, value in flatten_metrics(metrics).items():
+            for spec, name in compiled.matching(key):
+                if not (spec['unless'] and metrics.get(spec['unless'])):
+                    checks.append(make_check(spec, key, value, name))
+        return checks
+
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stockage des Séries Temporelles
+===============================
+Base locale en ajout seul : un fichier de segment par cible/métrique/période,
+composé d'enregistrements de taille fixe (horodatage, valeur) lus par mmap
+"""
+
+import os
+import mmap
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from metric_names import flatten_metrics
+
+# Enregistrement : horodatage epoch (float64) + valeur (float64), little-endian
+RECORD = struct.Struct('<dd')
+SEGMENT_SUFFIX = '.seg'
+# Fichiers de segment gardés ouverts en ajout entre deux flush : un descripteur par série active ;
+# au-delà, les moins récents sont fermés et chaque flush rouvre (open + close) les autres séries
+MAX_OPEN_SEGMENTS = 256
+
+class TimeSeriesStore:
+    """Base de séries temporelles en ajout seul, segmentée par période"""
+    
+    def __init__(self, path: str, segment_hours: float = 24, retention_days: Optional[float] = 30,
+                 flush_points: int = 10000, flush_interval: float = 5.0):
+        self.path = path
+        self.segment_seconds = int(segment_hours * 3600)
+        self.retention_seconds = retention_days * 86400 if retention_days else None
+        self.flush_points = flush_points
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        # Écritures des segments sérialisées : deux flush concurrents n'entrelacent pas leurs ajouts
+        self.flush_lock = threading.Lock()
+        # Points en attente d'écriture : (cible, métrique, début de segment) -> array('d')
+        self.buffers = {}
+        # Tampons en cours d'écriture par flush, encore lisibles jusqu'à la fin de l'écriture
+        self.inflight = {}
+        # Fichiers de segment ouverts en ajout (manipulés sous flush_lock uniquement)
+        self.handles = OrderedDict()
+        self.buffered_points = 0
+        self.last_flush = time.monotonic()
+        self.last_purge = 0.0
+        os.makedirs(path, exist_ok=True)
+    
+    def series_dir(self, target: str, metric: str) -> str:
+        """Répertoire d'une série (noms encodés pour le système de fichiers)"""
+        return os.path.join(self.path, quote(target, safe=''), quote(metric, safe=''))
+    
+    def segment_start(self, timestamp: float) -> int:
+        """Début du segment contenant un horodatage"""
+        return int(timestamp // self.segment_seconds) * self.segment_seconds
+    
+    def append(self, target: str, metric: str, timestamp: float, value: float):
+        """Ajoute un point (écrit sur disque par lots)"""
+        key = (target, metric, self.segment_start(timestamp))
+        with self.lock:
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                buffer = array('d')
+                self.buffers[key] = buffer
+            buffer.append(timestamp)
+            buffer.append(value)
+            self.buffered_points += 1
+            due = (self.buffered_points >= self.flush_points
+                   or time.monotonic() - self.last_flush >= self.flush_interval)
+        # Écriture hors du verrou des tampons (flush prend le verrou d'écriture, puis celui-ci)
+        if due:
+            self.flush()
+    
+    def append_sample(self, metrics: Dict):
+        """Ajoute toutes les valeurs numériques d'un échantillon de SystemMonitor"""
+        timestamp = datetime.fromisoformat(metrics['timestamp']).timestamp()
+        for metric, value in flatten_metrics(metrics).items():
+            self.append(metrics['target'], metric, timestamp, value)
+    
+    def flush(self):
+        """Écrit les points en attente à la fin de leurs segments ouverts (un seul flush à la fois)"""
+        with self.flush_lock:
+            # Les ajouts ne sont bloqués que le temps d'échanger les tampons ; les points
+            # échangés restent visibles des lectures dans self.inflight jusqu'à leur écriture
+            with self.lock:
+                buffers = self.buffers
+                self.inflight = buffers
+                self.buffers = {}
+                self.buffered_points = 0
+                self.last_flush = time.monotonic()
+            
+            try:
+                for key, buffer in buffers.items():
+                    # array('d') est en ordre natif : les segments sont toujours little-endian
+                    data = buffer.tobytes()
+                    if sys.byteorder == 'big':
+                        swapped = array('d', buffer)
+                        swapped.byteswap()
+                        data = swapped.tobytes()
+                    handle = self.segment_handle(key)
+                    handle.write(data)
+                    handle.flush()
+            finally:
+                with self.lock:
+                    self.inflight = {}
+        
+        # Rétention : au plus une purge par heure
+        if self.retention_seconds and time.monotonic() - self.last_purge >= 3600:
+            self.last_purge = time.monotonic()
+            self.purge(time.time() - self.retention_seconds)
+    
+    def segment_handle(self, key: Tuple[str, str, int]):
+        """Fichier d'un segment ouvert en ajout, réutilisé d'un flush à l'autre (flush_lock tenu)"""
+        handle = self.handles.get(key)
+        if handle is not None:
+            self.handles.move_to_end(key)
+            return handle
+        
+        target, metric, start = key
+        directory = self.series_dir(target, metric)
+        os.makedirs(directory, exist_ok=True)
+        handle = open(os.path.join(directory, f"{start}{SEGMENT_SUFFIX}"), 'ab')
+        self.handles[key] = handle
+        if len(self.handles) > MAX_OPEN_SEGMENTS:
+            self.handles.popitem(last=False)[1].close()
+        return handle
+    
+    def close_handles(self, keep=None):
+        """Ferme les fichiers de segment ouverts (sauf ceux pour lesquels keep est vrai)"""
+        for key in list(self.handles):
+            if keep is None or not keep(key):
+                self.handles.pop(key).close()
+    
+    def pending_keys(self):
+        """Clés des points pas encore écrits : en cours d'écriture puis en attente (verrou tenu)"""
+        return list(self.inflight) + list(self.buffers)
+    
+    def list_targets(self) -> List[str]:
+        """Cibles présentes dans la base"""
+        with self.lock:
+            buffered = {target for target, _, _ in self.pending_keys()}
+        on_disk = {unquote(name) for name in os.listdir(self.path)
+                   if os.path.isdir(os.path.join(self.path, name))}
+        return sorted(on_disk | buffered)
+    
+    def list_metrics(self, target: str) -> List[str]:
+        """Métriques enregistrées pour une cible"""
+        with self.lock:
+            buffered = {metric for name, metric, _ in self.pending_keys() if name == target}
+        directory = os.path.join(self.path, quote(target, safe=''))
+        on_disk = set()
+        if os.path.isdir(directory):
+            on_disk = {unquote(name) for name in os.listdir(directory)}
+        return sorted(on_disk | buffered)
+    
+    def segments(self, target: str, metric: str) -> List[Tuple[int, str]]:
+        """Segments d'une série, triés par date de début"""
+        directory = self.series_dir(target, metric)
+        if not os.path.isdir(directory):
+            return []
+        segments = []
+        for name in os.listdir(directory):
+            if name.endswith(SEGMENT_SUFFIX):
+                segments.append((int(name[:-len(SEGMENT_SUFFIX)]), os.path.join(directory, name)))
+        return sorted(segments)
+    
+    def query(self, target: str, metric: str, start: float, end: float) -> Iterator[Tuple[float, float]]:
+        """Itère sur les points (horodatage, valeur) de [start, end] sans tout charger en mémoire"""
+        first_segment = self.segment_start(start)
+        # Points pas encore écrits, copiés avant la lecture des fichiers : un point écrit entre-temps
+        # par un flush est lu sur disque et ignoré ici (les segments sont chronologiques)
+        pending = {}
+        with self.lock:
+            for buffers in (self.inflight, self.buffers):
+                for (name, series, segment), buffer in buffers.items():
+                    if name == target and series == metric and first_segment <= segment <= end:
+                        pending.setdefault(segment, []).extend(buffer)
+        
+        on_disk = {segment: path for segment, path in self.segments(target, metric)
+                   if first_segment <= segment <= end}
+        for segment in sorted(on_disk.keys() | pending.keys()):
+            last = None
+            if segment in on_disk:
+                for timestamp, value in self.read_segment(on_disk[segment], start, end):
+                    last = timestamp
+                    yield timestamp, value
+            buffer = pending.get(segment, ())
+            for i in range(0, len(buffer), 2):
+                if start <= buffer[i] <= end and (last is None or buffer[i] > last):
+                    yield buffer[i], buffer[i + 1]
+    
+    def read_segment(self, path: str, start: float, end: float) -> Iterator[Tuple[float, float]]:
+        """Lit un segment par mmap, en localisant le début de l'intervalle par dichotomie"""
+        size = os.path.getsize(path)
+        count = size // RECORD.size
+        if count == 0:
+            return
+        
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), count * RECORD.size, access=mmap.ACCESS_READ) as mapped:
+                # Les points d'un segment sont ajoutés dans l'ordre chronologique
+                low, high = 0, count
+                while low < high:
+                    middle = (low + high) // 2
+                    if RECORD.unpack_from(mapped, middle * RECORD.size)[0] < start:
+                        low = middle + 1
+                    else:
+                        high = middle
+                
+                for index in range(low, count):
+                    timestamp, value = RECORD.unpack_from(mapped, index * RECORD.size)
+                    if timestamp > end:
+                        break
+                    yield timestamp, value
+    
+    def latest(self, target: str, metric: str) -> Optional[Tuple[float, float]]:
+        """Dernier point connu d'une série"""
+        with self.lock:
+            # À segment égal, les tampons en attente sont plus récents que ceux en cours d'écriture
+            candidates = [((segment, order), buffer)
+                          for order, buffers in enumerate((self.inflight, self.buffers))
+                          for (name, series, segment), buffer in buffers.items()
+                          if name == target and series == metric and buffer]
+            if candidates:
+                buffer = max(candidates, key=lambda item: item[0])[1]
+                return buffer[-2], buffer[-1]
+        
+        for _, path in reversed(self.segments(target, metric)):
+            size = os.path.getsize(path) // RECORD.size * RECORD.size
+            if size:
+                with open(path, 'rb') as f:
+                    f.seek(size - RECORD.size)
+                    return RECORD.unpack(f.read(RECORD.size))
+        return None
+    
+    def purge(self, older_than: float):
+        """Supprime les segments entièrement antérieurs à une date (epoch)"""
+        with self.flush_lock:
+            # Un segment encore ouvert ne peut pas être supprimé sous Windows
+            self.close_handles(keep=lambda key: key[2] + self.segment_seconds >= older_than)
+        for target in os.listdir(self.path):
+            target_dir = os.path.join(self.path, target)
+            if not os.path.isdir(target_dir):
+                continue
+            for metric in os.listdir(target_dir):
+                metric_dir = os.path.join(target_dir, metric)
+                for name in os.listdir(metric_dir):
+                    if not name.endswith(SEGMENT_SUFFIX):
+                        continue
+                    segment = int(name[:-len(SEGMENT_SUFFIX)])
+                    if segment + self.segment_seconds < older_than:
+                        os.remove(os.path.join(metric_dir, name))
+    
+    def close(self):
+        """Écrit les points en attente et ferme les fichiers de segment"""
+        self.flush()
+        with self.flush_lock:
+            self.close_handles()